@@ -0,0 +1,73 @@
+"""
+    Wall time of a capacity search with every probe in a `python -m vidur.main`
+    subprocess against the same search run in-process (--in-process). Each
+    mode writes to its own output directory so that no probe is answered
+    from the results of the other mode.
+
+    python -m benchmarks.capacity_search_modes --job-index 0
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import yaml
+
+from vidur.config_optimizer.config_explorer.capacity_search import CapacitySearch
+from vidur.config_optimizer.config_explorer.config import JobConfig
+
+
+def _get_search_args(output_dir: str, args: argparse.Namespace, in_process: bool):
+    # the capacity search arguments of config_explorer.main with their defaults
+    return argparse.Namespace(
+        output_dir=output_dir,
+        cache_dir=args.cache_dir,
+        time_limit=args.time_limit,
+        max_iterations=args.max_iterations,
+        min_search_granularity=2.5,
+        scheduling_delay_slo_value=5.0,
+        scheduling_delay_slo_quantile=0.99,
+        search_strategy="binary",
+        warm_start=False,
+        early_stop=False,
+        result_store_path=None,
+        in_process=in_process,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--config-path",
+        type=str,
+        default="vidur/config_optimizer/config_explorer/config/config.yml",
+    )
+    parser.add_argument("--job-index", type=int, default=0)
+    parser.add_argument("--cache-dir", type=str, default="./cache_tmpfs")
+    parser.add_argument(
+        "--time-limit", type=int, default=30, help="Time limit in minutes"
+    )
+    parser.add_argument("--max-iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    config = yaml.safe_load(open(args.config_path))
+    job_config = JobConfig.generate_job_configs(config)[args.job_index]
+    print(f"job config: {job_config.get_human_readable_name()}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for in_process in (False, True):
+            mode = "in-process" if in_process else "subprocess"
+            search_args = _get_search_args(
+                os.path.join(temp_dir, mode), args, in_process
+            )
+
+            start_time = time.perf_counter()
+            result = CapacitySearch(job_config, search_args).search()
+            search_time = time.perf_counter() - start_time
+
+            print(
+                f"{mode}: {search_time:.1f}s, probes: {result['num_probes']},"
+                f" {search_time / max(result['num_probes'], 1):.1f}s per probe,"
+                f" max qps under slo: {result['max_qps_under_sla']}"
+            )
@@ -0,0 +1,82 @@
+"""
+    Events/sec of the tuple heap and the compact integer-keyed event queue on
+    the arrival pattern of a trace replay. All request arrivals are queued up
+    front, as the simulator does without stream_requests, and each arrival
+    queues a global schedule event at the same time when it is handled, so
+    ties are broken by event type. Event construction is not timed.
+
+    python -m benchmarks.event_queue --num-requests 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+
+from vidur.entities import Request
+from vidur.events.global_schedule_event import GlobalScheduleEvent
+from vidur.events.request_arrival_event import RequestArrivalEvent
+from vidur.utils.event_queue import CompactEventQueue, HeapEventQueue
+
+
+def _make_events(num_requests: int, qps: float, seed: int):
+    rng = random.Random(seed)
+    arrival_events = []
+    follow_up_events = {}
+    arrived_at = 0.0
+    for _ in range(num_requests):
+        arrived_at += rng.expovariate(qps)
+        request = Request(
+            arrived_at=arrived_at, num_prefill_tokens=1, num_decode_tokens=1
+        )
+        arrival_event = RequestArrivalEvent(arrived_at, request)
+        arrival_events.append(arrival_event)
+        follow_up_events[arrival_event.id] = GlobalScheduleEvent(arrived_at)
+    return arrival_events, follow_up_events
+
+
+def run_event_queue(event_queue, arrival_events, follow_up_events):
+    popped_event_ids = []
+
+    gc.disable()
+    start_time = time.perf_counter()
+    for event in arrival_events:
+        event_queue.push(event)
+    while len(event_queue):
+        event = event_queue.pop()
+        popped_event_ids.append(event.id)
+        follow_up_event = follow_up_events.get(event.id)
+        if follow_up_event is not None:
+            event_queue.push(follow_up_event)
+    elapsed_time = time.perf_counter() - start_time
+    gc.enable()
+
+    # every event is pushed and popped once
+    return 2 * len(popped_event_ids) / elapsed_time, popped_event_ids
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-requests", type=int, default=1000000)
+    parser.add_argument("--qps", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    arrival_events, follow_up_events = _make_events(
+        args.num_requests, args.qps, args.seed
+    )
+
+    heap_events_per_sec, heap_event_ids = run_event_queue(
+        HeapEventQueue(), arrival_events, follow_up_events
+    )
+    compact_events_per_sec, compact_event_ids = run_event_queue(
+        CompactEventQueue(), arrival_events, follow_up_events
+    )
+
+    assert heap_event_ids == compact_event_ids
+    print(
+        f"requests: {args.num_requests}, events: {len(heap_event_ids)},"
+        f" heap: {heap_events_per_sec:.0f} events/s,"
+        f" compact: {compact_events_per_sec:.0f} events/s"
+        f" ({compact_events_per_sec / heap_events_per_sec:.2f}x)"
+    )
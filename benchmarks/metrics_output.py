@@ -0,0 +1,72 @@
+"""
+    Time MetricsStore.plot() in headless mode against the normal output, on a
+    metrics store filled with synthetic values for a given number of requests.
+    The normal output with figures is only timed when plotly is installed.
+
+    python -m benchmarks.metrics_output --num-requests 100000
+"""
+
+import argparse
+import importlib.util
+import random
+import tempfile
+import time
+import types
+
+from vidur.config import MetricsConfig, SimulationConfig
+from vidur.metrics.metrics_store import MetricsStore
+
+
+def _make_metrics_store(output_dir: str, num_requests: int, **metrics_config_kwargs):
+    simulation_config = SimulationConfig(
+        metrics_config=MetricsConfig(output_dir=output_dir, **metrics_config_kwargs)
+    )
+    cluster_config = simulation_config.cluster_config
+    # the store only reads the model config of each replica
+    model_configs = [
+        model_config
+        for model_config, num_replicas in zip(
+            cluster_config.replica_config.model_configs, cluster_config.num_replicas
+        )
+        for _ in range(num_replicas)
+    ]
+    replicas = {
+        replica_id: types.SimpleNamespace(_model_config=model_config)
+        for replica_id, model_config in enumerate(model_configs)
+    }
+    metrics_store = MetricsStore(simulation_config, replicas)
+
+    rng = random.Random(0)
+    for dataseries in metrics_store._get_all_dataseries():
+        for request_id in range(num_requests):
+            dataseries.put(request_id, rng.random())
+    return metrics_store
+
+
+def _time_plot(num_requests: int, **metrics_config_kwargs) -> float:
+    with tempfile.TemporaryDirectory() as output_dir:
+        metrics_store = _make_metrics_store(
+            output_dir, num_requests, **metrics_config_kwargs
+        )
+        start_time = time.perf_counter()
+        metrics_store.plot()
+        return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-requests", type=int, default=100000)
+    args = parser.parse_args()
+
+    runs = [
+        ("normal, csv only", {"store_plots": False}),
+        ("headless", {"headless": True}),
+    ]
+    if importlib.util.find_spec("plotly") is not None:
+        runs.insert(0, ("normal", {"store_plots": True}))
+    else:
+        print("plotly is not installed, skipping the normal output with figures")
+
+    for name, metrics_config_kwargs in runs:
+        plot_time = _time_plot(args.num_requests, **metrics_config_kwargs)
+        print(f"{name}: plot {plot_time:.2f}s")
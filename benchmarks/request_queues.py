@@ -0,0 +1,106 @@
+"""
+    Microbenchmark of the replica scheduler queues at 10k-100k queued requests.
+    Compares the deque admission queue with the list it replaced, and the
+    preempted request queue with the sorted list the vLLM and Sarathi
+    schedulers used to re-sort on every scheduling step.
+
+    python -m benchmarks.request_queues
+"""
+
+import argparse
+import random
+import time
+from collections import deque
+
+from vidur.entities import Request
+from vidur.scheduler.utils.preempted_request_queue import PreemptedRequestQueue
+
+
+def _make_requests(num_requests: int, rng: random.Random):
+    return [
+        Request(arrived_at=rng.random(), num_prefill_tokens=1, num_decode_tokens=1)
+        for _ in range(num_requests)
+    ]
+
+
+def _time_ops(run, num_ops: int) -> float:
+    start_time = time.perf_counter()
+    run(num_ops)
+    return num_ops / (time.perf_counter() - start_time)
+
+
+def benchmark_admission_queue(requests, num_ops: int):
+    list_queue = list(requests)
+    deque_queue = deque(requests)
+
+    # pop the head and requeue a preempted request at the front, as the
+    # schedulers do, so the depth stays constant
+    def run_list(num_ops):
+        for _ in range(num_ops):
+            request = list_queue.pop(0)
+            list_queue.insert(0, request)
+            list_queue.append(list_queue.pop(0))
+
+    def run_deque(num_ops):
+        for _ in range(num_ops):
+            request = deque_queue.popleft()
+            deque_queue.appendleft(request)
+            deque_queue.append(deque_queue.popleft())
+
+    return _time_ops(run_list, num_ops), _time_ops(run_deque, num_ops)
+
+
+def benchmark_preempted_queue(requests, num_ops: int):
+    sorted_list = list(requests)
+    preempted_queue = PreemptedRequestQueue()
+    for request in requests:
+        preempted_queue.push(request)
+
+    # resume the earliest arrival and evict the latest one, each step re-adds
+    # both so the depth stays constant
+    def run_sorted_list(num_ops):
+        nonlocal sorted_list
+        for _ in range(num_ops):
+            sorted_list = sorted(sorted_list, key=lambda req: req.arrived_at)
+            first_request = sorted_list.pop(0)
+            last_request = sorted_list.pop(-1)
+            sorted_list = [first_request, last_request] + sorted_list
+
+    def run_preempted_queue(num_ops):
+        for _ in range(num_ops):
+            first_request = preempted_queue.pop_first()
+            last_request = preempted_queue.pop_last()
+            preempted_queue.push(first_request)
+            preempted_queue.push(last_request)
+
+    return _time_ops(run_sorted_list, num_ops), _time_ops(
+        run_preempted_queue, num_ops
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--queue-depths", type=int, nargs="+", default=[10000, 30000, 100000]
+    )
+    parser.add_argument("--num-ops", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for queue_depth in args.queue_depths:
+        requests = _make_requests(queue_depth, rng)
+
+        list_ops, deque_ops = benchmark_admission_queue(requests, args.num_ops)
+        print(
+            f"admission queue, depth {queue_depth}: list {list_ops:.0f} ops/s,"
+            f" deque {deque_ops:.0f} ops/s ({deque_ops / list_ops:.1f}x)"
+        )
+
+        sorted_list_ops, preempted_queue_ops = benchmark_preempted_queue(
+            requests, args.num_ops
+        )
+        print(
+            f"preempted queue, depth {queue_depth}: sorted list"
+            f" {sorted_list_ops:.0f} ops/s, heaps {preempted_queue_ops:.0f} ops/s"
+            f" ({preempted_queue_ops / sorted_list_ops:.1f}x)"
+        )
@@ -0,0 +1,131 @@
+"""
+    Startup time of trace replay: loading a processed trace and building its
+    requests. Compares the DataFrame.iterrows loop trace replay used to build
+    requests with, the column arrays it builds them from now, and the
+    memory-mapped columnar format of vidur.request_generator.convert_trace.
+    The trace can be repeated to reach a larger number of requests.
+
+    python -m benchmarks.trace_replay_startup --num-repeats 50
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+import pandas as pd
+
+from vidur.config import TraceRequestGeneratorConfig
+from vidur.entities import Request
+from vidur.request_generator.columnar_trace import (
+    process_trace_df,
+    write_columnar_trace,
+)
+from vidur.request_generator.trace_replay_request_generator import (
+    TraceReplayRequestGenerator,
+)
+
+
+def _generate_requests_with_iterrows(trace_df: pd.DataFrame) -> List[Request]:
+    # request construction before the column arrays
+    requests = []
+    for _, row in trace_df.iterrows():
+        requests.append(
+            Request(
+                arrived_at=row["arrived_at"],
+                num_prefill_tokens=row["num_prefill_tokens"],
+                num_decode_tokens=row["num_decode_tokens"],
+            )
+        )
+    return requests
+
+
+def _write_repeated_trace(trace_file: str, num_repeats: int, output_file: str) -> int:
+    trace_df = pd.read_csv(trace_file)
+    duration = trace_df["arrived_at"].max() - trace_df["arrived_at"].min()
+    repeated_trace_df = pd.concat(
+        [
+            trace_df.assign(arrived_at=trace_df["arrived_at"] + idx * duration)
+            for idx in range(num_repeats)
+        ],
+        ignore_index=True,
+    )
+    repeated_trace_df.to_csv(output_file, index=False)
+    return len(repeated_trace_df)
+
+
+def _time_startup(config: TraceRequestGeneratorConfig, generate_requests):
+    start_time = time.perf_counter()
+    request_generator = TraceReplayRequestGenerator(config)
+    load_time = time.perf_counter() - start_time
+    requests = generate_requests(request_generator)
+    total_time = time.perf_counter() - start_time
+    return load_time, total_time - load_time, len(requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--trace-file", type=str, default="data/processed_traces/splitwise_conv.csv"
+    )
+    parser.add_argument("--num-repeats", type=int, default=50)
+    parser.add_argument(
+        "--skip-iterrows",
+        action="store_true",
+        help="Skip the iterrows loop, which takes minutes on large traces",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_trace_file = os.path.join(temp_dir, "trace.csv")
+        num_requests = _write_repeated_trace(
+            args.trace_file, args.num_repeats, csv_trace_file
+        )
+        config = TraceRequestGeneratorConfig(trace_file=csv_trace_file)
+
+        columnar_trace_dir = os.path.join(temp_dir, "trace")
+        write_columnar_trace(
+            process_trace_df(
+                pd.read_csv(csv_trace_file),
+                config.prefill_scale_factor,
+                config.decode_scale_factor,
+                config.time_scale_factor,
+                config.max_tokens,
+            ),
+            columnar_trace_dir,
+            {
+                "source_file": csv_trace_file,
+                "prefill_scale_factor": config.prefill_scale_factor,
+                "decode_scale_factor": config.decode_scale_factor,
+                "time_scale_factor": config.time_scale_factor,
+                "max_tokens": config.max_tokens,
+            },
+        )
+        columnar_config = TraceRequestGeneratorConfig(trace_file=columnar_trace_dir)
+
+        runs = [
+            ("csv, column arrays", config, lambda gen: gen.generate_requests()),
+            (
+                "columnar, column arrays",
+                columnar_config,
+                lambda gen: gen.generate_requests(),
+            ),
+        ]
+        if not args.skip_iterrows:
+            runs.insert(
+                0,
+                (
+                    "csv, iterrows",
+                    config,
+                    lambda gen: _generate_requests_with_iterrows(gen.trace_df),
+                ),
+            )
+
+        print(f"requests: {num_requests}")
+        for name, run_config, generate_requests in runs:
+            load_time, generate_time, _ = _time_startup(run_config, generate_requests)
+            print(
+                f"{name}: load {load_time:.2f}s, generate {generate_time:.2f}s,"
+                f" total {load_time + generate_time:.2f}s"
+            )
@@ -4,8 +4,20 @@ import json
 import itertools
 import argparse
 import hashlib
-from multiprocessing import Pool
+import shlex
+import sys
 import shutil
+from functools import partial
+
+# vidur and the relative paths of the configs are resolved from the repo root,
+# wherever the experiments are run from
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from vidur.utils.result_store import ResultStore
+from vidur.utils.sweep_executor import SweepExecutor
+
+DEFAULT_MAX_TOKENS = 2048
 
 DEFAULT_CONFIGS = {
     "cluster_config" : {
@@ -57,7 +69,7 @@ def write_configs_to_dir(config_combos, config_dir):
         with open(save_path, "w+") as writer:
             json.dump(curr_combo, writer, indent=4, sort_keys=True)
 
-def get_workload_config(config_type, num_requests = 1024, max_tokens = 2048):
+def get_workload_config(config_type, num_requests = 1024, max_tokens = DEFAULT_MAX_TOKENS):
     if config_type == "trace":
         return {
             "workload_type" : "trace",
@@ -82,6 +94,7 @@ def read_arguments():
     parser.add_argument("--config_dir", type=str, required = True, help="The directory containing the config")
     parser.add_argument("--results_dir", type=str, required = True, help="The directory containing the results")
     parser.add_argument("--mode", type=str, default = "create", help="The mode to run the experiment in")
+    parser.add_argument("--result_store_path", type=str, default = None, help="The SQLite result store to skip already finished runs with")
     return parser.parse_args()
 
 def record_cluster_config(cluster_config_data, command_params):
@@ -131,49 +144,77 @@ def get_command_for_config(config_file):
     record_workload_type(config_data["workload_config"], command_params)
     return command_params
 
+def get_predicted_cost(config_file):
+    # The simulation time grows with the number of tokens in the workload
+    with open(config_file, 'r') as reader:
+        workload_config = json.load(reader)["workload_config"]
+
+    if workload_config["workload_type"] == "trace":
+        trace_path = os.path.join(REPO_DIR, workload_config["data_path"])
+        if not os.path.exists(trace_path):
+            return 0
+        with open(trace_path, 'r') as reader:
+            num_requests = sum(1 for _ in reader) - 1
+    else:
+        num_requests = workload_config["num_requests"]
+
+    return num_requests * workload_config.get("max_tokens", DEFAULT_MAX_TOKENS)
+
 def run_for_config(config_file, args):
-    current_dir = os.getcwd()
-    os.chdir("/ssd/dsarda/vidur")
-    try:
-        # First get the command parameters
-        command_params = get_command_for_config(config_file)
-
-        # Add in the save path
-        config_name = os.path.basename(config_file)
-        config_name = config_name[ : config_name.index(".")]
-        save_dir = os.path.join(args.results_dir, config_name)
-        os.makedirs(save_dir, exist_ok = True)
-        command_params["metrics_config_output_dir"] = save_dir
-
-        # Save the json to the directory
-        json_copy_path = os.path.join(save_dir, "request_config_summary.json")
-        shutil.copy(config_file, json_copy_path)
-        
-        # Run the command
-        command_params_txt = [
-            "--" + str(key) + " " + str(value)
-            for key, value in command_params.items()
-        ]
-        command_to_run = "python -m vidur.main " + " ".join(command_params_txt)
-        print("Running command", command_to_run)
-        result = subprocess.run(command_to_run, shell = True, capture_output = True, text = True)
-    finally:
-        os.chdir(current_dir)
+    # First get the command parameters
+    command_params = get_command_for_config(config_file)
+
+    # Add in the save path
+    config_name = os.path.basename(config_file)
+    config_name = config_name[ : config_name.index(".")]
+    save_dir = os.path.abspath(os.path.join(args.results_dir, config_name))
+    os.makedirs(save_dir, exist_ok = True)
+    command_params["metrics_config_output_dir"] = save_dir
+    if args.result_store_path is not None:
+        command_params["result_store_path"] = os.path.abspath(args.result_store_path)
+
+    # Save the json to the directory
+    json_copy_path = os.path.join(save_dir, "request_config_summary.json")
+    shutil.copy(config_file, json_copy_path)
+    
+    # Run the command
+    command_params_txt = [
+        "--" + str(key) + " " + str(value)
+        for key, value in command_params.items()
+    ]
+    command_args = shlex.split(" ".join(command_params_txt))
+    # Only skip runs whose metrics and plots are still on disk for the experiments to read
+    has_outputs = os.path.exists(os.path.join(save_dir, "request_metrics.csv")) and os.path.isdir(os.path.join(save_dir, "plots"))
+    if args.result_store_path is not None and has_outputs:
+        result_store = ResultStore(args.result_store_path)
+        if result_store.get_for_cli_args(command_args) is not None:
+            print("Skipping already finished config", config_file)
+            return True
+
+    command_to_run = [sys.executable, "-m", "vidur.main"] + command_args
+    print("Running command", " ".join(command_to_run))
+    with open(os.path.join(save_dir, "output.log"), "w") as output_file:
+        subprocess.run(command_to_run, cwd = REPO_DIR, stdout = output_file, stderr = subprocess.STDOUT, check = True)
     
     return True
 
 def run_all_configs_in_dir(args, num_workers = 5):
-    configs_to_runs = []
+    config_paths = []
     for file_name in os.listdir(args.config_dir):
         if "json" not in file_name:
             continue
         
-        config_path = os.path.join(args.config_dir, file_name)
-        configs_to_runs.append((config_path, args))
+        config_paths.append(os.path.join(args.config_dir, file_name))
     
-    # Create the worker pool
-    with Pool(num_workers) as worker_pool:
-        worker_pool.starmap(run_for_config, configs_to_runs)
+    # Run the configs on pinned workers, longest first, and track them in one table
+    os.makedirs(args.results_dir, exist_ok = True)
+    sweep_executor = SweepExecutor(max(num_workers, 1), os.path.join(args.results_dir, "sweep.db"))
+    sweep_executor.map(
+        partial(run_for_config, args = args),
+        config_paths,
+        [os.path.basename(config_path) for config_path in config_paths],
+        [get_predicted_cost(config_path) for config_path in config_paths],
+    )
 
 # Constants for graph generation
 LOAD_BALANCING_COLOR_MAPPING = {
@@ -9,6 +9,11 @@ import glob
 from multiprocessing import Pool
 import subprocess
 import os
+import shlex
+import argparse
+from functools import partial
+
+from vidur.utils.result_store import ResultStore
 
 list_of_models = {
     "llama2-7b" : "meta-llama/Llama-2-7b-hf",
@@ -176,12 +181,26 @@ def plot_metrics(config, base_output_dir, schedulers):
                 plot_cdfs(data_frames, n, labels)
         del data_frames[:]
         
-def job_runner(command_to_run):
+def has_plot_outputs(output_dir):
+    """ plot_metrics reads the csvs under the plots directory of each run """
+    return len(glob.glob(f"{output_dir}/**/plots/*.csv", recursive = True)) > 0
+
+def job_runner(command_to_run, result_store_path = None):
+    if (result_store_path):
+        """ Skip runs whose results are already in the store and whose outputs are still on disk """
+        args = shlex.split(command_to_run)
+        args = args[args.index("vidur.main") + 1:]
+        output_dir = args[args.index("--metrics_config_output_dir") + 1]
+        if (has_plot_outputs(output_dir) and ResultStore(result_store_path).get_for_cli_args(args) is not None):
+            print("Skipping command", command_to_run)
+            return True
+        command_to_run += f" --result_store_path {result_store_path}"
+
     print("Running command", command_to_run)
     subprocess.run(command_to_run, capture_output=True, text=True, shell = True)
     return True
 
-def main(filename, base_output_dir, schedulers, run = False):
+def main(filename, base_output_dir, schedulers, run = False, result_store_path = None):
     if (run):
         arguments = []
         with open(filename, 'r') as file:
@@ -193,10 +212,13 @@ def main(filename, base_output_dir, schedulers, run = False):
 
         num_workers = int(os.cpu_count()/4)
         with Pool(num_workers) as pool:
-            print(pool.map(job_runner, arguments))
+            print(pool.map(partial(job_runner, result_store_path=result_store_path), arguments))
 
     plot_metrics(config, base_output_dir, schedulers)
 
 if __name__ == "__main__":
     schedulers = ['lor', 'random', 'round_robin', 'input_balance', 'output_balance']
-    main("config.json", "vidur_metrics_output", schedulers, run = True)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--result_store_path", type=str, default = None, help="The SQLite result store to skip already finished runs with")
+    args = parser.parse_args()
+    main("config.json", "vidur_metrics_output", schedulers, run = True, result_store_path = args.result_store_path)
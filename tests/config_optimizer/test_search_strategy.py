@@ -0,0 +1,95 @@
+import os
+
+import pytest
+import yaml
+
+from vidur.config_optimizer.config_explorer.benchmark_search_strategies import (
+    get_synthetic_scheduling_delay,
+    run_synthetic_search,
+    run_synthetic_sweep,
+)
+from vidur.config_optimizer.config_explorer.config import JobConfig
+from vidur.config_optimizer.config_explorer.search_strategy import SEARCH_STRATEGIES
+
+SCHEDULING_DELAY_SLO_VALUE = 5.0
+MIN_SEARCH_GRANULARITY = 2.5
+SAMPLE_CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "../../vidur/config_optimizer/config_explorer/config/config.yml",
+)
+
+
+def test_synthetic_scheduling_delay_meets_slo_at_capacity():
+    assert get_synthetic_scheduling_delay(
+        10.0, 10.0, SCHEDULING_DELAY_SLO_VALUE
+    ) == pytest.approx(SCHEDULING_DELAY_SLO_VALUE)
+    assert (
+        get_synthetic_scheduling_delay(9.0, 10.0, SCHEDULING_DELAY_SLO_VALUE)
+        < SCHEDULING_DELAY_SLO_VALUE
+        < get_synthetic_scheduling_delay(11.0, 10.0, SCHEDULING_DELAY_SLO_VALUE)
+    )
+
+
+@pytest.mark.parametrize("search_strategy_name", list(SEARCH_STRATEGIES))
+@pytest.mark.parametrize("capacity", [0.3, 4.0, 17.0, 120.0])
+def test_search_strategy_finds_capacity(search_strategy_name, capacity):
+    max_qps_under_sla, num_probes = run_synthetic_search(
+        search_strategy_name,
+        8.0,
+        capacity,
+        SCHEDULING_DELAY_SLO_VALUE,
+        MIN_SEARCH_GRANULARITY,
+        20,
+    )
+
+    assert num_probes < 20
+    assert max_qps_under_sla <= capacity
+    assert max_qps_under_sla >= capacity * (1 - 2 * MIN_SEARCH_GRANULARITY / 100)
+
+
+def test_warm_start_stages():
+    config = yaml.safe_load(open(SAMPLE_CONFIG_PATH))
+    job_configs = JobConfig.generate_job_configs(config)
+
+    stages = JobConfig.get_warm_start_stages(job_configs)
+
+    assert sorted(
+        job_config.get_hash() for stage in stages for job_config in stage
+    ) == sorted(job_config.get_hash() for job_config in job_configs)
+    stage_ids = {
+        job_config.get_hash(): stage_id
+        for stage_id, stage in enumerate(stages)
+        for job_config in stage
+    }
+    for job_config in job_configs:
+        neighbour_stage_ids = [
+            stage_ids[neighbour_job_config.get_hash()]
+            for neighbour_job_config in job_config.get_neighbour_job_configs()
+            if neighbour_job_config.get_hash() in stage_ids
+        ]
+        stage_id = stage_ids[job_config.get_hash()]
+        # seeded from the previous stage only, never from its own
+        assert stage_id not in neighbour_stage_ids
+        if stage_id > 0:
+            assert stage_id - 1 in neighbour_stage_ids
+
+    # the same stages whatever order the configs are listed in
+    reversed_stages = JobConfig.get_warm_start_stages(job_configs[::-1])
+    assert [
+        sorted(job_config.get_hash() for job_config in stage) for stage in stages
+    ] == [
+        sorted(job_config.get_hash() for job_config in stage)
+        for stage in reversed_stages
+    ]
+
+
+@pytest.mark.parametrize("search_strategy_name", list(SEARCH_STRATEGIES))
+def test_synthetic_sweep_probe_counts(search_strategy_name):
+    config = yaml.safe_load(open(SAMPLE_CONFIG_PATH))
+
+    for warm_start in (False, True):
+        stats = run_synthetic_sweep(config, search_strategy_name, warm_start)
+        print(f"{search_strategy_name}, warm start: {warm_start}: {stats}")
+
+        assert stats["max_relative_error"] <= 2 * MIN_SEARCH_GRANULARITY / 100
+        assert stats["avg_probes"] < 10
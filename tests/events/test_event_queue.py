@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+# the events import the schedulers, which import the execution time predictors
+pytest.importorskip("sklearn")
+
+from vidur.entities import Request
+from vidur.events.global_schedule_event import GlobalScheduleEvent
+from vidur.events.replica_schedule_event import ReplicaScheduleEvent
+from vidur.events.replica_stage_schedule_event import ReplicaStageScheduleEvent
+from vidur.events.request_arrival_event import RequestArrivalEvent
+from vidur.utils.event_queue import CompactEventQueue, HeapEventQueue
+
+
+def _make_events(num_events, seed):
+    rng = random.Random(seed)
+    events = []
+    for _ in range(num_events):
+        # coarse times so that most events tie on time
+        event_time = rng.randrange(20) * 0.5
+        event_kind = rng.randrange(4)
+        if event_kind == 0:
+            request = Request(
+                arrived_at=event_time, num_prefill_tokens=1, num_decode_tokens=1
+            )
+            events.append(RequestArrivalEvent(event_time, request))
+        elif event_kind == 1:
+            events.append(GlobalScheduleEvent(event_time))
+        elif event_kind == 2:
+            events.append(ReplicaScheduleEvent(event_time, 0))
+        else:
+            events.append(ReplicaStageScheduleEvent(event_time, 0, 0))
+    return events
+
+
+def _pop_all(event_queue, events):
+    for event in events:
+        event_queue.push(event)
+    return [event_queue.pop() for _ in range(len(events))]
+
+
+@pytest.mark.parametrize("event_queue_class", [HeapEventQueue, CompactEventQueue])
+def test_event_queue_order(event_queue_class):
+    events = _make_events(2000, 0)
+    random.Random(1).shuffle(events)
+
+    popped_events = _pop_all(event_queue_class(), events)
+
+    expected_events = sorted(
+        events, key=lambda event: (event.time, event.event_type, event.id)
+    )
+    assert popped_events == expected_events
+    # the same order as BaseEvent.__lt__
+    assert all(
+        not later < earlier for earlier, later in zip(popped_events, popped_events[1:])
+    )
+
+
+def test_heap_and_compact_event_queues_agree():
+    events = _make_events(2000, 2)
+
+    heap_events = _pop_all(HeapEventQueue(), events)
+    compact_events = _pop_all(CompactEventQueue(), events)
+
+    assert [event.id for event in heap_events] == [
+        event.id for event in compact_events
+    ]
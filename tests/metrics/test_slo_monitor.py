@@ -0,0 +1,90 @@
+import types
+
+import pandas as pd
+import pytest
+
+from vidur.metrics.constants import SLOVerdict
+from vidur.metrics.slo_monitor import SLOMonitor
+
+SLO_VALUE = 1.0
+# just above the slo, so interpolating towards a delay within the slo stays
+# within it
+VIOLATING_DELAY = SLO_VALUE * (1 + 1e-6)
+
+
+def _end_request(slo_monitor, scheduling_delay):
+    slo_monitor.on_request_end(types.SimpleNamespace(scheduling_delay=scheduling_delay))
+
+
+@pytest.mark.parametrize("slo_quantile", [0.0, 0.5, 0.9, 0.95, 0.99, 1.0])
+@pytest.mark.parametrize("num_requests", list(range(1, 31)))
+def test_max_num_violations_matches_pandas_quantile(num_requests, slo_quantile):
+    slo_monitor = SLOMonitor(SLO_VALUE, slo_quantile, 16, 0)
+    slo_monitor.set_num_requests(num_requests)
+    max_num_violations = slo_monitor._max_num_violations
+    assert 0 <= max_num_violations < num_requests
+
+    # one violation more than the bound puts the quantile above the slo
+    # whatever the other delays are
+    delays = [0.0] * (num_requests - max_num_violations - 1) + [
+        VIOLATING_DELAY
+    ] * (max_num_violations + 1)
+    assert pd.Series(delays).quantile(slo_quantile) > SLO_VALUE
+
+    for idx, delay in enumerate(delays[::-1]):
+        _end_request(slo_monitor, delay)
+        if idx < max_num_violations:
+            assert slo_monitor.verdict is None
+    assert slo_monitor.verdict == SLOVerdict.VIOLATED
+
+    # the bound itself is not enough
+    delays = [0.0] * (num_requests - max_num_violations) + [
+        VIOLATING_DELAY
+    ] * max_num_violations
+    assert pd.Series(delays).quantile(slo_quantile) <= SLO_VALUE
+
+
+def test_max_num_violations_does_not_decrease_with_num_requests():
+    # an upper bound on the number of requests keeps the verdict sound
+    for slo_quantile in [0.5, 0.9, 0.99]:
+        bounds = []
+        for num_requests in range(1, 500):
+            slo_monitor = SLOMonitor(SLO_VALUE, slo_quantile, 16, 0)
+            slo_monitor.set_num_requests(num_requests)
+            bounds.append(slo_monitor._max_num_violations)
+        assert bounds == sorted(bounds)
+
+
+def test_unbounded_queue_growth():
+    slo_monitor = SLOMonitor(SLO_VALUE, 0.5, 10, 3)
+
+    # the mean delay grows over three windows up to 3x the slo
+    for idx in range(30):
+        assert slo_monitor.verdict is None
+        _end_request(slo_monitor, 0.1 * idx)
+
+    assert slo_monitor.verdict == SLOVerdict.UNBOUNDED_QUEUE_GROWTH
+
+
+def test_no_queue_growth_with_quantile_within_slo():
+    slo_monitor = SLOMonitor(SLO_VALUE, 0.5, 10, 3)
+
+    # growing window means from a single slow request per window, while the
+    # median stays at zero
+    for slow_delay in [5.0, 11.0, 20.0]:
+        for _ in range(9):
+            _end_request(slo_monitor, 0.0)
+        _end_request(slo_monitor, slow_delay)
+
+    assert slo_monitor.quantile_estimate < SLO_VALUE
+    assert slo_monitor.verdict is None
+
+
+def test_no_queue_growth_without_growing_windows():
+    slo_monitor = SLOMonitor(SLO_VALUE, 0.5, 10, 3)
+
+    for window_delay in [2.0, 3.0, 2.5, 4.0, 3.5]:
+        for _ in range(10):
+            _end_request(slo_monitor, window_delay)
+
+    assert slo_monitor.verdict is None
@@ -0,0 +1,124 @@
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vidur.metrics import data_series as data_series_module
+from vidur.metrics.data_series import DataSeries
+from vidur.metrics.metrics_sink import MetricsSink
+from vidur.metrics.metrics_store import MetricsStore
+
+CHUNK_SIZE = 64
+NUM_DATAPOINTS = 2000
+
+
+def _get_time_datapoints():
+    # float times in seconds, the whole run spans less than one chunk size
+    rng = np.random.default_rng(0)
+    times = np.sort(rng.random(NUM_DATAPOINTS) * 30)
+    return [(float(time), float(rng.random())) for time in times]
+
+
+def _get_request_id_datapoints():
+    # requests complete out of order, so ids arrive scrambled
+    rng = np.random.default_rng(1)
+    request_ids = rng.permutation(NUM_DATAPOINTS)
+    return [(int(request_id), float(rng.random())) for request_id in request_ids]
+
+
+def _get_series_pair(tmp_path, x_name, y_name, datapoints):
+    sink = MetricsSink(str(tmp_path / y_name), CHUNK_SIZE)
+    streamed = DataSeries(
+        x_name, y_name, save_table_to_wandb=False, save_plots=False, sink=sink
+    )
+    in_memory = DataSeries(x_name, y_name, save_table_to_wandb=False, save_plots=False)
+    for x, y in datapoints:
+        streamed.put(x, y)
+        in_memory.put(x, y)
+        # repeated x values have to land in the same window
+        if isinstance(x, int) and x % 7 == 0:
+            streamed.put(x, y + 1)
+            in_memory.put(x, y + 1)
+    return streamed, in_memory
+
+
+def _count_rows_read(monkeypatch):
+    num_rows_read = [0]
+    read_chunk = data_series_module.read_chunk
+
+    def counting_read_chunk(chunk_path):
+        columns = read_chunk(chunk_path)
+        num_rows_read[0] += len(columns[0])
+        return columns
+
+    monkeypatch.setattr(data_series_module, "read_chunk", counting_read_chunk)
+    return num_rows_read
+
+
+@pytest.mark.parametrize(
+    "x_name, get_datapoints",
+    [("time", _get_time_datapoints), ("request_id", _get_request_id_datapoints)],
+)
+def test_x_windows_hold_about_chunk_size_rows(
+    tmp_path, monkeypatch, x_name, get_datapoints
+):
+    streamed, _ = _get_series_pair(tmp_path, x_name, "y", get_datapoints())
+    num_rows_read = _count_rows_read(monkeypatch)
+
+    x_window_bounds = DataSeries._get_x_window_bounds([streamed], CHUNK_SIZE)
+    window_sizes = [
+        len(data_x) for data_x, _, _ in streamed._iter_x_windows(x_window_bounds)
+    ]
+
+    assert sum(window_sizes) == len(streamed)
+    assert len(window_sizes) > len(streamed) // (2 * CHUNK_SIZE)
+    assert max(window_sizes) <= 2 * CHUNK_SIZE
+    # sampled once, partitioned once and every partition read back once
+    assert num_rows_read[0] <= 3 * len(streamed)
+
+
+@pytest.mark.parametrize(
+    "x_name, get_datapoints",
+    [("time", _get_time_datapoints), ("request_id", _get_request_id_datapoints)],
+)
+def test_consolidate_streamed(tmp_path, x_name, get_datapoints):
+    streamed, in_memory = _get_series_pair(tmp_path, x_name, "y", get_datapoints())
+
+    streamed.consolidate()
+    in_memory.consolidate()
+
+    assert len(streamed) == len(in_memory)
+    pd.testing.assert_frame_equal(streamed._to_df(), in_memory._to_df())
+
+
+def test_save_as_csv_in_windows(tmp_path):
+    datapoints = _get_request_id_datapoints()
+    series_pairs = [
+        _get_series_pair(tmp_path, "request_id", f"y{idx}", datapoints[idx * 100 :])
+        for idx in range(3)
+    ]
+    streamed_list, in_memory_list = zip(*series_pairs)
+
+    streamed_store = types.SimpleNamespace(
+        _metrics_sink=MetricsSink(str(tmp_path / "merge"), CHUNK_SIZE),
+        _config=types.SimpleNamespace(save_table_to_wandb=False),
+    )
+    MetricsStore._save_as_csv_in_windows(
+        streamed_store,
+        list(streamed_list),
+        "request_id",
+        str(tmp_path / "streamed.csv"),
+    )
+    in_memory_store = types.SimpleNamespace(
+        _metrics_sink=None,
+        _config=types.SimpleNamespace(save_table_to_wandb=False),
+    )
+    MetricsStore._save_as_csv(
+        in_memory_store, list(in_memory_list), "request_id", str(tmp_path), "in_memory"
+    )
+
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "streamed.csv"),
+        pd.read_csv(tmp_path / "in_memory.csv"),
+    )
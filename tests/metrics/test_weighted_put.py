@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from vidur.metrics.cdf_sketch import CDFSketch
+from vidur.metrics.data_series import DataSeries
+from vidur.metrics.metrics_sink import MetricsSink
+
+QUANTILES = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0]
+
+
+def _get_datapoints(mix_unweighted: bool):
+    # (x, y, weight) triples, x values repeat to exercise consolidation
+    rng = np.random.default_rng(42)
+    datapoints = []
+    for _ in range(200):
+        x = int(rng.integers(0, 50))
+        y = float(rng.random() * 100)
+        weight = 1 if mix_unweighted and rng.random() < 0.5 else int(rng.integers(1, 6))
+        datapoints.append((x, y, weight))
+    return datapoints
+
+
+def _get_series_pair(tmp_path, streamed: bool):
+    sinks = [None, None]
+    if streamed:
+        sinks = [
+            MetricsSink(str(tmp_path / "weighted"), 16),
+            MetricsSink(str(tmp_path / "repeated"), 16),
+        ]
+    return [
+        DataSeries("x", "y", save_table_to_wandb=False, save_plots=False, sink=sink)
+        for sink in sinks
+    ]
+
+
+@pytest.mark.parametrize("mix_unweighted", [False, True])
+def test_cdf_sketch_weighted_put(mix_unweighted):
+    weighted = CDFSketch("y", save_table_to_wandb=False, save_plots=False)
+    repeated = CDFSketch("y", save_table_to_wandb=False, save_plots=False)
+    for _, y, weight in _get_datapoints(mix_unweighted):
+        weighted.put(y, weight)
+        for _ in range(weight):
+            repeated.put(y)
+
+    assert len(weighted) == len(repeated)
+    assert weighted.sum == pytest.approx(repeated.sum)
+    for quantile in QUANTILES:
+        assert weighted.get_quantile(quantile) == pytest.approx(
+            repeated.get_quantile(quantile)
+        )
+    pd.testing.assert_frame_equal(weighted._to_df(), repeated._to_df())
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+@pytest.mark.parametrize("mix_unweighted", [False, True])
+def test_data_series_weighted_put(tmp_path, streamed, mix_unweighted):
+    weighted, repeated = _get_series_pair(tmp_path, streamed)
+    for x, y, weight in _get_datapoints(mix_unweighted):
+        weighted.put(x, y, weight)
+        for _ in range(weight):
+            repeated.put(x, y)
+
+    assert len(weighted) == len(repeated)
+    pd.testing.assert_frame_equal(weighted._to_df(), repeated._to_df())
+    for quantile in QUANTILES:
+        assert weighted.get_quantile(quantile) == pytest.approx(
+            repeated.get_quantile(quantile)
+        )
+
+    weighted_mean, weighted_quantiles = weighted.get_mean_and_quantiles(QUANTILES)
+    repeated_mean, repeated_quantiles = repeated.get_mean_and_quantiles(QUANTILES)
+    assert weighted_mean == pytest.approx(repeated_mean)
+    assert weighted_quantiles == pytest.approx(repeated_quantiles)
+
+    weighted.consolidate()
+    repeated.consolidate()
+
+    assert len(weighted) == len(repeated)
+    weighted_df = weighted._to_df()
+    repeated_df = repeated._to_df()
+    pd.testing.assert_series_equal(weighted_df["x"], repeated_df["x"])
+    # the means are summed in a different order
+    np.testing.assert_allclose(weighted_df["y"], repeated_df["y"])
+
+
+def test_data_series_weight_after_unweighted_datapoints():
+    # the weights of the earlier unweighted datapoints are filled in lazily
+    weighted = DataSeries("x", "y", save_table_to_wandb=False, save_plots=False)
+    repeated = DataSeries("x", "y", save_table_to_wandb=False, save_plots=False)
+    for x in range(3):
+        weighted.put(x, float(x))
+        repeated.put(x, float(x))
+    weighted.put(3, 3.0, 4)
+    weighted.put(4, 4.0)
+    for _ in range(4):
+        repeated.put(3, 3.0)
+    repeated.put(4, 4.0)
+
+    assert len(weighted) == len(repeated) == 8
+    pd.testing.assert_frame_equal(weighted._to_df(), repeated._to_df())
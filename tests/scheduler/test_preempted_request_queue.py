@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+# the scheduler package imports the execution time predictors
+pytest.importorskip("sklearn")
+
+from vidur.entities import Request
+from vidur.scheduler.utils.preempted_request_queue import PreemptedRequestQueue
+
+
+def _get_order_key(request):
+    return request.arrived_at, request.id
+
+
+def _make_request(arrived_at):
+    return Request(arrived_at=arrived_at, num_prefill_tokens=1, num_decode_tokens=1)
+
+
+def test_push_pop_first_pop_last_remove():
+    queue = PreemptedRequestQueue()
+    # two requests arriving together are ordered by id
+    requests = [_make_request(arrived_at) for arrived_at in [3.0, 1.0, 2.0, 1.0, 5.0]]
+    for request in requests:
+        queue.push(request)
+
+    assert len(queue) == 5
+    assert list(queue) == sorted(requests, key=_get_order_key)
+
+    assert queue.pop_first() is requests[1]
+    assert queue.pop_last() is requests[4]
+    queue.remove(requests[3])
+    assert list(queue) == [requests[2], requests[0]]
+
+    assert queue.pop_last() is requests[0]
+    assert queue.pop_first() is requests[2]
+    assert len(queue) == 0
+    assert list(queue) == []
+
+    with pytest.raises(KeyError):
+        queue.remove(requests[0])
+
+
+def test_matches_sorted_list_under_random_operations():
+    rng = random.Random(0)
+    queue = PreemptedRequestQueue()
+    expected = []
+
+    for _ in range(20000):
+        operation = rng.random()
+        if not expected or operation < 0.4:
+            # coarse arrival times so that ties are common
+            request = _make_request(float(rng.randrange(100)))
+            queue.push(request)
+            expected.append(request)
+            expected.sort(key=_get_order_key)
+        elif operation < 0.6:
+            assert queue.pop_first() is expected.pop(0)
+        elif operation < 0.8:
+            assert queue.pop_last() is expected.pop()
+        else:
+            queue.remove(expected.pop(rng.randrange(len(expected))))
+
+        assert len(queue) == len(expected)
+        # lazily deleted entries are compacted away
+        assert len(queue._min_heap) <= 2 * len(expected) + 33
+        assert len(queue._max_heap) <= 2 * len(expected) + 33
+
+    assert list(queue) == expected
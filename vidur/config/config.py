@@ -228,7 +228,9 @@ class SyntheticRequestGeneratorConfig(BaseRequestGeneratorConfig):
 class TraceRequestGeneratorConfig(BaseRequestGeneratorConfig):
     trace_file: str = field(
         default="data/processed_traces/splitwise_conv.csv",
-        metadata={"help": "Path to the trace request generator file."},
+        metadata={
+            "help": "Path to the trace request generator file, either a csv or a columnar trace directory."
+        },
     )
     prefill_scale_factor: float = field(
         default=1.0,
@@ -364,6 +366,12 @@ class MetricsConfig:
         default=True,
         metadata={"help": "Enable Chrome tracing."},
     )
+    enable_profiling: bool = field(
+        default=False,
+        metadata={
+            "help": "Record wall time spent per event type, handler, scheduler, predictor and metrics hook."
+        },
+    )
     save_table_to_wandb: bool = field(
         default=False,
         metadata={"help": "Whether to save table to wandb."},
@@ -408,6 +416,48 @@ class MetricsConfig:
         default=None,
         metadata={"help": "Maximum batch index."},
     )
+    headless: bool = field(
+        default=False,
+        metadata={
+            "help": "Skip plots and wandb, only write the csv files of the metrics in headless_metrics."
+        },
+    )
+    headless_metrics: List[str] = field(
+        default_factory=lambda: ["request_scheduling_delay"],
+        metadata={"help": "Metrics written in headless mode."},
+    )
+    stream_metrics: bool = field(
+        default=False,
+        metadata={
+            "help": "Flush per-request and per-batch metric rows to chunk files under output_dir/metrics during the run instead of keeping them in memory."
+        },
+    )
+    stream_metrics_chunk_size: int = field(
+        default=65536,
+        metadata={"help": "Number of rows per metric chunk file."},
+    )
+    scheduling_delay_slo_value: Optional[float] = field(
+        default=None,
+        metadata={
+            "help": "Stop the simulation once this scheduling delay SLO is known to be violated. Disabled if not set."
+        },
+    )
+    scheduling_delay_slo_quantile: float = field(
+        default=0.99,
+        metadata={"help": "Quantile of the scheduling delay SLO."},
+    )
+    slo_monitor_window_size: int = field(
+        default=128,
+        metadata={
+            "help": "Number of completed requests per window when checking the scheduling delay for unbounded growth."
+        },
+    )
+    slo_monitor_num_growth_windows: int = field(
+        default=4,
+        metadata={
+            "help": "Stop the simulation after this many windows of growing mean scheduling delay ending above the SLO. 0 disables the check."
+        },
+    )
     output_dir: str = field(
         default="simulator_output",
         metadata={"help": "Output directory."},
@@ -530,6 +580,12 @@ class CombinedGlobalSchedulerConfig(BaseGlobalSchedulerConfig):
     def get_type():
         return GlobalSchedulerType.COMBINED_BALANCED
 
+@dataclass
+class PredictedCompletionTimeGlobalSchedulerConfig(BaseGlobalSchedulerConfig):
+    @staticmethod
+    def get_type():
+        return GlobalSchedulerType.PREDICTED_COMPLETION_TIME
+
 @dataclass
 class BaseExecutionTimePredictorConfig(BasePolyConfig):
     compute_input_file: str = field(
@@ -560,6 +616,18 @@ class BaseExecutionTimePredictorConfig(BasePolyConfig):
         default=False,
         metadata={"help": "Whether to cache prediction models."},
     )
+    cache_max_size_mb: int = field(
+        default=10240,
+        metadata={
+            "help": "Size budget of the model and prediction cache, least recently used entries are evicted beyond it. 0 means no limit."
+        },
+    )
+    save_prediction_tables: bool = field(
+        default=False,
+        metadata={
+            "help": "Debug option to save the training and inference predictions of every model as CSV entries of the cache."
+        },
+    )
     kv_cache_prediction_granularity: int = field(
         default=64,
         metadata={"help": "KV cache prediction granularity."},
@@ -596,10 +664,22 @@ class BaseExecutionTimePredictorConfig(BasePolyConfig):
         default=-1,
         metadata={"help": "Number of training job threads."},
     )
+    num_training_processes: int = field(
+        default=-1,
+        metadata={
+            "help": "Number of processes used to train independent models concurrently. -1 uses all cores, 1 trains sequentially."
+        },
+    )
     skip_cpu_overhead_modeling: bool = field(
         default=True,
         metadata={"help": "Whether to skip CPU overhead modeling."},
     )
+    execution_time_cache_size: int = field(
+        default=4096,
+        metadata={
+            "help": "Number of batch execution times to memoize per predictor. 0 disables the cache."
+        },
+    )
 
 
 @dataclass
@@ -677,6 +757,36 @@ class SimulationConfig(ABC):
         default=0,  # in seconds, 0 is no limit
         metadata={"help": "Time limit for simulation in seconds. 0 means no limit."},
     )
+    use_compact_event_queue: bool = field(
+        default=False,
+        metadata={
+            "help": "Order events by packed integer (time, event_type, id) keys instead of tuples. Both queues pop events in the same order."
+        },
+    )
+    stream_requests: bool = field(
+        default=False,
+        metadata={
+            "help": "Generate requests lazily and only keep the next arrival in the event queue."
+        },
+    )
+    coalesce_schedule_events: bool = field(
+        default=False,
+        metadata={
+            "help": "Merge arrivals within the coalescing tolerance into one global schedule pass and drop duplicate replica schedule events."
+        },
+    )
+    schedule_coalescing_tolerance: float = field(
+        default=0.0,
+        metadata={
+            "help": "Arrivals up to this many seconds after the first one share its global schedule pass. 0 only merges identical timestamps."
+        },
+    )
+    result_store_path: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": "SQLite result store to record the summary metrics of the run in."
+        },
+    )
     cluster_config: ClusterConfig = field(
         default_factory=ClusterConfig,
         metadata={"help": "Cluster config."},
@@ -698,8 +808,8 @@ class SimulationConfig(ABC):
         self.write_config_to_file()
 
     @classmethod
-    def create_from_cli_args(cls):
-        flat_config = create_flat_dataclass(cls).create_from_cli_args()
+    def create_from_cli_args(cls, args: Optional[List[str]] = None):
+        flat_config = create_flat_dataclass(cls).create_from_cli_args(args)
         instance = flat_config.reconstruct_original_dataclass()
         instance.__flat_config__ = flat_config
         return instance
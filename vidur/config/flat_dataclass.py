@@ -6,7 +6,7 @@ from argparse import (
 )
 from collections import defaultdict, deque
 from dataclasses import MISSING, fields, make_dataclass
-from typing import Any, get_args
+from typing import Any, List, Optional, get_args
 
 from vidur.config.base_poly_config import BasePolyConfig
 from vidur.config.utils import (
@@ -85,9 +85,10 @@ def reconstruct_original_dataclass(self) -> Any:
 
 
 @classmethod
-def create_from_cli_args(cls) -> Any:
+def create_from_cli_args(cls, args: Optional[List[str]] = None) -> Any:
     """
     This function is dynamically mapped to FlatClass as a class method.
+    Parses `args` instead of sys.argv when given.
     """
     parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
 
@@ -131,9 +132,9 @@ def create_from_cli_args(cls) -> Any:
             arg_params["nargs"] = nargs
         parser.add_argument(f"--{field.name}", **arg_params)
 
-    args = parser.parse_args()
+    parsed_args = parser.parse_args(args)
 
-    return cls(**vars(args))
+    return cls(**vars(parsed_args))
 
 
 def create_flat_dataclass(input_dataclass: Any) -> Any:
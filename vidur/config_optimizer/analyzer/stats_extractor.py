@@ -2,7 +2,9 @@ import argparse
 import glob
 import json
 import os
+from functools import reduce
 from multiprocessing import Pool
+from typing import List
 
 import numpy as np
 import pandas as pd
@@ -10,9 +12,13 @@ import yaml
 
 from vidur.config_optimizer.analyzer.constants import CPU_MACHINE_COST, GPU_COSTS
 from vidur.logger import init_logger
+from vidur.metrics.metrics_sink import load_series_df
 
 logger = init_logger(__name__)
 
+REQUEST_ID_STR = "Request Id"
+TIME_STR = "Time (sec)"
+
 
 def extract_stat_from_request_metrics(
     request_metrics_df: pd.DataFrame,
@@ -79,29 +85,61 @@ def extract_utilization_stats(run_dir: str, stat_name: str):
     return {f"{stat_name}_mean": sum(vals) / len(vals)}
 
 
+def load_request_metrics_df(run_dir: str, metric_names: List[str]) -> pd.DataFrame:
+    streamed_metrics_dir = f"{run_dir}/metrics"
+    if not os.path.isdir(streamed_metrics_dir):
+        return pd.read_csv(f"{run_dir}/request_metrics.csv")
+
+    # streamed runs keep every metric as chunks of its own, only the ones we
+    # need are read back and joined on the request id
+    return reduce(
+        lambda left, right: pd.merge(left, right, on=[REQUEST_ID_STR], how="outer"),
+        [
+            load_series_df(
+                f"{streamed_metrics_dir}/{metric_name}", REQUEST_ID_STR, metric_name
+            )
+            for metric_name in metric_names
+        ],
+    )
+
+
+def get_runtime(run_dir: str) -> float:
+    request_completion_dir = f"{run_dir}/metrics/request_completion"
+    if os.path.isdir(request_completion_dir):
+        request_completion_df = load_series_df(
+            request_completion_dir, TIME_STR, "request_completion"
+        )
+    else:
+        request_completion_df = pd.read_csv(
+            f"{run_dir}/plots/request_completion_time_series.csv"
+        )
+    return request_completion_df[TIME_STR].max()
+
+
 def process_run(run_dir: str):
     config_file = f"{run_dir}/config.yml"
-    request_metrics_file = f"{run_dir}/request_metrics.csv"
     tbt_file = f"{run_dir}/plots/batch_execution_time.csv"
     ttft_file = f"{run_dir}/plots/prefill_e2e_time.csv"
     batch_size_file = f"{run_dir}/plots/batch_size.csv"
     batch_num_tokens_file = f"{run_dir}/plots/batch_num_tokens.csv"
-    request_completion_time_series_file = (
-        f"{run_dir}/plots/request_completion_time_series.csv"
-    )
 
     try:
         with open(config_file, "r") as f:
             config = yaml.safe_load(f)
 
-        request_metrics_df = pd.read_csv(request_metrics_file)
+        request_metrics_df = load_request_metrics_df(
+            run_dir,
+            [
+                "request_scheduling_delay",
+                "request_e2e_time_normalized",
+                "prefill_e2e_time",
+            ],
+        )
         tbt_df = pd.read_csv(tbt_file)
         ttft_df = pd.read_csv(ttft_file)
         batch_size_df = pd.read_csv(batch_size_file)
         batch_num_tokens_df = pd.read_csv(batch_num_tokens_file)
-        request_completion_time_series_df = pd.read_csv(
-            request_completion_time_series_file
-        )
+        runtime = get_runtime(run_dir)
     except FileNotFoundError as e:
         # TODO(amey): Add a better error handling approach
         # we can run into this issue if the run was not successful
@@ -135,7 +173,6 @@ def process_run(run_dir: str):
     memory_usage_stats = extract_utilization_stats(run_dir, "memory_usage")
     mfu_stats = extract_utilization_stats(run_dir, "mfu")
     busy_time_percent_stats = extract_utilization_stats(run_dir, "busy_time_percent")
-    runtime = request_completion_time_series_df["Time (sec)"].max()
 
     if (
         config["replica_scheduler_provider"] == "sarathi"
@@ -0,0 +1,159 @@
+"""
+    Compares the capacity search strategies on the job configs of a config
+    explorer yaml, with and without warm starts, against synthetic scheduling
+    delay vs qps curves instead of simulations. Reports the average number of
+    probes per config and how far the capacities found are from the true ones.
+"""
+
+import argparse
+import hashlib
+import math
+from typing import Dict, Tuple
+
+import yaml
+
+from vidur.config_optimizer.config_explorer.config import JobConfig
+from vidur.config_optimizer.config_explorer.search_strategy import SEARCH_STRATEGIES
+
+# scheduling delay at zero load as a fraction of the slo
+_BASE_RELATIVE_DELAY = 0.05
+
+
+def get_synthetic_capacity(job_config: JobConfig) -> float:
+    # more workers serve more qps with diminishing returns, with a deterministic
+    # per config deviation of up to about 20%
+    noise = int(hashlib.sha1(job_config.get_key().encode("utf-8")).hexdigest(), 16)
+    noise = 0.8 + 0.4 * (noise % 1000) / 1000
+    return (
+        job_config.start_qps
+        * 0.5
+        * job_config.num_tensor_parallel_workers**0.9
+        * job_config.num_pipeline_stages**0.8
+        * noise
+    )
+
+
+def get_synthetic_scheduling_delay(
+    qps: float, capacity: float, scheduling_delay_slo_value: float
+) -> float:
+    # queueing delay grows as rho / (1 - rho) up to the saturation point and
+    # then with the backlog built up over the run, the delay at `capacity` is
+    # the slo
+    base_delay = _BASE_RELATIVE_DELAY * scheduling_delay_slo_value
+    slo_utilization = scheduling_delay_slo_value / (
+        scheduling_delay_slo_value + base_delay
+    )
+    utilization = qps / (capacity / slo_utilization)
+    if utilization < 0.999:
+        return base_delay * utilization / (1 - utilization)
+    return base_delay * 1000 * utilization
+
+
+def run_synthetic_search(
+    search_strategy_name: str,
+    start_qps: float,
+    capacity: float,
+    scheduling_delay_slo_value: float,
+    min_search_granularity: float,
+    max_iterations: int,
+) -> Tuple[float, int]:
+    search_strategy = SEARCH_STRATEGIES[search_strategy_name](
+        start_qps, scheduling_delay_slo_value, min_search_granularity
+    )
+    for _ in range(max_iterations):
+        qps = search_strategy.get_next_qps()
+        if qps is None:
+            break
+
+        scheduling_delay = get_synthetic_scheduling_delay(
+            qps, capacity, scheduling_delay_slo_value
+        )
+        search_strategy.on_probe(
+            qps, scheduling_delay, scheduling_delay <= scheduling_delay_slo_value
+        )
+
+    return search_strategy.max_qps_under_sla, search_strategy.num_probes
+
+
+def run_synthetic_sweep(
+    config: dict,
+    search_strategy_name: str,
+    warm_start: bool,
+    scheduling_delay_slo_value: float = 5.0,
+    min_search_granularity: float = 2.5,
+    max_iterations: int = 20,
+) -> Dict[str, float]:
+    job_configs = JobConfig.generate_job_configs(config)
+    if warm_start:
+        stages = JobConfig.get_warm_start_stages(job_configs)
+    else:
+        stages = [job_configs]
+
+    capacities = {}
+    num_probes = []
+    relative_errors = []
+    for stage_job_configs in stages:
+        stage_capacities = {}
+        for job_config in stage_job_configs:
+            start_qps, _ = job_config.get_warm_start_qps(capacities)
+            capacity = get_synthetic_capacity(job_config)
+            max_qps_under_sla, job_num_probes = run_synthetic_search(
+                search_strategy_name,
+                start_qps,
+                capacity,
+                scheduling_delay_slo_value,
+                min_search_granularity,
+                max_iterations,
+            )
+
+            num_probes.append(job_num_probes)
+            if max_qps_under_sla is None:
+                relative_errors.append(1.0)
+                continue
+
+            relative_errors.append(abs(max_qps_under_sla - capacity) / capacity)
+            stage_capacities[job_config.get_hash()] = max_qps_under_sla
+        capacities.update(stage_capacities)
+
+    return {
+        "num_configs": len(num_probes),
+        "num_stages": len(stages),
+        "avg_probes": sum(num_probes) / len(num_probes),
+        "max_probes": max(num_probes),
+        "avg_relative_error": sum(relative_errors) / len(relative_errors),
+        "max_relative_error": max(relative_errors),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--config-path",
+        type=str,
+        default="vidur/config_optimizer/config_explorer/config/config.yml",
+    )
+    parser.add_argument("--scheduling-delay-slo-value", type=float, default=5.0)
+    parser.add_argument("--min-search-granularity", type=float, default=2.5)
+    parser.add_argument("--max-iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    config = yaml.safe_load(open(args.config_path))
+
+    for search_strategy_name in SEARCH_STRATEGIES:
+        for warm_start in (False, True):
+            stats = run_synthetic_sweep(
+                config,
+                search_strategy_name,
+                warm_start,
+                args.scheduling_delay_slo_value,
+                args.min_search_granularity,
+                args.max_iterations,
+            )
+            print(
+                f"strategy: {search_strategy_name}, warm start: {warm_start},"
+                f" configs: {stats['num_configs']}, stages: {stats['num_stages']},"
+                f" avg probes: {stats['avg_probes']:.2f},"
+                f" max probes: {stats['max_probes']},"
+                f" avg error: {100 * stats['avg_relative_error']:.2f}%,"
+                f" max error: {100 * stats['max_relative_error']:.2f}%"
+            )
@@ -1,45 +1,60 @@
 import argparse
 import glob
+import json
 import os
 import platform
 import shlex
 from subprocess import Popen
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 import pandas as pd
-import ray
 
+from vidur.config import SimulationConfig as SimulatorConfig
 from vidur.config_optimizer.config_explorer.config import JobConfig, SimulationConfig
-from vidur.config_optimizer.config_explorer.ray_utils import (
-    CpuAssignmentManager,
-    get_ip,
+from vidur.config_optimizer.config_explorer.search_strategy import SEARCH_STRATEGIES
+from vidur.execution_time_predictor.execution_time_predictor_pool import (
+    ExecutionTimePredictorPool,
 )
 from vidur.logger import init_logger
+from vidur.metrics.constants import RequestMetricsTimeDistributions
+from vidur.simulator import Simulator
+from vidur.utils.random import set_seeds
+from vidur.utils.result_store import ResultStore
 
 logger = init_logger(__name__)
 
+if TYPE_CHECKING:
+    from vidur.config_optimizer.config_explorer.ray_utils import CpuAssignmentManager
+
 
 class CapacitySearch:
     def __init__(
         self,
         job_config: JobConfig,
         args: argparse.Namespace,
-        cpu_core_assignment_manager: CpuAssignmentManager = None,
+        cpu_core_assignment_manager: "CpuAssignmentManager" = None,
         cpu_core_id: int = None,
+        warm_start_capacities: Optional[Dict[str, float]] = None,
     ):
-        self.node_ip = get_ip()
         self.cpu_core_id = None
         self.job_config = job_config
         self.args = args
         self.cpu_core_assignment_manager = cpu_core_assignment_manager
         self.cpu_core_id = cpu_core_id
+        self.warm_start_capacities = warm_start_capacities or {}
 
     def release_cpu_core_id(self):
         if self.cpu_core_id is None:
             return
 
+        # only searches scheduled by the ray runner are assigned a core
+        import ray
+
+        from vidur.config_optimizer.config_explorer.ray_utils import get_ip
+
         ray.get(
             self.cpu_core_assignment_manager.release_cpu_core_id.remote(
-                self.node_ip,
+                get_ip(),
                 self.cpu_core_id,
             )
         )
@@ -59,7 +74,7 @@ class CapacitySearch:
 
     def _get_result_file(self, run_dir: str) -> str:
         scheduling_delay_file = glob.glob(
-            f"{run_dir}/*/plots/request_scheduling_delay.csv"
+            f"{run_dir}/**/plots/request_scheduling_delay.csv", recursive=True
         )
         if len(scheduling_delay_file) == 0:
             return
@@ -75,15 +90,100 @@ class CapacitySearch:
         scheduling_delay = scheduling_delay_df["request_scheduling_delay"].quantile(
             self.args.scheduling_delay_slo_quantile
         )
+
+        # runs stopped by the slo monitor leave its verdict next to the plots
+        slo_verdict = None
+        run_output_dir = os.path.dirname(os.path.dirname(result_file))
+        slo_verdict_file = f"{run_output_dir}/slo_verdict.json"
+        if os.path.exists(slo_verdict_file):
+            with open(slo_verdict_file, "r") as f:
+                slo_verdict = json.load(f)["verdict"]
+
+        return self._check_scheduling_delay(
+            scheduling_delay, simulator_config, slo_verdict
+        )
+
+    def _check_scheduling_delay(
+        self,
+        scheduling_delay: float,
+        simulator_config: SimulationConfig,
+        slo_verdict: Optional[str] = None,
+    ) -> tuple[bool, float]:
         is_under_scheduling_delay_sla = (
             scheduling_delay <= self.args.scheduling_delay_slo_value
+            and slo_verdict is None
         )
 
         logger.info(
-            f"{simulator_config.to_human_readable_name()} - Scheduling delay (P{self.args.scheduling_delay_slo_quantile}): {scheduling_delay}",
+            f"{simulator_config.to_human_readable_name()} - Scheduling delay (P{self.args.scheduling_delay_slo_quantile}): {scheduling_delay}, SLO verdict: {slo_verdict}",
         )
         return is_under_scheduling_delay_sla, scheduling_delay
 
+    def _is_under_sla_from_store(
+        self,
+        simulator_config: SimulationConfig,
+    ) -> Optional[tuple[bool, float]]:
+        result_store = ResultStore(self.args.result_store_path)
+        results = result_store.get_for_cli_args(shlex.split(simulator_config.to_args()))
+        if results is None:
+            return None
+
+        quantile = self.args.scheduling_delay_slo_quantile
+        scheduling_delay = results.get(f"request_scheduling_delay_p{quantile * 100:g}")
+        if scheduling_delay is None:
+            # runs record the quantile they are configured with, so this is a
+            # run without completed requests or one stored by an older version
+            logger.warning(
+                f"No P{quantile} scheduling delay stored for {simulator_config.to_human_readable_name()}, running it again",
+            )
+            return None
+
+        return self._check_scheduling_delay(
+            scheduling_delay, simulator_config, results.get("slo_verdict")
+        )
+
+    def _is_under_sla_in_process(
+        self,
+        simulator_config: SimulationConfig,
+    ) -> tuple[bool, float]:
+        # the predictors are shared through the process-wide predictor pool, so
+        # only the first probe of a job config loads them and later probes only
+        # regenerate the requests at the new qps
+        try:
+            config = SimulatorConfig.create_from_cli_args(
+                shlex.split(simulator_config.to_args())
+            )
+            set_seeds(config.seed)
+
+            simulator = Simulator(config)
+            try:
+                simulator.run()
+                simulator.write_output()
+            finally:
+                simulator.discard_output()
+
+            scheduling_delay = simulator.metric_store.get_request_metric_quantile(
+                RequestMetricsTimeDistributions.REQUEST_SCHEDULING_DELAY,
+                self.args.scheduling_delay_slo_quantile,
+            )
+            assert (
+                scheduling_delay is not None
+            ), f"No requests completed for {simulator_config.to_human_readable_name()}"
+        except Exception as e:
+            logger.error(
+                f"Error running: {self.job_config.get_human_readable_name()}, failed with error: {e}",
+            )
+            return False, None
+
+        slo_verdict = None
+        slo_monitor = simulator.metric_store.slo_monitor
+        if slo_monitor is not None and slo_monitor.verdict is not None:
+            slo_verdict = slo_monitor.verdict.value
+
+        return self._check_scheduling_delay(
+            scheduling_delay, simulator_config, slo_verdict
+        )
+
     def is_under_sla(self, qps: float) -> tuple[bool, float]:
         simulator_config = SimulationConfig(
             output_dir=self.args.output_dir,
@@ -92,13 +192,32 @@ class CapacitySearch:
             time_limit=self.args.time_limit,
             job_config=self.job_config,
         )
+        if self.args.early_stop:
+            simulator_config.scheduling_delay_slo_value = (
+                self.args.scheduling_delay_slo_value
+            )
+        if self.args.early_stop or self.args.result_store_path:
+            simulator_config.scheduling_delay_slo_quantile = (
+                self.args.scheduling_delay_slo_quantile
+            )
+        if self.args.result_store_path:
+            simulator_config.result_store_path = self.args.result_store_path
+
         run_dir = simulator_config.get_run_dir()
         os.makedirs(run_dir, exist_ok=True)
 
+        if self.args.result_store_path:
+            stored_result = self._is_under_sla_from_store(simulator_config)
+            if stored_result is not None:
+                return stored_result
+
         cached_result_file = self._get_result_file(run_dir)
         if cached_result_file:
             return self._is_under_sla(cached_result_file, simulator_config)
 
+        if self.args.in_process:
+            return self._is_under_sla_in_process(simulator_config)
+
         command = self._generate_run_command(simulator_config)
 
         output_file = open(f"{run_dir}/output.log", "w")
@@ -122,53 +241,54 @@ class CapacitySearch:
             )
             return False, None
 
+    def _get_start_qps(self) -> tuple[float, List[str]]:
+        if not self.args.warm_start:
+            return self.job_config.start_qps, []
+
+        # start from the capacities found for the same model at neighbouring
+        # parallelisms in the earlier stages of the sweep
+        start_qps, neighbour_names = self.job_config.get_warm_start_qps(
+            self.warm_start_capacities
+        )
+        if neighbour_names:
+            logger.info(
+                f"Warm starting search for {self.job_config.get_human_readable_name()} at QPS: {start_qps}, from: {neighbour_names}",
+            )
+        return start_qps, neighbour_names
+
     def search(self):
         """
-        Perform binary search to find the maximum QPS under the SLO
+        Search for the maximum QPS under the SLO
         """
         logger.info(
             f"Starting search for {self.job_config.get_human_readable_name()}",
         )
 
-        left = 0
-        right = self.job_config.start_qps * 2
-        qps = 0
-        max_qps_under_sla = None
-        min_qps_over_sla = 2**32
-
-        for _ in range(self.args.max_iterations):
-            # stopping condition - we have reached the minimum granularity
-            if abs(left - right) < self.args.min_search_granularity * qps / 100:
-                break
-
-            qps = (left + right) / 2
-
-            is_under_sla, scheduling_delay = self.is_under_sla(qps)
+        start_qps, warm_start_neighbours = self._get_start_qps()
+        search_strategy = SEARCH_STRATEGIES[self.args.search_strategy](
+            start_qps,
+            self.args.scheduling_delay_slo_value,
+            self.args.min_search_granularity,
+        )
 
-            if scheduling_delay is None:
-                break
+        try:
+            for _ in range(self.args.max_iterations):
+                qps = search_strategy.get_next_qps()
+                if qps is None:
+                    break
 
-            if is_under_sla:
-                max_qps_under_sla = qps
+                is_under_sla, scheduling_delay = self.is_under_sla(qps)
 
-                if scheduling_delay < self.args.scheduling_delay_slo_value / 8:
-                    # if the scheduling delay is very low, we can increase the QPS more aggressively
-                    right = min(right * 4, min_qps_over_sla)
-                elif scheduling_delay < self.args.scheduling_delay_slo_value / 4:
-                    right = min(right * 2, min_qps_over_sla)
-                elif qps > 0.8 * right:
-                    right = min(right * 2, min_qps_over_sla)
+                if scheduling_delay is None:
+                    break
 
-                left = qps
-            else:
-                if scheduling_delay > 500:
-                    right = qps / 2
-                elif scheduling_delay > 1000:
-                    right = qps / 4
-                else:
-                    right = qps
+                search_strategy.on_probe(qps, scheduling_delay, is_under_sla)
+        finally:
+            # the predictors of this job config are not used by later searches
+            # in the process, drop them instead of keeping every model loaded
+            ExecutionTimePredictorPool.clear()
 
-                min_qps_over_sla = min(min_qps_over_sla, qps)
+        max_qps_under_sla = search_strategy.max_qps_under_sla
 
         logger.info(
             f"Max QPS under SLO for {self.job_config.get_human_readable_name()}: {max_qps_under_sla}",
@@ -179,4 +299,7 @@ class CapacitySearch:
         return {
             **self.job_config.to_config_dict(),
             "max_qps_under_sla": max_qps_under_sla,
+            "num_probes": search_strategy.num_probes,
+            "start_qps": start_qps,
+            "warm_start_neighbours": warm_start_neighbours,
         }
@@ -1,7 +1,7 @@
 import hashlib
 from dataclasses import dataclass
 from itertools import product
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -15,7 +15,7 @@ class ModelConfig:
 
     def to_config_dict(self):
         return {
-            "replica_config_model_name": self.identifier,
+            "replica_config_model_names": self.identifier,
         }
 
     def is_tensor_parallel_degree_valid(self, tp_degree: int):
@@ -38,7 +38,6 @@ class TraceConfig:
             "request_generator_config_type": "synthetic",
             "length_generator_config_type": "trace",
             "interval_generator_config_type": "poisson",
-            "synthetic_request_generator_config_max_tokens": self.max_seq_len,
             "trace_request_length_generator_config_max_tokens": self.max_seq_len,
             "zipf_request_length_generator_config_max_tokens": self.max_seq_len,
             "uniform_request_length_generator_config_max_tokens": self.max_seq_len,
@@ -126,6 +125,66 @@ class JobConfig:
             and self.num_tensor_parallel_workers <= self.cluster_config.gpus_per_node
         )
 
+    def get_neighbour_job_configs(self) -> List["JobConfig"]:
+        # the same model, trace, cluster and scheduler at an adjacent tp or pp
+        batch_size = self.batch_size // self.num_pipeline_stages
+        tp_dimension = self.num_tensor_parallel_workers
+        pp_dimension = self.num_pipeline_stages
+
+        neighbour_job_configs = []
+        for neighbour_tp_dimension, neighbour_pp_dimension in (
+            (tp_dimension // 2, pp_dimension),
+            (tp_dimension * 2, pp_dimension),
+            (tp_dimension, pp_dimension // 2),
+            (tp_dimension, pp_dimension * 2),
+        ):
+            if neighbour_tp_dimension < 1 or neighbour_pp_dimension < 1:
+                continue
+
+            job_config = JobConfig(
+                self.model_config,
+                self.trace_config,
+                self.cluster_config,
+                self.scheduler_config,
+                neighbour_tp_dimension,
+                neighbour_pp_dimension,
+                batch_size,
+            )
+            if job_config.is_valid():
+                neighbour_job_configs.append(job_config)
+
+        return neighbour_job_configs
+
+    def get_warm_start_qps(
+        self, capacities: Dict[str, float]
+    ) -> Tuple[float, List[str]]:
+        # the mean capacity of the neighbours found in `capacities`, keyed by
+        # job config hash, and the names of those neighbours
+        neighbour_names = []
+        neighbour_capacities = []
+        for job_config in self.get_neighbour_job_configs():
+            capacity = capacities.get(job_config.get_hash())
+            if capacity is None:
+                continue
+
+            neighbour_names.append(job_config.get_human_readable_name())
+            neighbour_capacities.append(capacity)
+
+        if not neighbour_capacities:
+            return self.start_qps, []
+
+        return sum(neighbour_capacities) / len(neighbour_capacities), neighbour_names
+
+    def get_predicted_cost(self) -> float:
+        # a search runs for roughly as many batch stages as its trace has tokens
+        # per batch, times the pipeline stages each batch goes through
+        return (
+            self.trace_config.num_requests
+            * self.trace_config.max_seq_len
+            * self.num_pipeline_stages
+            / self.batch_size
+        )
+
     def get_key(self):
         return (
             f"{self.model_config.name}_{self.trace_config.get_key()}_{self.cluster_config.get_key()}_{self.scheduler_config.get_key()}"
@@ -194,6 +253,59 @@ class JobConfig:
 
         return job_configs
 
+    @classmethod
+    def get_warm_start_stages(
+        cls, job_configs: List["JobConfig"]
+    ) -> List[List["JobConfig"]]:
+        """
+        Split job configs into stages for warm starting, where every config has
+        a TP/PP neighbour in the previous stage and none in its own. Each group
+        of neighbouring configs is seeded from its config with the fewest
+        workers, so a config is always warm started from the same neighbours
+        whatever order the searches of a stage finish in.
+        """
+        job_configs_by_hash = {
+            job_config.get_hash(): job_config for job_config in job_configs
+        }
+        neighbour_hashes = {
+            job_config_hash: [
+                neighbour_job_config.get_hash()
+                for neighbour_job_config in job_config.get_neighbour_job_configs()
+                if neighbour_job_config.get_hash() in job_configs_by_hash
+            ]
+            for job_config_hash, job_config in job_configs_by_hash.items()
+        }
+
+        # breadth first from the seed of every group of neighbouring configs
+        depths = {}
+        for job_config in sorted(
+            job_configs,
+            key=lambda job_config: (
+                job_config.num_workers,
+                job_config.num_tensor_parallel_workers,
+                job_config.get_key(),
+            ),
+        ):
+            if job_config.get_hash() in depths:
+                continue
+
+            depths[job_config.get_hash()] = 0
+            frontier = [job_config.get_hash()]
+            while frontier:
+                next_frontier = []
+                for job_config_hash in frontier:
+                    for neighbour_hash in neighbour_hashes[job_config_hash]:
+                        if neighbour_hash not in depths:
+                            depths[neighbour_hash] = depths[job_config_hash] + 1
+                            next_frontier.append(neighbour_hash)
+                frontier = next_frontier
+
+        stages = [[] for _ in range(max(depths.values(), default=-1) + 1)]
+        for job_config_hash, job_config in job_configs_by_hash.items():
+            stages[depths[job_config_hash]].append(job_config)
+
+        return stages
+
     @classmethod
     def generate_unique_model_job_configs(cls, config: dict, num_requests: int = 32):
         job_configs = []
@@ -235,9 +347,13 @@ class SimulationConfig:
     qps: float
     time_limit: int
     job_config: JobConfig
+    # stops the simulation early once this SLO is decided
+    scheduling_delay_slo_value: Optional[float] = None
+    scheduling_delay_slo_quantile: Optional[float] = None
+    result_store_path: Optional[str] = None
 
     def to_config_dict(self):
-        return {
+        config_dict = {
             **self.job_config.to_config_dict(),
             "metrics_config_output_dir": self.get_run_dir(),
             "metrics_config_cache_dir": self.cache_dir,
@@ -246,6 +362,8 @@ class SimulationConfig:
             "time_limit": self.time_limit * 60,  # to seconds
             "no-metrics_config_save_table_to_wandb": None,
             "no-metrics_config_store_plots": None,
+            "metrics_config_headless": None,
+            "metrics_config_headless_metrics": "request_scheduling_delay",
             "no-metrics_config_store_operation_metrics": None,
             "no-metrics_config_store_token_completion_metrics": None,
             "no-metrics_config_enable_chrome_trace": None,
@@ -253,6 +371,21 @@ class SimulationConfig:
             "random_forrest_execution_time_predictor_config_skip_cpu_overhead_modeling": None,
         }
 
+        if self.scheduling_delay_slo_value is not None:
+            config_dict["metrics_config_scheduling_delay_slo_value"] = (
+                self.scheduling_delay_slo_value
+            )
+        # also sets the quantile recorded in the summary of the run
+        if self.scheduling_delay_slo_quantile is not None:
+            config_dict["metrics_config_scheduling_delay_slo_quantile"] = (
+                self.scheduling_delay_slo_quantile
+            )
+
+        if self.result_store_path is not None:
+            config_dict["result_store_path"] = self.result_store_path
+
+        return config_dict
+
     def to_args(self):
         args = []
 
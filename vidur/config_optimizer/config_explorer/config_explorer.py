@@ -1,28 +1,29 @@
 import argparse
 import copy
-
-import ray
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Optional
 
 from vidur.config_optimizer.config_explorer.capacity_search import CapacitySearch
 from vidur.config_optimizer.config_explorer.config import JobConfig
-from vidur.config_optimizer.config_explorer.ray_utils import (
-    CpuAssignmentManager,
-    RayParallelRunner,
-    run_on_each_node,
-)
+from vidur.utils.sweep_executor import SweepExecutor
+
+if TYPE_CHECKING:
+    from vidur.config_optimizer.config_explorer.ray_utils import CpuAssignmentManager
 
 
 def run_search(
     job_config: JobConfig,
     args: argparse.Namespace,
-    cpu_core_assignment_manager: CpuAssignmentManager = None,
+    cpu_core_assignment_manager: "CpuAssignmentManager" = None,
     cpu_core_id: int = None,
+    warm_start_capacities: Optional[Dict[str, float]] = None,
 ):
     capacity_search = CapacitySearch(
         job_config,
         args,
         cpu_core_assignment_manager,
         cpu_core_id,
+        warm_start_capacities,
     )
     return capacity_search.search()
 
@@ -36,7 +37,10 @@ class ConfigExplorer:
         self.args = args
         self.config = config
 
-        ray.init(ignore_reinit_error=True)
+        if self.args.executor == "ray":
+            import ray
+
+            ray.init(ignore_reinit_error=True)
 
     def _warmup_cache(self):
         job_configs = JobConfig.generate_unique_model_job_configs(self.config)
@@ -45,6 +49,15 @@ class ConfigExplorer:
         args_for_warmup.max_iterations = 1
 
         for job_config in job_configs:
+            if self.args.executor == "local":
+                # all local workers share the cache of this node
+                run_search(job_config, args_for_warmup)
+                continue
+
+            from vidur.config_optimizer.config_explorer.ray_utils import (
+                run_on_each_node,
+            )
+
             all_node_results = run_on_each_node(
                 run_search,
                 job_config,
@@ -54,11 +67,12 @@ class ConfigExplorer:
                 all_node_results
             ), "All nodes should have the same result"
 
-    def run(self):
-        if not self.args.skip_cache_warmup:
-            self._warmup_cache()
-
-        job_configs = JobConfig.generate_job_configs(self.config)
+    def _run_on_ray(
+        self,
+        job_configs: list[JobConfig],
+        warm_start_capacities: Dict[str, float],
+    ):
+        from vidur.config_optimizer.config_explorer.ray_utils import RayParallelRunner
 
         ray_parallel_runner = RayParallelRunner()
 
@@ -68,6 +82,7 @@ class ConfigExplorer:
                 self.args,
                 cpu_core_assignment_manager,
                 cpu_core_id,
+                warm_start_capacities,
             )
         )
         all_results = ray_parallel_runner.map(
@@ -75,3 +90,61 @@ class ConfigExplorer:
             job_configs,
         )
         return all_results
+
+    def _run_locally(
+        self,
+        job_configs: list[JobConfig],
+        warm_start_capacities: Dict[str, float],
+    ):
+        sweep_executor = SweepExecutor(
+            self.args.num_threads, f"{self.args.output_dir}/sweep.db"
+        )
+        all_results = sweep_executor.map(
+            partial(
+                run_search,
+                args=self.args,
+                warm_start_capacities=warm_start_capacities,
+            ),
+            job_configs,
+            [job_config.get_hash() for job_config in job_configs],
+            [job_config.get_predicted_cost() for job_config in job_configs],
+        )
+        # failed searches are None, their errors are in the sweep table
+        return all_results
+
+    def _run_stage(
+        self,
+        job_configs: list[JobConfig],
+        warm_start_capacities: Dict[str, float],
+    ):
+        if self.args.executor == "local":
+            return self._run_locally(job_configs, warm_start_capacities)
+
+        return self._run_on_ray(job_configs, warm_start_capacities)
+
+    def run(self):
+        if not self.args.skip_cache_warmup:
+            self._warmup_cache()
+
+        job_configs = JobConfig.generate_job_configs(self.config)
+
+        if not self.args.warm_start:
+            all_results = self._run_stage(job_configs, {})
+            return [result for result in all_results if result is not None]
+
+        # every stage is warm started from the capacities of the stages before
+        # it, which are complete by then, so the searches are deterministic
+        warm_start_capacities = {}
+        all_results = []
+        for stage_job_configs in JobConfig.get_warm_start_stages(job_configs):
+            stage_results = self._run_stage(
+                stage_job_configs, dict(warm_start_capacities)
+            )
+            for job_config, result in zip(stage_job_configs, stage_results):
+                if result is not None and result["max_qps_under_sla"] is not None:
+                    warm_start_capacities[job_config.get_hash()] = result[
+                        "max_qps_under_sla"
+                    ]
+            all_results.extend(stage_results)
+
+        return [result for result in all_results if result is not None]
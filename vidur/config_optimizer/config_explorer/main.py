@@ -15,6 +15,7 @@ import time
 import yaml
 
 from vidur.config_optimizer.config_explorer.config_explorer import ConfigExplorer
+from vidur.config_optimizer.config_explorer.search_strategy import SEARCH_STRATEGIES
 from vidur.logger import init_logger
 
 logger = init_logger(__name__)
@@ -40,6 +41,41 @@ def get_args():
     )
     parser.add_argument("--debug", action="store_true")
     parser.add_argument("--skip-cache-warmup", action="store_true")
+    parser.add_argument(
+        "--search-strategy",
+        type=str,
+        default="binary",
+        choices=list(SEARCH_STRATEGIES),
+        help="Strategy that picks the QPS probes of a capacity search",
+    )
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help="Search in stages, each starting from the capacities of neighbouring TP/PP configs in the stage before",
+    )
+    parser.add_argument(
+        "--early-stop",
+        action="store_true",
+        help="Stop a simulation as soon as its scheduling delay SLO is decided",
+    )
+    parser.add_argument(
+        "--result-store-path",
+        type=str,
+        default=None,
+        help="SQLite result store to look runs up in and record them to",
+    )
+    parser.add_argument(
+        "--executor",
+        type=str,
+        default="ray",
+        choices=["ray", "local"],
+        help="Run the searches on a ray cluster or on the cores of this node",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run the simulations of a capacity search in the search process",
+    )
 
     args = parser.parse_args()
 
@@ -81,3 +117,7 @@ if __name__ == "__main__":
     end_time = time.time()
 
     logger.info(f"Simulation took time: {end_time - start_time}")
+
+    num_probes = [result["num_probes"] for result in all_results]
+    if num_probes:
+        logger.info(f"Average probes per config: {sum(num_probes) / len(num_probes)}")
@@ -0,0 +1,201 @@
+import math
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+# scheduling delays are floored at this fraction of the SLO before taking logs
+_MIN_RELATIVE_DELAY = 1e-3
+# keep model-based probes this fraction of the bracket away from its ends
+_MIN_BRACKET_STEP = 0.1
+
+
+class BaseSearchStrategy(ABC):
+    """Picks the QPS probes of a capacity search.
+
+    The capacity search asks for the next QPS to probe, runs it and reports the
+    scheduling delay back, until the strategy returns None or the search runs
+    out of iterations.
+    """
+
+    def __init__(
+        self,
+        start_qps: float,
+        scheduling_delay_slo_value: float,
+        min_search_granularity: float,
+    ) -> None:
+        self._start_qps = start_qps
+        self._scheduling_delay_slo_value = scheduling_delay_slo_value
+        self._min_search_granularity = min_search_granularity
+
+        # (qps, scheduling delay, is under sla) of every probe so far
+        self._probes: List[Tuple[float, float, bool]] = []
+
+    @property
+    def num_probes(self) -> int:
+        return len(self._probes)
+
+    @property
+    def max_qps_under_sla(self) -> Optional[float]:
+        return max(
+            (qps for qps, _, is_under_sla in self._probes if is_under_sla),
+            default=None,
+        )
+
+    @property
+    def min_qps_over_sla(self) -> Optional[float]:
+        return min(
+            (qps for qps, _, is_under_sla in self._probes if not is_under_sla),
+            default=None,
+        )
+
+    def on_probe(self, qps: float, scheduling_delay: float, is_under_sla: bool) -> None:
+        self._probes.append((qps, scheduling_delay, is_under_sla))
+
+    @abstractmethod
+    def get_next_qps(self) -> Optional[float]:
+        pass
+
+
+class BinarySearchStrategy(BaseSearchStrategy):
+    """Binary search that widens or narrows its range based on the delay seen."""
+
+    def __init__(
+        self,
+        start_qps: float,
+        scheduling_delay_slo_value: float,
+        min_search_granularity: float,
+    ) -> None:
+        super().__init__(start_qps, scheduling_delay_slo_value, min_search_granularity)
+
+        self._left = 0
+        self._right = start_qps * 2
+        self._qps = 0
+        self._min_qps_over_sla = 2**32
+
+    def get_next_qps(self) -> Optional[float]:
+        # stopping condition - we have reached the minimum granularity
+        min_range = self._min_search_granularity * self._qps / 100
+        if abs(self._left - self._right) < min_range:
+            return None
+
+        self._qps = (self._left + self._right) / 2
+        return self._qps
+
+    def on_probe(self, qps: float, scheduling_delay: float, is_under_sla: bool) -> None:
+        super().on_probe(qps, scheduling_delay, is_under_sla)
+
+        slo_value = self._scheduling_delay_slo_value
+
+        if is_under_sla:
+            if scheduling_delay < slo_value / 8:
+                # if the scheduling delay is very low, we can increase the QPS more aggressively
+                self._right = min(self._right * 4, self._min_qps_over_sla)
+            elif scheduling_delay < slo_value / 4:
+                self._right = min(self._right * 2, self._min_qps_over_sla)
+            elif qps > 0.8 * self._right:
+                self._right = min(self._right * 2, self._min_qps_over_sla)
+
+            self._left = qps
+        else:
+            if scheduling_delay > 1000:
+                self._right = qps / 4
+            elif scheduling_delay > 500:
+                self._right = qps / 2
+            else:
+                self._right = qps
+
+            self._min_qps_over_sla = min(self._min_qps_over_sla, qps)
+
+
+class ModelBasedSearchStrategy(BaseSearchStrategy):
+    """Probes where a fit of scheduling delay against QPS meets the SLO.
+
+    Below capacity the scheduling delay stays small, past it the queue builds
+    up, so around the SLO the delay grows roughly exponentially with QPS. Once
+    the SLO is bracketed, log delay is interpolated linearly between the
+    tightest probes on either side. Before that, the fit through the nearest
+    two probes is extrapolated, within bounds, towards the SLO.
+    """
+
+    def _get_log_delay(self, scheduling_delay: float) -> float:
+        min_delay = self._scheduling_delay_slo_value * _MIN_RELATIVE_DELAY
+        return math.log(max(scheduling_delay, min_delay))
+
+    def _get_probe(self, qps: float) -> Tuple[float, float, bool]:
+        return next(probe for probe in self._probes if probe[0] == qps)
+
+    def _fit_slo_qps(
+        self, probe_a: Tuple[float, float, bool], probe_b: Tuple[float, float, bool]
+    ) -> Optional[float]:
+        qps_a, delay_a, _ = probe_a
+        qps_b, delay_b, _ = probe_b
+        log_delay_a = self._get_log_delay(delay_a)
+        log_delay_b = self._get_log_delay(delay_b)
+
+        if qps_a == qps_b or log_delay_a == log_delay_b:
+            return None
+
+        slope = (log_delay_b - log_delay_a) / (qps_b - qps_a)
+        if slope <= 0:
+            return None
+
+        log_slo_value = math.log(self._scheduling_delay_slo_value)
+        return qps_a + (log_slo_value - log_delay_a) / slope
+
+    def _get_next_qps_above(self, max_qps_under_sla: float) -> float:
+        under_sla_probes = sorted(
+            probe for probe in self._probes if probe[2] and probe[0] > 0
+        )
+        fit_qps = None
+        if len(under_sla_probes) >= 2:
+            fit_qps = self._fit_slo_qps(under_sla_probes[-2], under_sla_probes[-1])
+
+        if fit_qps is None:
+            return max_qps_under_sla * 2
+
+        return min(max(fit_qps, max_qps_under_sla * 1.25), max_qps_under_sla * 4)
+
+    def _get_next_qps_below(self, min_qps_over_sla: float) -> float:
+        over_sla_probes = sorted(probe for probe in self._probes if not probe[2])
+        fit_qps = None
+        if len(over_sla_probes) >= 2:
+            fit_qps = self._fit_slo_qps(over_sla_probes[0], over_sla_probes[1])
+
+        if fit_qps is None:
+            return min_qps_over_sla / 2
+
+        return min(max(fit_qps, min_qps_over_sla / 4), min_qps_over_sla / 1.25)
+
+    def get_next_qps(self) -> Optional[float]:
+        if not self._probes:
+            return self._start_qps
+
+        max_qps_under_sla = self.max_qps_under_sla
+        min_qps_over_sla = self.min_qps_over_sla
+
+        if min_qps_over_sla is None:
+            return self._get_next_qps_above(max_qps_under_sla)
+
+        if max_qps_under_sla is None:
+            return self._get_next_qps_below(min_qps_over_sla)
+
+        # stopping condition - we have reached the minimum granularity
+        bracket_size = min_qps_over_sla - max_qps_under_sla
+        if bracket_size < self._min_search_granularity * max_qps_under_sla / 100:
+            return None
+
+        fit_qps = self._fit_slo_qps(
+            self._get_probe(max_qps_under_sla), self._get_probe(min_qps_over_sla)
+        )
+        if fit_qps is None:
+            return (max_qps_under_sla + min_qps_over_sla) / 2
+
+        return min(
+            max(fit_qps, max_qps_under_sla + _MIN_BRACKET_STEP * bracket_size),
+            min_qps_over_sla - _MIN_BRACKET_STEP * bracket_size,
+        )
+
+
+SEARCH_STRATEGIES = {
+    "binary": BinarySearchStrategy,
+    "model": ModelBasedSearchStrategy,
+}
@@ -1,4 +1,5 @@
 from vidur.events.base_event import BaseEvent
+from vidur.events.global_schedule_event import GlobalScheduleEvent
 from vidur.events.request_arrival_event import RequestArrivalEvent
 
-__all__ = [RequestArrivalEvent, BaseEvent]
+__all__ = [RequestArrivalEvent, GlobalScheduleEvent, BaseEvent]
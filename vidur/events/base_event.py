@@ -1,3 +1,4 @@
+import struct
 from abc import ABC, abstractmethod
 from typing import List
 
@@ -5,20 +6,28 @@ from vidur.metrics import MetricsStore
 from vidur.scheduler import BaseGlobalScheduler
 from vidur.types import EventType
 
+_DOUBLE = struct.Struct("<d")
+_UINT64 = struct.Struct("<Q")
+
+# bit layout of the integer priority key: | time (64) | event_type (8) | id (56) |
+_EVENT_TYPE_SHIFT = 56
+_TIME_SHIFT = 64
+
 
 class BaseEvent(ABC):
-    _id = 0
+    __slots__ = ("_time", "_id", "_event_type")
+
+    _next_id = 0
 
     def __init__(self, time: float, event_type: EventType):
         self._time = time
         self._id = BaseEvent.generate_id()
         self._event_type = event_type
-        self._priority_number = self._get_priority_number()
 
     @classmethod
     def generate_id(cls):
-        cls._id += 1
-        return cls._id
+        cls._next_id += 1
+        return cls._next_id
 
     @property
     def id(self) -> int:
@@ -30,7 +39,7 @@ class BaseEvent(ABC):
 
     @property
     def event_type(self):
-        pass
+        return self._event_type
 
     @abstractmethod
     def handle_event(
@@ -41,8 +50,23 @@ class BaseEvent(ABC):
     ) -> List["BaseEvent"]:
         pass
 
+    @property
+    def _priority_number(self):
+        return self._get_priority_number()
+
     def _get_priority_number(self):
-        return (self._time, self._id, self.event_type)
+        # same order as get_priority_key and __lt__
+        return (self._time, self._event_type, self._id)
+
+    def get_priority_key(self) -> int:
+        # The IEEE-754 bit pattern of a non-negative double sorts exactly like
+        # the double itself, so (time, event_type, id) packs into a single int.
+        time_bits = _UINT64.unpack(_DOUBLE.pack(self._time))[0]
+        return (
+            (time_bits << _TIME_SHIFT)
+            | (self._event_type << _EVENT_TYPE_SHIFT)
+            | self._id
+        )
 
     def __lt__(self, other):
         if self._time == other._time:
@@ -11,6 +11,8 @@ logger = init_logger(__name__)
 
 
 class BatchEndEvent(BaseEvent):
+    __slots__ = ("_replica_id", "_batch")
+
     def __init__(self, time: float, replica_id: int, batch: Batch):
         super().__init__(time, EventType.BATCH_END)
 
@@ -25,6 +27,7 @@ class BatchEndEvent(BaseEvent):
         self._batch.on_batch_end(self.time)
         replica_scheduler = scheduler.get_replica_scheduler(self._replica_id)
         replica_scheduler.on_batch_end(self._batch)
+        scheduler.on_batch_end(self._batch)
 
         memory_usage_percent = replica_scheduler.memory_usage_percent
         metrics_store.on_batch_end(
@@ -10,6 +10,8 @@ logger = init_logger(__name__)
 
 
 class GlobalScheduleEvent(BaseEvent):
+    __slots__ = ("_replica_set", "_request_mapping")
+
     def __init__(self, time: float):
         super().__init__(time, EventType.GLOBAL_SCHEDULE)
 
@@ -10,6 +10,8 @@ logger = init_logger(__name__)
 
 
 class ReplicaScheduleEvent(BaseEvent):
+    __slots__ = ("_replica_id", "_batches")
+
     def __init__(self, time: float, replica_id: int):
         super().__init__(time, EventType.REPLICA_SCHEDULE)
 
@@ -17,6 +19,10 @@ class ReplicaScheduleEvent(BaseEvent):
 
         self._batches = []
 
+    @property
+    def replica_id(self) -> int:
+        return self._replica_id
+
     def handle_event(
         self, scheduler: BaseGlobalScheduler, metrics_store: MetricsStore
     ) -> List[BaseEvent]:
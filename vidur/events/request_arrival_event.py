@@ -11,6 +11,8 @@ logger = init_logger(__name__)
 
 
 class RequestArrivalEvent(BaseEvent):
+    __slots__ = ("_request",)
+
     def __init__(self, time: float, request: Request) -> None:
         super().__init__(time, EventType.REQUEST_ARRIVAL)
 
@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Tuple
+
+import numpy as np
 
 from vidur.config import (
     BaseExecutionTimePredictorConfig,
@@ -30,7 +34,121 @@ class BaseExecutionTimePredictor(ABC):
             self._model_config.num_layers // self._replica_config.num_pipeline_stages
         )
 
+        # LRU cache of execution times keyed by the batch signature
+        self._execution_time_cache_size = self._config.execution_time_cache_size
+        self._execution_time_cache = OrderedDict()
+        self._execution_time_cache_hits = 0
+        self._execution_time_cache_misses = 0
+
+    @property
+    def execution_time_cache_hits(self) -> int:
+        return self._execution_time_cache_hits
+
+    @property
+    def execution_time_cache_misses(self) -> int:
+        return self._execution_time_cache_misses
+
+    @property
+    def execution_time_cache_hit_rate(self) -> float:
+        num_lookups = (
+            self._execution_time_cache_hits + self._execution_time_cache_misses
+        )
+        if num_lookups == 0:
+            return 0
+        return self._execution_time_cache_hits / num_lookups
+
+    def _get_batch_decode_attention_params(self, batch: Batch) -> Tuple[int, int]:
+        if hasattr(batch, "_decode_params"):
+            return batch._decode_params
+
+        decode_kv_cache_sizes = []
+
+        for request in batch.requests:
+            if request._is_prefill_complete:
+                decode_kv_cache_sizes.append(request.num_processed_tokens)
+
+        if not decode_kv_cache_sizes:
+            batch._decode_params = (0, 0)
+            return batch._decode_params
+
+        decode_batch_size = len(decode_kv_cache_sizes)
+        decode_avg_kv_cache_size = int(np.mean(decode_kv_cache_sizes))
+        decode_avg_kv_cache_size = (
+            (
+                decode_avg_kv_cache_size
+                + self._config.kv_cache_prediction_granularity
+                - 1
+            )
+            // self._config.kv_cache_prediction_granularity
+        ) * self._config.kv_cache_prediction_granularity
+
+        batch._decode_params = (decode_batch_size, decode_avg_kv_cache_size)
+
+        return batch._decode_params
+
+    def _get_batch_prefill_attention_params(
+        self, batch: Batch
+    ) -> List[Tuple[int, int]]:
+        if hasattr(batch, "_prefill_params"):
+            return batch._prefill_params
+
+        prefill_params = []
+
+        for request, num_tokens_to_process in zip(batch.requests, batch.num_tokens):
+            if request._is_prefill_complete:
+                continue
+
+            prefill_chunk_size = num_tokens_to_process
+            kv_cache_size = (
+                (
+                    request.num_processed_tokens
+                    + self._config.kv_cache_prediction_granularity
+                    - 1
+                )
+                // self._config.kv_cache_prediction_granularity
+            ) * self._config.kv_cache_prediction_granularity
+
+            prefill_params.append((kv_cache_size, prefill_chunk_size))
+
+        batch._prefill_params = prefill_params
+
+        return prefill_params
+
+    def _get_batch_signature(self, batch: Batch, pipeline_stage: int) -> Tuple:
+        # everything the individual predictions depend on
+        return (
+            pipeline_stage == self._replica_config.num_pipeline_stages - 1,
+            batch.size,
+            batch._total_num_tokens_rounded,
+            sum(batch.num_tokens),
+            self._get_batch_decode_attention_params(batch),
+            tuple(self._get_batch_prefill_attention_params(batch)),
+        )
+
     def get_execution_time(self, batch: Batch, pipeline_stage: int) -> ExecutionTime:
+        if self._execution_time_cache_size == 0:
+            return self._predict_execution_time(batch, pipeline_stage)
+
+        signature = self._get_batch_signature(batch, pipeline_stage)
+        execution_time = self._execution_time_cache.get(signature)
+
+        if execution_time is not None:
+            self._execution_time_cache_hits += 1
+            self._execution_time_cache.move_to_end(signature)
+            return execution_time
+
+        self._execution_time_cache_misses += 1
+        execution_time = self._predict_execution_time(batch, pipeline_stage)
+
+        self._execution_time_cache[signature] = execution_time
+        if len(self._execution_time_cache) > self._execution_time_cache_size:
+            self._execution_time_cache.popitem(last=False)
+
+        return execution_time
+
+    def _predict_execution_time(
+        self, batch: Batch, pipeline_stage: int
+    ) -> ExecutionTime:
         if pipeline_stage == self._replica_config.num_pipeline_stages - 1:
             pipeline_parallel_communication_time = 0
         else:
@@ -0,0 +1,110 @@
+import json
+from threading import Lock
+from typing import Dict
+
+from vidur.config import (
+    BaseExecutionTimePredictorConfig,
+    BaseReplicaSchedulerConfig,
+    MetricsConfig,
+    ReplicaConfig,
+)
+from vidur.config.model_config import BaseModelConfig
+from vidur.config.utils import dataclass_to_dict
+from vidur.execution_time_predictor.base_execution_time_predictor import (
+    BaseExecutionTimePredictor,
+)
+from vidur.execution_time_predictor.execution_time_predictor_registry import (
+    ExecutionTimePredictorRegistry,
+)
+from vidur.logger import init_logger
+
+logger = init_logger(__name__)
+
+# the predictor of a replica does not depend on the other models in the cluster
+_REPLICA_CONFIG_IGNORED_KEYS = ("model_names", "model_configs")
+
+
+class ExecutionTimePredictorPool:
+    """
+    Process-wide pool of execution time predictors. Replicas with the same model,
+    hardware and scheduler config share a single predictor instance, and so do
+    simulators created in the same process.
+    """
+
+    _predictors: Dict[str, BaseExecutionTimePredictor] = {}
+    _key_locks: Dict[str, Lock] = {}
+    _lock = Lock()
+
+    @classmethod
+    def get_key(
+        cls,
+        predictor_config: BaseExecutionTimePredictorConfig,
+        replica_config: ReplicaConfig,
+        replica_scheduler_config: BaseReplicaSchedulerConfig,
+        metrics_config: MetricsConfig,
+        model_config: BaseModelConfig,
+    ) -> str:
+        replica_config_dict = {
+            key: value
+            for key, value in dataclass_to_dict(replica_config).items()
+            if key not in _REPLICA_CONFIG_IGNORED_KEYS
+        }
+        return json.dumps(
+            {
+                "predictor_config": dataclass_to_dict(predictor_config),
+                "replica_config": replica_config_dict,
+                "replica_scheduler_config": dataclass_to_dict(
+                    replica_scheduler_config
+                ),
+                "model_config": dataclass_to_dict(model_config),
+                "cache_dir": metrics_config.cache_dir,
+            },
+            sort_keys=True,
+            default=str,
+        )
+
+    @classmethod
+    def get(
+        cls,
+        predictor_config: BaseExecutionTimePredictorConfig,
+        replica_config: ReplicaConfig,
+        replica_scheduler_config: BaseReplicaSchedulerConfig,
+        metrics_config: MetricsConfig,
+        model_config: BaseModelConfig,
+    ) -> BaseExecutionTimePredictor:
+        key = cls.get_key(
+            predictor_config,
+            replica_config,
+            replica_scheduler_config,
+            metrics_config,
+            model_config,
+        )
+
+        with cls._lock:
+            key_lock = cls._key_locks.setdefault(key, Lock())
+
+        # different keys are created concurrently, the same key only once
+        with key_lock:
+            if key in cls._predictors:
+                logger.debug(
+                    f"Reusing execution time predictor for model {model_config.get_name()}"
+                )
+                return cls._predictors[key]
+
+            predictor = ExecutionTimePredictorRegistry.get(
+                predictor_config.get_type(),
+                predictor_config=predictor_config,
+                replica_config=replica_config,
+                replica_scheduler_config=replica_scheduler_config,
+                metrics_config=metrics_config,
+                model_config=model_config,
+            )
+            cls._predictors[key] = predictor
+
+        return predictor
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._predictors = {}
+            cls._key_locks = {}
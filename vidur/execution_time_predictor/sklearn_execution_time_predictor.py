@@ -1,13 +1,14 @@
 import hashlib
 import os
-import pickle
 from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from itertools import product
+from multiprocessing import get_context
 from typing import Any, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from fasteners import InterProcessReaderWriterLock
 from sklearn.base import BaseEstimator
 from sklearn.metrics import make_scorer
 from sklearn.model_selection import GridSearchCV
@@ -24,9 +25,48 @@ from vidur.execution_time_predictor.base_execution_time_predictor import (
 )
 from vidur.logger import init_logger
 from vidur.config.model_config import BaseModelConfig
+from vidur.utils.content_addressed_cache import ContentAddressedCache
 logger = init_logger(__name__)
 
 
+@dataclass
+class ModelTrainingJob:
+    model_name: str
+    df: pd.DataFrame
+    feature_cols: List[str]
+    target_col: str
+
+
+def _get_num_available_cores() -> int:
+    # pinned processes, e.g. sweep workers, can only run on their own cores
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
+def _fit_grid_search(
+    estimator: BaseEstimator,
+    param_grid: Dict[str, Any],
+    scoring: Any,
+    cv: int,
+    n_jobs: int,
+    X: pd.DataFrame,
+    y: pd.Series,
+) -> Tuple[BaseEstimator, Dict[str, Any], float]:
+    # module level so that it can be shipped to the training process pool
+    grid_search = GridSearchCV(
+        estimator=estimator,
+        param_grid=param_grid,
+        scoring=scoring,
+        cv=cv,
+        n_jobs=n_jobs,
+    )
+    grid_search.fit(X, y)
+    score = grid_search.score(X, y)
+
+    return grid_search.best_estimator_, grid_search.best_params_, score
+
+
 class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
     def __init__(
         self,
@@ -44,6 +84,11 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             model_config=model_config
         )
         os.makedirs(self._cache_dir, exist_ok=True)
+        self._cache = ContentAddressedCache(
+            f"{self._cache_dir}/entries",
+            max_size_bytes=self._config.cache_max_size_mb * 1024 * 1024,
+        )
+        self._model_hashes = {}
 
         # These overheads are only for GQA models
         self._attention_prefill_batching_overhead_fraction = (
@@ -291,30 +336,30 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
 
         return hashlib.md5(combined_str.encode("utf-8")).hexdigest()[0:8]
 
+    def _get_prediction_hash(self, model_name: str, X: pd.DataFrame) -> str:
+        # predictions are determined by the trained model and the prediction grid
+        grid_hash_str = hashlib.md5(
+            pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes()
+        ).hexdigest()
+        combined_str = (
+            f"{model_name}_{self._model_hashes[model_name]}"
+            f"_{list(X.columns)}_{grid_hash_str}"
+        )
+        return hashlib.md5(combined_str.encode("utf-8")).hexdigest()
+
     def _load_model_from_cache(self, model_name: str, model_hash: str) -> BaseEstimator:
-        with InterProcessReaderWriterLock(
-            f"{self._cache_dir}/{model_hash}_model_lock.file"
-        ).read_lock():
-            if self._config.no_cache:
-                return
-            # check if model is in cache
-            cache_file = f"{self._cache_dir}/{model_name}_{model_hash}.pkl"
-            if not os.path.exists(cache_file):
-                return
+        if self._config.no_cache:
+            return
 
+        model = self._cache.load_object(model_name, model_hash)
+        if model is not None:
             logger.debug(f"Found model {model_name} in cache")
-            model = pickle.load(open(cache_file, "rb"))
-            return model
+        return model
 
     def _store_model_in_cache(
         self, model_name: str, model_hash: str, model: BaseEstimator
     ) -> None:
-        with InterProcessReaderWriterLock(
-            f"{self._cache_dir}/{model_hash}_model_lock.file"
-        ).write_lock():
-            # store model in cache
-            cache_file = f"{self._cache_dir}/{model_name}_{model_hash}.pkl"
-            pickle.dump(model, open(cache_file, "wb"), protocol=pickle.HIGHEST_PROTOCOL)
+        self._cache.store_object(model_name, model_hash, model)
 
     def _store_training_prediction_data(
         self,
@@ -325,136 +370,167 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         target_col: str,
         model: BaseEstimator,
     ) -> None:
+        if not self._config.save_prediction_tables:
+            return
+
         df = df.copy()
 
         # convert the df to list of tuples
         df["prediction"] = model.predict(df[feature_cols])
 
         # store the prediction data
-        df[feature_cols + [target_col, "prediction"]].to_csv(
-            f"{self._cache_dir}/{model_name}_{model_hash}_training_predictions.csv",
-            index=False,
+        self._cache.store_table(
+            f"{model_name}_training_predictions",
+            model_hash,
+            df[feature_cols + [target_col, "prediction"]],
         )
 
-    def _train_model(
-        self,
-        model_name: str,
-        df: pd.DataFrame,
-        feature_cols: List[str],
-        target_col: str,
-    ) -> BaseEstimator:
-        if len(df) == 0:
-            raise Exception(f"Training data for model {model_name} is empty")
+    def _get_num_training_processes(self, num_jobs: int) -> int:
+        num_processes = self._config.num_training_processes
+        if num_processes == -1:
+            num_processes = _get_num_available_cores()
+        return max(1, min(num_processes, num_jobs))
 
-        model_hash = self._get_model_hash(model_name, df)
+    def _train_model_group(
+        self, training_jobs: List[ModelTrainingJob]
+    ) -> Dict[str, BaseEstimator]:
+        models = {}
+        pending_jobs = []
 
-        cached_model = self._load_model_from_cache(model_name, model_hash)
-        if cached_model:
-            return cached_model
+        for job in training_jobs:
+            if len(job.df) == 0:
+                raise Exception(f"Training data for model {job.model_name} is empty")
 
-        model = self._get_estimator()
-        grid_search_params = self._get_grid_search_params()
+            model_hash = self._get_model_hash(job.model_name, job.df)
+            self._model_hashes[job.model_name] = model_hash
 
-        if len(df) < self._config.k_fold_cv_splits:
-            cv = 2
-        else:
-            cv = self._config.k_fold_cv_splits
-
-        grid_search = GridSearchCV(
-            estimator=model,
-            param_grid=grid_search_params,
-            scoring=self._get_scorer(),
-            cv=cv,
-            n_jobs=self._config.num_training_job_threads,
-        )
+            cached_model = self._load_model_from_cache(job.model_name, model_hash)
+            if cached_model:
+                models[job.model_name] = cached_model
+            else:
+                pending_jobs.append((job, model_hash))
 
-        # we don't create a train/test split, because we want to use all data for training
-        # and we don't care about overfitting, because we only want to predict execution time within the same domain
-        X, y = df[feature_cols], df[target_col]
+        if not pending_jobs:
+            return models
 
-        grid_search.fit(X, y)
-        score = grid_search.score(X, y)
+        num_processes = self._get_num_training_processes(len(pending_jobs))
+        n_jobs = self._config.num_training_job_threads
+        if n_jobs == -1:
+            # split the cores between the concurrent grid searches
+            n_jobs = max(1, _get_num_available_cores() // num_processes)
 
-        logger.info(
-            f"Trained model {model_name} and found best parameters: {grid_search.best_params_} "
-            f"with mean absolute percentage error (MEAP) {-score}%"
-        )
+        fit_args = []
+        for job, _ in pending_jobs:
+            if len(job.df) < self._config.k_fold_cv_splits:
+                cv = 2
+            else:
+                cv = self._config.k_fold_cv_splits
+
+            # we don't create a train/test split, because we want to use all data for training
+            # and we don't care about overfitting, because we only want to predict execution time within the same domain
+            fit_args.append(
+                (
+                    self._get_estimator(),
+                    self._get_grid_search_params(),
+                    self._get_scorer(),
+                    cv,
+                    n_jobs,
+                    job.df[job.feature_cols],
+                    job.df[job.target_col],
+                )
+            )
+
+        if num_processes == 1:
+            results = [_fit_grid_search(*args) for args in fit_args]
+        else:
+            logger.info(
+                f"Training {len(pending_jobs)} models using {num_processes} processes"
+            )
+            # spawn instead of fork, predictors may be trained from several threads
+            with ProcessPoolExecutor(
+                max_workers=num_processes, mp_context=get_context("spawn")
+            ) as executor:
+                results = list(executor.map(_fit_grid_search, *zip(*fit_args)))
+
+        for (job, model_hash), (model, best_params, score) in zip(
+            pending_jobs, results
+        ):
+            logger.info(
+                f"Trained model {job.model_name} and found best parameters: {best_params} "
+                f"with mean absolute percentage error (MEAP) {-score}%"
+            )
 
-        self._store_model_in_cache(model_name, model_hash, grid_search.best_estimator_)
+            self._store_model_in_cache(job.model_name, model_hash, model)
 
-        self._store_training_prediction_data(
-            model_name=model_name,
-            model_hash=model_hash,
-            df=df,
-            feature_cols=feature_cols,
-            target_col=target_col,
-            model=grid_search.best_estimator_,
-        )
-        return grid_search.best_estimator_
+            self._store_training_prediction_data(
+                model_name=job.model_name,
+                model_hash=model_hash,
+                df=job.df,
+                feature_cols=job.feature_cols,
+                target_col=job.target_col,
+                model=model,
+            )
+            models[job.model_name] = model
+
+        return models
+
+    def _train_model(
+        self,
+        model_name: str,
+        df: pd.DataFrame,
+        feature_cols: List[str],
+        target_col: str,
+    ) -> BaseEstimator:
+        return self._train_model_group(
+            [ModelTrainingJob(model_name, df, feature_cols, target_col)]
+        )[model_name]
 
     def _store_model_predication_cache(
-        self, model_name: str, model_hash: str, predictions: Dict[Tuple, float]
+        self, model_name: str, model_hash: str, predictions: np.ndarray
     ) -> None:
-        with InterProcessReaderWriterLock(
-            f"{self._cache_dir}/{model_hash}_prediction_lock.file"
-        ).write_lock():
-            cache_file = f"{self._cache_dir}/{model_name}_{model_hash}_predictions.pkl"
-            pickle.dump(
-                predictions, open(cache_file, "wb"), protocol=pickle.HIGHEST_PROTOCOL
-            )
+        self._cache.store_array(f"{model_name}_predictions", model_hash, predictions)
 
     def _load_model_predication_cache(
         self, model_name: str, model_hash: str
-    ) -> Dict[Tuple, float]:
-        with InterProcessReaderWriterLock(
-            f"{self._cache_dir}/{model_hash}_prediction_lock.file"
-        ).read_lock():
-            if self._config.no_cache:
-                return
-            cache_file = f"{self._cache_dir}/{model_name}_{model_hash}_predictions.pkl"
-
-            if not os.path.exists(cache_file):
-                return
+    ) -> np.ndarray:
+        if self._config.no_cache:
+            return
 
+        predictions = self._cache.load_array(f"{model_name}_predictions", model_hash)
+        if predictions is not None:
             logger.debug(f"Found model {model_name} predictions in cache")
-
-            predictions = pickle.load(open(cache_file, "rb"))
-            return predictions
+        return predictions
 
     def _get_model_prediction(
         self, model_name: str, model: BaseEstimator, X: pd.DataFrame
-    ) -> Dict[Tuple, float]:
-        X = X.copy()
-
-        model_hash = self._get_model_hash(model, df=None)
+    ) -> np.ndarray:
+        # returns the predictions for every row of X, in the same order as X
+        model_hash = self._get_prediction_hash(model_name, X)
 
         cached_predictions = self._load_model_predication_cache(model_name, model_hash)
-        if cached_predictions:
+        if cached_predictions is not None:
             return cached_predictions
 
         logger.info(f"Predicting execution time for model {model_name}")
 
-        predictions_array = model.predict(X)
-
-        # turn this into a dict, so we can store use it as a cache
-        # the key is tuple for each row of X
-        predictions = dict(zip([tuple(x) for x in X.values], predictions_array))
+        predictions = model.predict(X).astype(np.float64)
 
         self._store_model_predication_cache(model_name, model_hash, predictions)
 
-        X["prediction"] = predictions_array
-        X.to_csv(
-            f"{self._cache_dir}/{model_name}_{model_hash}_predictions.csv",
-            index=False,
-        )
+        if self._config.save_prediction_tables:
+            self._cache.store_table(
+                f"{model_name}_predictions",
+                model_hash,
+                X.assign(prediction=predictions),
+            )
 
         return predictions
 
-    def _train_compute_models(self) -> Dict[str, BaseEstimator]:
+    def _get_compute_training_jobs(self) -> List[ModelTrainingJob]:
         compute_df = self._load_compute_df(self._compute_input_file)
         compute_df = self._get_compute_df_with_derived_features(compute_df)
 
-        models = {}
+        training_jobs = []
         model_names = [
             "attn_pre_proj",
             "attn_post_proj",
@@ -471,11 +547,13 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             logger.debug(
                 f"Training model {model_name}, size of training data: {len(compute_df)}"
             )
-            models[model_name] = self._train_model(
-                model_name=model_name,
-                df=compute_df,
-                feature_cols=["num_tokens"],
-                target_col=f"time_stats.{model_name}.median",
+            training_jobs.append(
+                ModelTrainingJob(
+                    model_name=model_name,
+                    df=compute_df,
+                    feature_cols=["num_tokens"],
+                    target_col=f"time_stats.{model_name}.median",
+                )
             )
 
         attention_df = self._load_attention_df(self._attention_input_file)
@@ -486,42 +564,48 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         ]
 
         for model_name in model_names:
-            models[model_name] = self._train_model(
-                model_name=model_name,
-                df=attention_df,
-                feature_cols=["num_tokens"],
-                target_col=f"time_stats.{model_name}.median",
+            training_jobs.append(
+                ModelTrainingJob(
+                    model_name=model_name,
+                    df=attention_df,
+                    feature_cols=["num_tokens"],
+                    target_col=f"time_stats.{model_name}.median",
+                )
             )
 
         if self._replica_config.num_pipeline_stages > 1:
             send_recv_df = self._load_send_recv_df(self._send_recv_input_file)
             send_recv_df = self._get_send_recv_df_with_derived_features(send_recv_df)
 
-            models["send_recv"] = self._train_model(
-                model_name="send_recv",
-                df=send_recv_df,
-                feature_cols=["num_tokens"],
-                target_col="time_stats.send_recv.median",
+            training_jobs.append(
+                ModelTrainingJob(
+                    model_name="send_recv",
+                    df=send_recv_df,
+                    feature_cols=["num_tokens"],
+                    target_col="time_stats.send_recv.median",
+                )
             )
 
         if self._replica_config.tensor_parallel_size > 1:
             all_reduce_df = self._load_all_reduce_df(self._all_reduce_input_file)
             all_reduce_df = self._get_all_reduce_df_with_derived_features(all_reduce_df)
 
-            models["all_reduce"] = self._train_model(
-                model_name="all_reduce",
-                df=all_reduce_df,
-                feature_cols=["num_tokens"],
-                target_col="time_stats.all_reduce.median",
+            training_jobs.append(
+                ModelTrainingJob(
+                    model_name="all_reduce",
+                    df=all_reduce_df,
+                    feature_cols=["num_tokens"],
+                    target_col="time_stats.all_reduce.median",
+                )
             )
 
-        return models
+        return training_jobs
 
-    def _train_cpu_overhead_models(self) -> Dict[str, BaseEstimator]:
+    def _get_cpu_overhead_training_jobs(self) -> List[ModelTrainingJob]:
         if self._config.skip_cpu_overhead_modeling:
-            return {}
+            return []
 
-        models = {}
+        training_jobs = []
         model_names = [
             "schedule",
             "sampler_e2e",
@@ -541,22 +625,24 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             else:
                 target_col = f"{model_name}_median"
 
-            models[model_name] = self._train_model(
-                model_name=model_name,
-                df=cpu_overhead_df,
-                feature_cols=["batch_size"],
-                target_col=target_col,
+            training_jobs.append(
+                ModelTrainingJob(
+                    model_name=model_name,
+                    df=cpu_overhead_df,
+                    feature_cols=["batch_size"],
+                    target_col=target_col,
+                )
             )
 
-        return models
+        return training_jobs
 
-    def _train_attention_layer_models(self) -> Dict[str, BaseEstimator]:
+    def _get_attention_layer_training_jobs(self) -> List[ModelTrainingJob]:
         attention_df = self._load_attention_df(self._attention_input_file)
         attention_df = self._get_attention_df_with_derived_features(attention_df)
         prefill_df = attention_df[~attention_df["is_decode"]]
         decode_df = attention_df[attention_df["is_decode"]]
 
-        models = {}
+        training_jobs = []
 
         chunked_prefill_df = prefill_df[prefill_df["kv_cache_size"] > 0].copy()
         chunked_prefill_df["total_prefill_tokens"] = (
@@ -564,28 +650,33 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             + chunked_prefill_df["prefill_chunk_size"]
         )
 
-        models["attn_prefill"] = self._train_model(
-            model_name="attn_prefill",
-            df=prefill_df,
-            feature_cols=["kv_cache_size", "prefill_chunk_size_squared"],
-            target_col="time_stats.attn_prefill.median",
+        training_jobs.append(
+            ModelTrainingJob(
+                model_name="attn_prefill",
+                df=prefill_df,
+                feature_cols=["kv_cache_size", "prefill_chunk_size_squared"],
+                target_col="time_stats.attn_prefill.median",
+            )
         )
 
-        models["attn_decode"] = self._train_model(
-            model_name="attn_decode",
-            df=decode_df,
-            feature_cols=["batch_size", "kv_cache_size"],
-            target_col="time_stats.attn_decode.median",
+        training_jobs.append(
+            ModelTrainingJob(
+                model_name="attn_decode",
+                df=decode_df,
+                feature_cols=["batch_size", "kv_cache_size"],
+                target_col="time_stats.attn_decode.median",
+            )
         )
 
-        return models
+        return training_jobs
 
     def _train_models(self) -> Dict[str, BaseEstimator]:
-        models = self._train_compute_models()
-        models.update(self._train_cpu_overhead_models())
-        models.update(self._train_attention_layer_models())
+        # models are independent, so all of them are fitted together
+        training_jobs = self._get_compute_training_jobs()
+        training_jobs.extend(self._get_cpu_overhead_training_jobs())
+        training_jobs.extend(self._get_attention_layer_training_jobs())
 
-        return models
+        return self._train_model_group(training_jobs)
 
     def _predict_for_compute_models(self) -> Dict[str, Any]:
         predictions = {}
@@ -609,6 +700,7 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         if self._replica_config.tensor_parallel_size > 1:
             model_names.append("all_reduce")
 
+        # tables are indexed by num_tokens - 1
         num_token_range = np.arange(1, self._max_tokens + 1)
         X = pd.DataFrame({"num_tokens": num_token_range})
 
@@ -632,6 +724,7 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             "ray_comm_time",
         ]
 
+        # tables are indexed by batch_size - 1
         batch_size_range = np.arange(1, self._config.prediction_max_batch_size + 1)
         X = pd.DataFrame({"batch_size": batch_size_range})
 
@@ -703,17 +796,22 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             + chunked_prefill_df["prefill_chunk_size"]
         )
 
+        # rows are generated in product order, so the flat predictions reshape into
+        # dense tables indexed by [kv_cache_size // granularity, prefill_chunk_size - 1]
+        # and [batch_size - 1, kv_cache_size // granularity] respectively
         predictions["attn_prefill"] = self._get_model_prediction(
             "attn_prefill",
             self._models["attn_prefill"],
             prefill_df[["kv_cache_size", "prefill_chunk_size_squared"]],
+        ).reshape(
+            len(prefill_kv_cache_size_range), len(prefill_prefill_chunk_size_range)
         )
 
         predictions["attn_decode"] = self._get_model_prediction(
             "attn_decode",
             self._models["attn_decode"],
             decode_df[["batch_size", "kv_cache_size"]],
-        )
+        ).reshape(len(decode_batch_size_range), len(decode_kv_cache_size_range))
 
         return predictions
 
@@ -724,95 +822,38 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
 
         return predictions
 
-    def _get_batch_decode_attention_params(self, batch: Batch) -> Tuple[int, int]:
-        if hasattr(batch, "_decode_params"):
-            return batch._decode_params
-
-        decode_kv_cache_sizes = []
-
-        for request in batch.requests:
-            if request._is_prefill_complete:
-                decode_kv_cache_sizes.append(request.num_processed_tokens)
-
-        if not decode_kv_cache_sizes:
-            batch._decode_params = (0, 0)
-            return batch._decode_params
-
-        decode_batch_size = len(decode_kv_cache_sizes)
-        decode_avg_kv_cache_size = int(np.mean(decode_kv_cache_sizes))
-        decode_avg_kv_cache_size = (
-            (
-                decode_avg_kv_cache_size
-                + self._config.kv_cache_prediction_granularity
-                - 1
-            )
-            // self._config.kv_cache_prediction_granularity
-        ) * self._config.kv_cache_prediction_granularity
-
-        batch._decode_params = (decode_batch_size, decode_avg_kv_cache_size)
-
-        return batch._decode_params
-
-    def _get_batch_prefill_attention_params(
-        self, batch: Batch
-    ) -> List[Tuple[int, int]]:
-        if hasattr(batch, "_prefill_params"):
-            return batch._prefill_params
-
-        prefill_params = []
-
-        for request, num_tokens_to_process in zip(batch.requests, batch.num_tokens):
-            if request._is_prefill_complete:
-                continue
-
-            prefill_chunk_size = num_tokens_to_process
-            kv_cache_size = (
-                (
-                    request.num_processed_tokens
-                    + self._config.kv_cache_prediction_granularity
-                    - 1
-                )
-                // self._config.kv_cache_prediction_granularity
-            ) * self._config.kv_cache_prediction_granularity
-
-            prefill_params.append((kv_cache_size, prefill_chunk_size))
-
-        batch._prefill_params = prefill_params
-
-        return prefill_params
-
     def _get_attention_layer_pre_proj_execution_time(self, batch: Batch) -> float:
-        return self._predictions["attn_pre_proj"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["attn_pre_proj"][batch._total_num_tokens_rounded - 1]
 
     def _get_attention_layer_post_proj_execution_time(self, batch: Batch) -> float:
-        return self._predictions["attn_post_proj"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["attn_post_proj"][batch._total_num_tokens_rounded - 1]
 
     def _get_mlp_layer_up_proj_execution_time(self, batch: Batch) -> float:
-        return self._predictions["mlp_up_proj"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["mlp_up_proj"][batch._total_num_tokens_rounded - 1]
 
     def _get_mlp_layer_down_proj_execution_time(self, batch: Batch) -> float:
-        return self._predictions["mlp_down_proj"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["mlp_down_proj"][batch._total_num_tokens_rounded - 1]
 
     def _get_mlp_layer_act_execution_time(self, batch: Batch) -> float:
-        return self._predictions["mlp_act"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["mlp_act"][batch._total_num_tokens_rounded - 1]
 
     def _get_attn_norm_layer_act_execution_time(self, batch: Batch) -> float:
-        return self._predictions["input_layernorm"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["input_layernorm"][batch._total_num_tokens_rounded - 1]
 
     def _get_mlp_norm_layer_act_execution_time(self, batch: Batch) -> float:
         if not self._model_config.post_attn_norm:
             return 0
 
         return self._predictions["post_attention_layernorm"][
-            (batch._total_num_tokens_rounded,)
+            batch._total_num_tokens_rounded - 1
         ]
 
     def _get_add_layer_act_execution_time(self, batch: Batch) -> float:
-        return self._predictions["add"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["add"][batch._total_num_tokens_rounded - 1]
 
     def _get_tensor_parallel_communication_time(self, batch: Batch) -> float:
         return (
-            self._predictions["all_reduce"][(batch._total_num_tokens_rounded,)]
+            self._predictions["all_reduce"][batch._total_num_tokens_rounded - 1]
             + self._config.nccl_cpu_launch_overhead_ms
             + self._config.nccl_cpu_skew_overhead_per_device_ms
             * self._replica_config.tensor_parallel_size**1.25
@@ -820,20 +861,20 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
 
     def _get_pipeline_parallel_communication_time(self, batch: Batch) -> float:
         try:
-            return self._predictions["send_recv"][(batch._total_num_tokens_rounded,)]
-        except KeyError as e:
+            return self._predictions["send_recv"][batch._total_num_tokens_rounded - 1]
+        except IndexError as e:
             logger.error(f"Failed to get send_recv prediction for batch {batch}")
             raise e
 
     def _get_attention_rope_execution_time(self, batch: Batch) -> float:
-        return self._predictions["attn_rope"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["attn_rope"][batch._total_num_tokens_rounded - 1]
 
     def _get_attention_kv_cache_save_execution_time(self, batch: Batch) -> float:
         # don't use round up to the nearest multiple of 8 here, because we want to
         # predict the execution time for the exact number of tokens
         num_tokens = sum(batch.num_tokens)
 
-        return self._predictions["attn_kv_cache_save"][(num_tokens,)]
+        return self._predictions["attn_kv_cache_save"][num_tokens - 1]
 
     def _get_attention_decode_execution_time(self, batch: Batch) -> float:
         (
@@ -844,7 +885,8 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             return 0
 
         return self._predictions["attn_decode"][
-            (decode_batch_size, decode_avg_kv_cache_size)
+            decode_batch_size - 1,
+            decode_avg_kv_cache_size // self._config.kv_cache_prediction_granularity,
         ] * (
             1
             + self._attention_decode_batching_overhead_fraction
@@ -863,7 +905,8 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         agg_prefill_chunk_size = sum([x**2 for x in prefill_chunk_sizes]) ** 0.5
 
         return self._predictions["attn_prefill"][
-            (agg_kv_cache_size, round(agg_prefill_chunk_size) ** 2)
+            agg_kv_cache_size // self._config.kv_cache_prediction_granularity,
+            round(agg_prefill_chunk_size) - 1,
         ] * (
             1
             + self._attention_prefill_batching_overhead_fraction
@@ -874,31 +917,31 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["schedule"][(batch.size,)]
+        return self._predictions["schedule"][batch.size - 1]
 
     def _get_sampler_e2e_time(self, batch: Batch) -> float:
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["sampler_e2e"][(batch.size,)]
+        return self._predictions["sampler_e2e"][batch.size - 1]
 
     def _get_prepare_inputs_e2e_time(self, batch: Batch) -> float:
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["prepare_inputs_e2e"][(batch.size,)]
+        return self._predictions["prepare_inputs_e2e"][batch.size - 1]
 
     def _get_process_model_outputs_time(self, batch: Batch) -> float:
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["process_model_outputs"][(batch.size,)]
+        return self._predictions["process_model_outputs"][batch.size - 1]
 
     def _get_ray_comm_time(self, batch: Batch) -> float:
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["ray_comm_time"][(batch.size,)]
+        return self._predictions["ray_comm_time"][batch.size - 1]
 
     def to_dict(self) -> dict:
         return {
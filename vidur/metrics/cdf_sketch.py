@@ -1,10 +1,9 @@
 import numpy as np
 import pandas as pd
-import plotly_express as px
-import wandb
 from ddsketch.ddsketch import DDSketch
 
 from vidur.logger import init_logger
+from vidur.metrics.utils import get_wandb_run
 
 logger = init_logger(__name__)
 
@@ -31,10 +30,10 @@ class CDFSketch:
     def __len__(self):
         return int(self._sketch.count)
 
-    # add a new x, y datapoint
-    def put(self, data: float) -> None:
+    # add a new datapoint, a weight of n is the same as adding it n times
+    def put(self, data: float, weight: int = 1) -> None:
         self._last_data = data
-        self._sketch.add(data)
+        self._sketch.add(data, weight)
 
     # add a new datapoint as an incremental (delta) update to
     # recently collected datapoint
@@ -60,7 +59,9 @@ class CDFSketch:
             f" count: {self._sketch._count}"
             f" sum: {self._sketch.sum}"
         )
-        if wandb.run:
+        if get_wandb_run():
+            import wandb
+
             wandb.log(
                 {
                     f"{plot_name}_min": self._sketch._min,
@@ -102,10 +103,15 @@ class CDFSketch:
     def sum(self) -> float:
         return self._sketch.sum
 
+    def get_quantile(self, quantile: float) -> float:
+        return self._sketch.get_quantile_value(quantile)
+
     def _save_df(self, df: pd.DataFrame, path: str, plot_name: str) -> None:
         df.to_csv(f"{path}/{plot_name}.csv")
 
-        if wandb.run and self._save_table_to_wandb:
+        if get_wandb_run() and self._save_table_to_wandb:
+            import wandb
+
             wand_table = wandb.Table(dataframe=df)
             wandb.log({f"{plot_name}_table": wand_table}, step=0)
 
@@ -120,7 +126,9 @@ class CDFSketch:
 
         self.print_distribution_stats(plot_name)
 
-        if wandb.run:
+        if get_wandb_run():
+            import wandb
+
             wandb_df = df.copy()
             # rename the self._metric_name column to x_axis_label
             wandb_df = wandb_df.rename(columns={self._metric_name: x_axis_label})
@@ -138,6 +146,8 @@ class CDFSketch:
             )
 
         if self._save_plots:
+            import plotly_express as px
+
             fig = px.line(
                 df,
                 x=self._metric_name,
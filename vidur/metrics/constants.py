@@ -87,3 +87,8 @@ class RequestCompletionMetricsTimeSeries(enum.Enum):
 class TokenCompletionMetricsTimeSeries(enum.Enum):
     PREFILL_COMPLETIONS = "prefill_completion"
     DECODE_COMPLETIONS = "decode_completion"
+
+
+class SLOVerdict(enum.Enum):
+    VIOLATED = "violated"
+    UNBOUNDED_QUEUE_GROWTH = "unbounded_queue_growth"
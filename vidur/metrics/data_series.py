@@ -1,15 +1,111 @@
-from collections import defaultdict
-from typing import Optional
+import os
+from typing import Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-import plotly_express as px
-import wandb
 
 from vidur.logger import init_logger
+from vidur.metrics.cdf_sketch import CDFSketch
+from vidur.metrics.metrics_sink import MetricsSink, read_chunk
+from vidur.metrics.utils import get_wandb_run
 
 logger = init_logger(__name__)
 
+_INITIAL_CAPACITY = 1024
+# rows kept for the plots of a streamed series that is not subsampled
+_STREAMED_PLOT_SUBSAMPLES = 10000
+_NUM_HISTOGRAM_BINS = 25
+# x values sampled from every chunk to place the bounds of the x windows
+_NUM_X_SAMPLES_PER_CHUNK = 256
+
+Columns = Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]
+
+
+def _concat_columns(chunks: List[Columns]) -> Columns:
+    # empty chunks, e.g. an empty tail, would upcast integer columns to float
+    chunks = [chunk for chunk in chunks if len(chunk[0]) > 0] or chunks[:1]
+    if all(chunk[2] is None for chunk in chunks):
+        data_weight = None
+    else:
+        data_weight = np.concatenate(
+            [
+                np.ones(len(chunk[0]), np.int64) if chunk[2] is None else chunk[2]
+                for chunk in chunks
+            ]
+        )
+    data_x = np.concatenate([chunk[0] for chunk in chunks])
+    data_y = np.concatenate([chunk[1] for chunk in chunks])
+
+    return data_x, data_y, data_weight
+
+
+def _count_datapoints(data_x: np.ndarray, data_weight: Optional[np.ndarray]) -> int:
+    if data_weight is None:
+        return len(data_x)
+    return int(data_weight.sum())
+
+
+def _average_by_x(
+    data_x: np.ndarray, data_y: np.ndarray, data_weight: Optional[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    # average the y values of every x, np.unique also sorts by x
+    data_x, inverse = np.unique(data_x, return_inverse=True)
+    if data_weight is None:
+        sums = np.bincount(inverse, weights=data_y)
+        counts = np.bincount(inverse)
+    else:
+        sums = np.bincount(inverse, weights=data_y * data_weight)
+        counts = np.bincount(inverse, weights=data_weight)
+
+    return data_x, sums / np.maximum(counts, 1)
+
+
+class _GrowableArray:
+    """Append-only typed array that doubles its buffer when full.
+
+    The dtype is picked from the first value, int64 for integers and float64
+    otherwise, so that id and count columns keep their type in the saved
+    tables. An integer array is upcast once if a float shows up later.
+    """
+
+    __slots__ = ("_buffer", "_size")
+
+    def __init__(self) -> None:
+        self._buffer = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: Union[int, float]) -> None:
+        buffer = self._buffer
+        if buffer is None:
+            is_int = isinstance(value, (int, np.integer)) and not isinstance(
+                value, bool
+            )
+            buffer = np.empty(_INITIAL_CAPACITY, np.int64 if is_int else np.float64)
+            self._buffer = buffer
+        elif self._size == len(buffer):
+            buffer = np.empty(max(2 * len(buffer), _INITIAL_CAPACITY), buffer.dtype)
+            buffer[: self._size] = self._buffer
+            self._buffer = buffer
+
+        if buffer.dtype == np.int64 and not isinstance(value, (int, np.integer)):
+            buffer = buffer.astype(np.float64)
+            self._buffer = buffer
+
+        buffer[self._size] = value
+        self._size += 1
+
+    def view(self) -> np.ndarray:
+        if self._buffer is None:
+            return np.empty(0, np.float64)
+        return self._buffer[: self._size]
+
+    def replace(self, values: np.ndarray) -> None:
+        self._buffer = np.array(values)
+        self._size = len(values)
+
 
 class DataSeries:
     def __init__(
@@ -19,9 +115,15 @@ class DataSeries:
         subsamples: Optional[int] = None,
         save_table_to_wandb: bool = True,
         save_plots: bool = True,
+        sink: Optional[MetricsSink] = None,
     ) -> None:
-        # metrics are a data series of two-dimensional (x, y) datapoints
-        self._data_series = []
+        # metrics are a data series of two-dimensional (x, y) datapoints, kept
+        # in typed arrays rather than a list of tuples
+        self._data_x = _GrowableArray()
+        self._data_y = _GrowableArray()
+        # repetition count of every datapoint, only allocated once a weighted
+        # datapoint is added
+        self._data_weight = None
         # column names of x, y datatpoints for data collection
         self._x_name = x_name
         self._y_name = y_name
@@ -34,37 +136,272 @@ class DataSeries:
         self._save_table_to_wandb = save_table_to_wandb
         self._save_plots = save_plots
 
+        # with a sink, full chunks of datapoints are flushed to disk and only
+        # the unflushed tail is kept in memory
+        self._sink = sink
+        self._chunk_paths: List[str] = []
+        self._num_flushed = 0
+
+    def flush(self) -> None:
+        if self._sink is None or len(self._data_x) == 0:
+            return
+
+        data_weight = None
+        if self._data_weight is not None:
+            data_weight = self._data_weight.view()
+
+        data_x = self._data_x.view()
+        self._chunk_paths.append(
+            self._sink.write_chunk(
+                self._y_name, data_x, self._data_y.view(), data_weight
+            )
+        )
+        self._num_flushed += _count_datapoints(data_x, data_weight)
+
+        self._data_x = _GrowableArray()
+        self._data_y = _GrowableArray()
+        self._data_weight = None
+
+    @property
+    def _is_streamed(self) -> bool:
+        return len(self._chunk_paths) > 0
+
+    def _get_tail_columns(self) -> Columns:
+        data_weight = None
+        if self._data_weight is not None:
+            data_weight = self._data_weight.view()
+        return self._data_x.view(), self._data_y.view(), data_weight
+
+    def _iter_columns(self) -> Iterator[Columns]:
+        # one flushed chunk at a time, followed by the unflushed tail
+        for chunk_path in self._chunk_paths:
+            yield read_chunk(chunk_path)
+        yield self._get_tail_columns()
+
+    def _get_columns(self) -> Columns:
+        if not self._is_streamed:
+            return self._get_tail_columns()
+
+        return _concat_columns(list(self._iter_columns()))
+
+    def _sample_x(self) -> Tuple[np.ndarray, np.ndarray]:
+        # sorted x values at even steps of every chunk, each standing for the
+        # number of rows of its step
+        samples = []
+        sample_weights = []
+        for data_x, _, _ in self._iter_columns():
+            if len(data_x) == 0:
+                continue
+            step = max(1, len(data_x) // _NUM_X_SAMPLES_PER_CHUNK)
+            chunk_samples = np.sort(data_x)[step // 2 :: step]
+            samples.append(chunk_samples)
+            sample_weights.append(np.full(len(chunk_samples), step, np.int64))
+
+        if not samples:
+            return np.empty(0), np.empty(0, np.int64)
+
+        return np.concatenate(samples), np.concatenate(sample_weights)
+
+    @staticmethod
+    def _get_x_window_bounds(
+        dataseries_list: List["DataSeries"], num_rows_per_window: int
+    ) -> np.ndarray:
+        """
+        Bounds that split the x values of the series into windows of about
+        `num_rows_per_window` rows, placed at quantiles of x rather than at
+        fixed x spans, as x can be a time, a request id or a batch id. Rows with
+        the same x always fall in the same window.
+        """
+        samples, sample_weights = zip(
+            *[dataseries._sample_x() for dataseries in dataseries_list]
+        )
+        samples = np.concatenate(samples)
+        if len(samples) == 0:
+            return samples
+
+        order = np.argsort(samples, kind="stable")
+        samples = samples[order]
+        cumulative_weights = np.cumsum(np.concatenate(sample_weights)[order])
+        targets = np.arange(
+            num_rows_per_window, cumulative_weights[-1], num_rows_per_window
+        )
+        return np.unique(samples[np.searchsorted(cumulative_weights, targets)])
+
+    def _iter_x_windows(self, x_window_bounds: np.ndarray) -> Iterator[Columns]:
+        # the rows of window i have x_window_bounds[i - 1] <= x < x_window_bounds[i]
+        # and a window is yielded for every bound and one past the last, empty
+        # or not. The chunks are partitioned by window in a single pass, so every
+        # row is read and written once whatever the order of x in the chunks.
+        if not self._is_streamed:
+            data_x, data_y, data_weight = self._get_tail_columns()
+            window_ids = np.searchsorted(x_window_bounds, data_x, side="right")
+            for window_id in range(len(x_window_bounds) + 1):
+                mask = window_ids == window_id
+                yield data_x[mask], data_y[mask], (
+                    None if data_weight is None else data_weight[mask]
+                )
+            return
+
+        window_chunk_paths: List[List[str]] = [
+            [] for _ in range(len(x_window_bounds) + 1)
+        ]
+        for data_x, data_y, data_weight in self._iter_columns():
+            if len(data_x) == 0:
+                continue
+            window_ids = np.searchsorted(x_window_bounds, data_x, side="right")
+            order = np.argsort(window_ids, kind="stable")
+            splits = np.flatnonzero(np.diff(window_ids[order])) + 1
+            for indices in np.split(order, splits):
+                window_chunk_paths[window_ids[indices[0]]].append(
+                    self._sink.write_chunk(
+                        f"{self._y_name}_windows",
+                        data_x[indices],
+                        data_y[indices],
+                        None if data_weight is None else data_weight[indices],
+                    )
+                )
+
+        for chunk_paths in window_chunk_paths:
+            chunks = [read_chunk(chunk_path) for chunk_path in chunk_paths]
+            for chunk_path in chunk_paths:
+                os.remove(chunk_path)
+            if not chunks:
+                chunks = [(np.empty(0), np.empty(0), None)]
+            yield _concat_columns(chunks)
+
+    def _consolidate_streamed(self) -> None:
+        # consolidate one window of x values at a time into chunks of their own,
+        # the flushed chunks stay on disk as the raw datapoints
+        x_window_bounds = DataSeries._get_x_window_bounds(
+            [self], self._sink.chunk_size
+        )
+
+        chunk_paths = []
+        num_flushed = 0
+        last_data_y = 0
+        for columns in self._iter_x_windows(x_window_bounds):
+            data_x, data_y = _average_by_x(*columns)
+            if len(data_x) == 0:
+                continue
+
+            chunk_paths.append(
+                self._sink.write_chunk(f"{self._y_name}_consolidated", data_x, data_y)
+            )
+            num_flushed += len(data_x)
+            last_data_y = data_y[-1]
+
+        self._chunk_paths = chunk_paths
+        self._num_flushed = num_flushed
+        self._data_x = _GrowableArray()
+        self._data_y = _GrowableArray()
+        self._data_weight = None
+        self._last_data_y = last_data_y
+
     def consolidate(
         self,
     ):
-        res = defaultdict(list)
-        for x, y in self._data_series:
-            res[x].append(y)
-        self._data_series = [(x, sum(y) / len(y)) for x, y in res.items()]
+        if self._is_streamed:
+            self._consolidate_streamed()
+            return
 
-        # sort by x
-        self._data_series = sorted(self._data_series, key=lambda x: x[0])
-        self._last_data_y = self._data_series[-1][1] if len(self._data_series) else 0
+        data_x, data_y = _average_by_x(*self._get_columns())
 
+        self._data_x.replace(data_x)
+        self._data_y.replace(data_y)
+        self._data_weight = None
+        self._last_data_y = data_y[-1] if len(data_y) else 0
+
+    # weighted datapoints count as many times as their weight
     def __len__(self):
-        return len(self._data_series)
+        data_weight = None
+        if self._data_weight is not None:
+            data_weight = self._data_weight.view()
+        return self._num_flushed + _count_datapoints(self._data_x.view(), data_weight)
 
     @property
     def _metric_name(self) -> str:
         return self._y_name
 
-    # add a new x, y datapoint
-    def put(self, data_x: float, data_y: float) -> None:
+    # add a new x, y datapoint, a weight of n is the same as adding it n times
+    def put(self, data_x: float, data_y: float, weight: int = 1) -> None:
         self._last_data_y = data_y
-        self._data_series.append((data_x, data_y))
+        self._data_x.append(data_x)
+        self._data_y.append(data_y)
+
+        if weight != 1 or self._data_weight is not None:
+            self._put_weight(weight)
+
+        if self._sink is not None and len(self._data_x) >= self._sink.chunk_size:
+            self.flush()
+
+    def _put_weight(self, weight: int) -> None:
+        if self._data_weight is None:
+            # every datapoint added so far has a weight of one
+            self._data_weight = _GrowableArray()
+            self._data_weight.replace(np.ones(len(self._data_x) - 1, np.int64))
+        self._data_weight.append(weight)
 
     # get most recently collected y datapoint
     def _peek_y(self):
         return self._last_data_y
 
-    # convert list of x, y datapoints to a pandas dataframe
+    def _columns_to_df(
+        self, data_x: np.ndarray, data_y: np.ndarray, data_weight: Optional[np.ndarray]
+    ) -> pd.DataFrame:
+        # weighted datapoints are expanded back into repeated rows
+        if data_weight is not None:
+            data_x = np.repeat(data_x, data_weight)
+            data_y = np.repeat(data_y, data_weight)
+
+        return pd.DataFrame({self._x_name: data_x, self._y_name: data_y}, copy=False)
+
+    # convert x, y datapoints to a pandas dataframe backed by the arrays
     def _to_df(self):
-        return pd.DataFrame(self._data_series, columns=[self._x_name, self._y_name])
+        return self._columns_to_df(*self._get_columns())
+
+    def _iter_dfs_in_x_windows(
+        self, x_window_bounds: np.ndarray
+    ) -> Iterator[pd.DataFrame]:
+        for columns in self._iter_x_windows(x_window_bounds):
+            yield self._columns_to_df(*columns)
+
+    def _iter_dfs(self) -> Iterator[pd.DataFrame]:
+        for columns in self._iter_columns():
+            yield self._columns_to_df(*columns)
+
+    def _to_sketch(self) -> CDFSketch:
+        # streamed series do not fit in memory, their distribution is sketched
+        # one chunk at a time
+        sketch = CDFSketch(self._y_name, self._save_table_to_wandb, self._save_plots)
+        for _, data_y, data_weight in self._iter_columns():
+            if data_weight is None:
+                for value in data_y.tolist():
+                    sketch.put(value)
+                continue
+
+            for value, weight in zip(data_y.tolist(), data_weight.tolist()):
+                if weight > 0:
+                    sketch.put(value, weight)
+
+        return sketch
+
+    def get_quantile(self, quantile: float) -> float:
+        if self._is_streamed:
+            return self._to_sketch().get_quantile(quantile)
+
+        return self._to_df()[self._y_name].quantile(quantile)
+
+    def get_mean_and_quantiles(
+        self, quantiles: List[float]
+    ) -> Tuple[float, List[float]]:
+        if self._is_streamed:
+            sketch = self._to_sketch()
+            return sketch.sum / len(sketch), [
+                sketch.get_quantile(quantile) for quantile in quantiles
+            ]
+
+        data = self._to_df()[self._y_name]
+        return data.mean(), data.quantile(quantiles).tolist()
 
     # add a new x, y datapoint as an incremental (delta) update to
     # recently collected y datapoint
@@ -76,7 +413,7 @@ class DataSeries:
     def print_series_stats(
         self, df: pd.DataFrame, plot_name: str, x_name: str = None, y_name: str = None
     ) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
         if x_name is None:
             x_name = self._x_name
@@ -84,18 +421,27 @@ class DataSeries:
         if y_name is None:
             y_name = self._y_name
 
+        self._log_series_stats(
+            plot_name, y_name, df[y_name].min(), df[y_name].max(), df[y_name].mean()
+        )
+
+    def _log_series_stats(
+        self, plot_name: str, y_name: str, y_min: float, y_max: float, y_mean: float
+    ) -> None:
         logger.debug(
             f"{plot_name}: {y_name} stats:"
-            f" min: {df[y_name].min()},"
-            f" max: {df[y_name].max()},"
-            f" mean: {df[y_name].mean()},"
+            f" min: {y_min},"
+            f" max: {y_max},"
+            f" mean: {y_mean},"
         )
-        if wandb.run:
+        if get_wandb_run():
+            import wandb
+
             wandb.log(
                 {
-                    f"{plot_name}_min": df[y_name].min(),
-                    f"{plot_name}_max": df[y_name].max(),
-                    f"{plot_name}_mean": df[y_name].mean(),
+                    f"{plot_name}_min": y_min,
+                    f"{plot_name}_max": y_max,
+                    f"{plot_name}_mean": y_mean,
                 },
                 step=0,
             )
@@ -103,7 +449,7 @@ class DataSeries:
     def print_distribution_stats(
         self, df: pd.DataFrame, plot_name: str, y_name: str = None
     ) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
         if y_name is None:
@@ -119,7 +465,9 @@ class DataSeries:
             f" 99th percentile: {df[y_name].quantile(0.99)}"
             f" 99.9th percentile: {df[y_name].quantile(0.999)}"
         )
-        if wandb.run:
+        if get_wandb_run():
+            import wandb
+
             wandb.log(
                 {
                     f"{plot_name}_min": df[y_name].min(),
@@ -138,7 +486,9 @@ class DataSeries:
 
     def _save_df(self, df: pd.DataFrame, path: str, plot_name: str) -> None:
         df.to_csv(f"{path}/{plot_name}.csv")
-        if wandb.run and self._save_table_to_wandb:
+        if get_wandb_run() and self._save_table_to_wandb:
+            import wandb
+
             wand_table = wandb.Table(dataframe=df)
             wandb.log({f"{plot_name}_table": wand_table}, step=0)
 
@@ -155,22 +505,26 @@ class DataSeries:
         y_cumsum: bool = True,
     ) -> None:
 
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
         if y_axis_label is None:
             y_axis_label = self._y_name
 
-        df = self._to_df()
-        df[self._x_name] -= start_time
+        if self._is_streamed:
+            df = self._get_streamed_step_df(path, plot_name, start_time, y_cumsum)
+        else:
+            df = self._to_df()
+            # not in place, the dataframe shares memory with the series
+            df[self._x_name] = df[self._x_name] - start_time
 
-        if y_cumsum:
-            df[self._y_name] = df[self._y_name].cumsum()
+            if y_cumsum:
+                df[self._y_name] = df[self._y_name].cumsum()
 
-        self.print_series_stats(df, plot_name)
+            self.print_series_stats(df, plot_name)
 
-        # subsample
-        if self._should_subsample(len(df)):
+        # subsample, streamed series are subsampled while they are read back
+        if not self._is_streamed and self._should_subsample(len(df)):
             # pick self._subsamples from the dataframe
             # however, if we make the difference between indices constant
             # we might pick spurious periodic patterns
@@ -181,7 +535,9 @@ class DataSeries:
             indices = (indices + offsets) % len(df)
             df = df.iloc[indices]
 
-        if wandb.run:
+        if get_wandb_run():
+            import wandb
+
             wandb_df = df.copy()
             # rename the self._y_name column to y_axis_label
             wandb_df = wandb_df.rename(columns={self._y_name: y_axis_label})
@@ -199,6 +555,8 @@ class DataSeries:
             )
 
         if self._save_plots:
+            import plotly_express as px
+
             fig = px.line(
                 df,
                 x=self._x_name,
@@ -209,15 +567,86 @@ class DataSeries:
             fig.update_traces(marker=dict(color="red", size=2))
             fig.write_image(f"{path}/{plot_name}.png")
 
-        self._save_df(df, path, plot_name)
+        # the csv of a streamed series is written while it is read back
+        if not self._is_streamed:
+            self._save_df(df, path, plot_name)
+
+    def _get_streamed_step_df(
+        self, path: str, plot_name: str, start_time: float, y_cumsum: bool
+    ) -> pd.DataFrame:
+        # one chunk at a time, the full csv is written unless the series is
+        # subsampled, and only a subsample of the rows is kept for the plots
+        num_rows = sum(len(df) for df in self._iter_dfs())
+        num_subsamples = (
+            self._subsamples
+            if self._should_subsample(num_rows)
+            else _STREAMED_PLOT_SUBSAMPLES
+        )
+        subsample_step = max(1, num_rows // num_subsamples)
+        subsample_offset = np.random.randint(0, 5)
+        save_csv = not self._should_subsample(num_rows)
+
+        sampled_dfs = []
+        row_offset = 0
+        last_y = 0
+        y_min = np.inf
+        y_max = -np.inf
+        y_sum = 0
+        for df in self._iter_dfs():
+            if len(df) == 0:
+                continue
+
+            df[self._x_name] = df[self._x_name] - start_time
+            if y_cumsum:
+                df[self._y_name] = df[self._y_name].cumsum() + last_y
+                last_y = df[self._y_name].iloc[-1]
+
+            y_min = min(y_min, df[self._y_name].min())
+            y_max = max(y_max, df[self._y_name].max())
+            y_sum += df[self._y_name].sum()
+
+            df.index = pd.RangeIndex(row_offset, row_offset + len(df))
+            if save_csv:
+                df.to_csv(
+                    f"{path}/{plot_name}.csv",
+                    mode="w" if row_offset == 0 else "a",
+                    header=row_offset == 0,
+                )
+
+            indices = np.arange(
+                (subsample_offset - row_offset) % subsample_step,
+                len(df),
+                subsample_step,
+            )
+            sampled_dfs.append(df.iloc[indices])
+            row_offset += len(df)
+
+        self._log_series_stats(
+            plot_name, self._y_name, y_min, y_max, y_sum / max(num_rows, 1)
+        )
+
+        sampled_df = (
+            pd.concat(sampled_dfs)
+            if sampled_dfs
+            else pd.DataFrame(columns=[self._x_name, self._y_name])
+        )
+        if not save_csv:
+            self._save_df(sampled_df, path, plot_name)
+
+        return sampled_df
 
     def plot_cdf(self, path: str, plot_name: str, y_axis_label: str = None) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
         if y_axis_label is None:
             y_axis_label = self._y_name
 
+        if self._is_streamed:
+            # the cdf of a streamed series is taken from its sketch
+            self._to_sketch().plot_cdf(path, plot_name, y_axis_label)
+            return
+
         df = self._to_df()
 
         self.print_distribution_stats(df, plot_name)
@@ -230,7 +659,9 @@ class DataSeries:
         if self._should_subsample(len(df)):
             df = df.iloc[:: len(df) // self._subsamples]
 
-        if wandb.run:
+        if get_wandb_run():
+            import wandb
+
             wandb_df = df.copy()
             # rename the self._y_name column to y_axis_label
             wandb_df = wandb_df.rename(columns={self._y_name: y_axis_label})
@@ -248,6 +679,8 @@ class DataSeries:
             )
 
         if self._save_plots:
+            import plotly_express as px
+
             fig = px.line(
                 df, x=self._y_name, y="cdf", markers=True, labels={"x": y_axis_label}
             )
@@ -255,26 +688,58 @@ class DataSeries:
             fig.write_image(f"{path}/{plot_name}.png")
         self._save_df(df, path, plot_name)
 
+    def _get_streamed_histogram_df(self) -> pd.DataFrame:
+        # two passes over the chunks, one for the bin edges and one for the counts
+        y_min = np.inf
+        y_max = -np.inf
+        for _, data_y, _ in self._iter_columns():
+            if len(data_y) > 0:
+                y_min = min(y_min, data_y.min())
+                y_max = max(y_max, data_y.max())
+        if y_min == y_max:
+            y_min, y_max = y_min - 0.5, y_max + 0.5
+        bin_edges = np.linspace(y_min, y_max, _NUM_HISTOGRAM_BINS + 1)
+
+        counts = np.zeros(_NUM_HISTOGRAM_BINS)
+        for _, data_y, data_weight in self._iter_columns():
+            counts += np.histogram(data_y, bins=bin_edges, weights=data_weight)[0]
+
+        return pd.DataFrame(
+            {"Bins": (bin_edges[:-1] + bin_edges[1:]) / 2, "count": counts}
+        )
+
     def plot_histogram(self, path: str, plot_name: str) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
-        df = self._to_df()
+        if self._is_streamed:
+            df = None
+            self._to_sketch().print_distribution_stats(plot_name)
+        else:
+            df = self._to_df()
+            self.print_distribution_stats(df, plot_name)
 
-        self.print_distribution_stats(df, plot_name)
+        if get_wandb_run():
+            import wandb
 
-        if wandb.run:
             # wandb histogram is highly inaccurate so we need to generate the histogram
             # ourselves and then use wandb bar chart
-            histogram_df = (
-                df[self._y_name].value_counts(bins=25, sort=False).sort_index()
-            )
-            histogram_df = histogram_df.reset_index()
-            histogram_df.columns = ["Bins", "count"]
-            histogram_df["Bins"] = histogram_df["Bins"].apply(lambda x: x.mid)
+            if df is None:
+                histogram_df = self._get_streamed_histogram_df()
+            else:
+                histogram_df = (
+                    df[self._y_name]
+                    .value_counts(bins=_NUM_HISTOGRAM_BINS, sort=False)
+                    .sort_index()
+                )
+                histogram_df = histogram_df.reset_index()
+                histogram_df.columns = ["Bins", "count"]
+                histogram_df["Bins"] = histogram_df["Bins"].apply(lambda x: x.mid)
             histogram_df = histogram_df.sort_values(by=["Bins"])
             # convert to percentage
-            histogram_df["Percentage"] = histogram_df["count"] * 100 / len(df)
+            histogram_df["Percentage"] = (
+                histogram_df["count"] * 100 / histogram_df["count"].sum()
+            )
             # drop bins with less than 0.1% of the total count
             histogram_df = histogram_df[histogram_df["Percentage"] > 0.1]
 
@@ -291,11 +756,16 @@ class DataSeries:
             )
 
         if self._save_plots:
-            fig = px.histogram(df, x=self._y_name, nbins=25)
+            import plotly_express as px
+
+            if df is None:
+                fig = px.bar(self._get_streamed_histogram_df(), x="Bins", y="count")
+            else:
+                fig = px.histogram(df, x=self._y_name, nbins=_NUM_HISTOGRAM_BINS)
             fig.write_image(f"{path}/{plot_name}.png")
 
     def plot_differential(self, path: str, plot_name: str) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
         df = self._to_df()
@@ -317,7 +787,9 @@ class DataSeries:
         if self._should_subsample(len(df)):
             df = df.iloc[:: len(df) // self._subsamples]
 
-        if wandb.run:
+        if get_wandb_run():
+            import wandb
+
             wandb.log(
                 {
                     f"{plot_name}_differential": wandb.plot.line(
@@ -331,6 +803,8 @@ class DataSeries:
             )
 
         if self._save_plots:
+            import plotly_express as px
+
             fig = px.line(df, x=self._x_name, y=differential_col_name, markers=True)
             fig.update_traces(marker=dict(color="red", size=2))
             fig.write_image(f"{path}/{plot_name}.png")
@@ -0,0 +1,80 @@
+import glob
+import os
+import shutil
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+WEIGHT_COLUMN = "weight"
+
+
+class MetricsSink:
+    """Spills data series rows to disk in fixed-size chunks.
+
+    Every series gets a directory under `base_path` with one .npz file per
+    chunk, holding the x, y and, for weighted series, weight columns. A chunk
+    is written as soon as it fills up, so the rows survive a crash and the
+    process only keeps the unflushed tail of every series in memory. The
+    chunks of an earlier run in the same directory, e.g. one that crashed,
+    are removed first so that they are not mixed into this run.
+    """
+
+    def __init__(self, base_path: str, chunk_size: int) -> None:
+        assert chunk_size > 0
+
+        shutil.rmtree(base_path, ignore_errors=True)
+
+        self._base_path = base_path
+        self._chunk_size = chunk_size
+        self._num_chunks: Dict[str, int] = {}
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    def write_chunk(
+        self,
+        series_name: str,
+        data_x: np.ndarray,
+        data_y: np.ndarray,
+        data_weight: Optional[np.ndarray] = None,
+    ) -> str:
+        series_path = f"{self._base_path}/{series_name}"
+        chunk_idx = self._num_chunks.get(series_name, 0)
+        if chunk_idx == 0:
+            os.makedirs(series_path, exist_ok=True)
+
+        columns = {"x": data_x, "y": data_y}
+        if data_weight is not None:
+            columns[WEIGHT_COLUMN] = data_weight
+
+        chunk_path = f"{series_path}/chunk_{chunk_idx:06d}.npz"
+        np.savez(chunk_path, **columns)
+        self._num_chunks[series_name] = chunk_idx + 1
+
+        return chunk_path
+
+
+def read_chunk(
+    chunk_path: str,
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    with np.load(chunk_path) as chunk:
+        data_weight = chunk[WEIGHT_COLUMN] if WEIGHT_COLUMN in chunk else None
+        return chunk["x"], chunk["y"], data_weight
+
+
+def load_series_df(series_path: str, x_name: str, y_name: str) -> pd.DataFrame:
+    # weighted datapoints are expanded back into repeated rows
+    dfs = []
+    for chunk_path in sorted(glob.glob(f"{series_path}/chunk_*.npz")):
+        data_x, data_y, data_weight = read_chunk(chunk_path)
+        if data_weight is not None:
+            data_x = np.repeat(data_x, data_weight)
+            data_y = np.repeat(data_y, data_weight)
+        dfs.append(pd.DataFrame({x_name: data_x, y_name: data_y}, copy=False))
+
+    if len(dfs) == 0:
+        return pd.DataFrame({x_name: [], y_name: []})
+
+    return pd.concat(dfs, ignore_index=True)
@@ -1,13 +1,14 @@
+import json
 import os
 from functools import reduce
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
-import plotly_express as px
-import wandb
 
 from vidur.config import SimulationConfig
-from vidur.entities import Batch, BatchStage, ExecutionTime, Request
+from vidur.config.model_config import BaseModelConfig
+from vidur.config.utils import dataclass_to_dict
+from vidur.entities import Batch, BatchStage, ExecutionTime, Replica, Request
 from vidur.logger import init_logger
 from vidur.metrics.cdf_sketch import CDFSketch
 from vidur.metrics.constants import (
@@ -22,7 +23,10 @@ from vidur.metrics.constants import (
     TokenMetricsTimeDistribution,
 )
 from vidur.metrics.data_series import DataSeries
+from vidur.metrics.metrics_sink import MetricsSink
 from vidur.metrics.series_average_meter import SeriesAverageMeter
+from vidur.metrics.slo_monitor import SLOMonitor
+from vidur.metrics.utils import get_wandb_run
 from vidur.utils.mfu_calculator import MFUCalculator
 
 logger = init_logger(__name__)
@@ -46,20 +50,52 @@ UTILIZATION_STR = "Utilization (%)"
 OPERATION_STR = "Operation"
 TIME_STR_MS = "Time (ms)"
 
+SUMMARY_QUANTILES = [0.5, 0.9, 0.95, 0.99, 0.999]
+
 
 class MetricsStore:
 
-    def __init__(self, simulation_config: SimulationConfig) -> None:
+    def __init__(
+        self, simulation_config: SimulationConfig, replicas: Dict[int, Replica]
+    ) -> None:
         self._simulation_config = simulation_config
         self._config = self._simulation_config.metrics_config
         self._last_request_arrived_at = None
 
         # copy config
         self._num_replicas = sum(self._simulation_config.cluster_config.num_replicas)
+        # per replica metrics are stored in replica id order
+        self._replica_indices = {
+            replica_id: replica_idx
+            for replica_idx, replica_id in enumerate(sorted(replicas))
+        }
         self._num_pipeline_stages = (
             self._simulation_config.cluster_config.replica_config.num_pipeline_stages
         )
 
+        # headless runs only write the csv files of the requested metrics
+        self._store_plots = self._config.store_plots and not self._config.headless
+
+        # per request and per batch rows are spilled to disk when streaming
+        self._metrics_sink = None
+        if self._config.write_metrics and self._config.stream_metrics:
+            self._metrics_sink = MetricsSink(
+                f"{self._config.output_dir}/metrics",
+                self._config.stream_metrics_chunk_size,
+            )
+
+        self._slo_monitor = None
+        if (
+            self._config.write_metrics
+            and self._config.scheduling_delay_slo_value is not None
+        ):
+            self._slo_monitor = SLOMonitor(
+                self._config.scheduling_delay_slo_value,
+                self._config.scheduling_delay_slo_quantile,
+                self._config.slo_monitor_window_size,
+                self._config.slo_monitor_num_growth_windows,
+            )
+
         # Initialise request metrics
         self._request_metrics_time_distributions: Dict[
             RequestMetricsTimeDistributions, DataSeries
@@ -70,7 +106,8 @@ class MetricsStore:
                 metric_name.value,
                 self._config.subsamples,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
+                self._metrics_sink,
             )
 
         self._token_metrics_time_distribution: Dict[
@@ -80,7 +117,7 @@ class MetricsStore:
             self._token_metrics_time_distribution[metric_name] = CDFSketch(
                 metric_name.value,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
             )
 
         self._request_metrics_histogram: Dict[RequestMetricsHistogram, DataSeries] = {}
@@ -90,7 +127,8 @@ class MetricsStore:
                 metric_name.value,
                 self._config.subsamples,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
+                self._metrics_sink,
             )
 
         # Initialise batch metrics
@@ -104,14 +142,15 @@ class MetricsStore:
             self._batch_metrics_count_distribution[metric_name] = CDFSketch(
                 metric_name.value,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
             )
             self._batch_metrics_count_distribution_per_batch[metric_name] = DataSeries(
                 BATCH_ID_STR,
                 metric_name.value,
                 self._config.subsamples,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
+                self._metrics_sink,
             )
 
         self._batch_metrics_time_distribution: Dict[
@@ -124,14 +163,15 @@ class MetricsStore:
             self._batch_metrics_time_distribution[metric_name] = CDFSketch(
                 metric_name.value,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
             )
             self._batch_metrics_time_distribution_per_batch[metric_name] = DataSeries(
                 BATCH_ID_STR,
                 metric_name.value,
                 self._config.subsamples,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
+                self._metrics_sink,
             )
 
         # Initialise completion metrics
@@ -144,7 +184,8 @@ class MetricsStore:
                 metric_name.value,
                 self._config.subsamples,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
+                self._metrics_sink,
             )
         self._token_completion_metrics_time_series: Dict[
             TokenCompletionMetricsTimeSeries, DataSeries
@@ -155,7 +196,8 @@ class MetricsStore:
                 metric_name.value,
                 self._config.subsamples,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
+                self._metrics_sink,
             )
 
         # Initialise operation metrics
@@ -165,14 +207,15 @@ class MetricsStore:
             self._operation_metrics[metric_name] = CDFSketch(
                 metric_name.value,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
             )
             self._operation_metrics_per_batch[metric_name] = DataSeries(
                 BATCH_ID_STR,
                 metric_name.value,
                 self._config.subsamples,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
+                self._metrics_sink,
             )
 
         self._cpu_operation_metrics: Dict[CpuOperationMetrics, CDFSketch] = {}
@@ -183,14 +226,15 @@ class MetricsStore:
             self._cpu_operation_metrics[metric_name] = CDFSketch(
                 metric_name.value,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
             )
             self._cpu_operation_metrics_per_batch[metric_name] = DataSeries(
                 BATCH_ID_STR,
                 metric_name.value,
                 self._config.subsamples,
                 self._config.save_table_to_wandb,
-                self._config.store_plots,
+                self._store_plots,
+                self._metrics_sink,
             )
 
         # per replica metrics
@@ -198,9 +242,12 @@ class MetricsStore:
         # per replica stage metrics
         self._replica_busy_time = []
         self._replica_mfu = []
-        self._mfu_calculator = MFUCalculator(
-            self._simulation_config.cluster_config.replica_config
-        )
+        # replicas running the same model share a calculator
+        self._mfu_calculators: Dict[str, MFUCalculator] = {}
+        self._replica_mfu_calculators = [
+            self._get_mfu_calculator(replicas[replica_id]._model_config)
+            for replica_id in sorted(replicas)
+        ]
 
         for replica_idx in range(self._num_replicas):
             self._replica_memory_usage.append(
@@ -236,14 +283,29 @@ class MetricsStore:
 
         self._init_wandb()
 
+    @property
+    def slo_monitor(self) -> Optional[SLOMonitor]:
+        return self._slo_monitor
+
+    def _get_mfu_calculator(self, model_config: BaseModelConfig) -> MFUCalculator:
+        key = json.dumps(dataclass_to_dict(model_config), sort_keys=True, default=str)
+        if key not in self._mfu_calculators:
+            self._mfu_calculators[key] = MFUCalculator(
+                self._simulation_config.cluster_config.replica_config, model_config
+            )
+        return self._mfu_calculators[key]
+
     def _init_wandb(self):
         if (
             not self._config.write_metrics
+            or self._config.headless
             or not self._config.wandb_project
             or not self._config.wandb_group
         ):
             return
 
+        import wandb
+
         wandb.init(
             project=self._config.wandb_project,
             group=self._config.wandb_group,
@@ -260,15 +322,66 @@ class MetricsStore:
     ):
         os.makedirs(base_path, exist_ok=True)
 
+        if self._metrics_sink is not None:
+            self._save_as_csv_in_windows(
+                dataseries_list, key_to_join, f"{base_path}/{file_name}.csv"
+            )
+            return
+
         merged_df = reduce(
             lambda left, right: pd.merge(left, right, on=[key_to_join], how="outer"),
             [dataseries._to_df() for dataseries in dataseries_list],
         )
         merged_df.to_csv(f"{base_path}/{file_name}.csv", index=False)
-        if wandb.run and self._config.save_table_to_wandb:
+        if get_wandb_run() and self._config.save_table_to_wandb:
+            import wandb
+
             wand_table = wandb.Table(dataframe=merged_df)
             wandb.log({f"{file_name}_table": wand_table}, step=0)
 
+    def _save_as_csv_in_windows(
+        self,
+        dataseries_list: List[DataSeries],
+        key_to_join: str,
+        csv_path: str,
+    ):
+        # streamed series are merged one window of keys at a time, so that only
+        # the rows of a single window are held in memory
+        columns = [key_to_join] + [dataseries._y_name for dataseries in dataseries_list]
+        # the same windows of keys for every series, so that they can be merged
+        # window by window
+        x_window_bounds = DataSeries._get_x_window_bounds(
+            dataseries_list, self._metrics_sink.chunk_size
+        )
+
+        is_first_window = True
+        for dfs in zip(
+            *[
+                dataseries._iter_dfs_in_x_windows(x_window_bounds)
+                for dataseries in dataseries_list
+            ]
+        ):
+            dfs = [df for df in dfs if len(df) > 0]
+            if not dfs:
+                continue
+
+            merged_df = reduce(
+                lambda left, right: pd.merge(
+                    left, right, on=[key_to_join], how="outer"
+                ),
+                dfs,
+            ).reindex(columns=columns)
+            merged_df.to_csv(
+                csv_path,
+                mode="w" if is_first_window else "a",
+                header=is_first_window,
+                index=False,
+            )
+            is_first_window = False
+
+        if is_first_window:
+            pd.DataFrame(columns=columns).to_csv(csv_path, index=False)
+
     def _store_bar_plot(
         self,
         base_path: str,
@@ -277,7 +390,9 @@ class MetricsStore:
         y_label: str,
         data: Dict[str, float],
     ):
-        if wandb.run:
+        if get_wandb_run():
+            import wandb
+
             wandb.log(
                 {
                     plot_name: wandb.plot.bar(
@@ -294,6 +409,8 @@ class MetricsStore:
                 step=0,
             )
         if self._config.store_plots:
+            import plotly_express as px
+
             fig = px.bar(
                 x=list(data.keys()),
                 y=list(data.values()),
@@ -473,17 +590,158 @@ class MetricsStore:
                     base_plot_path,
                 )
 
+        self._store_cluster_mfu(base_plot_path)
+
+    def _store_cluster_mfu(self, base_plot_path: str):
+        # every stage runs on tensor_parallel_size devices, weigh the mfu of each
+        # stage by the peak flops of the devices it runs on
+        tensor_parallel_size = (
+            self._simulation_config.cluster_config.replica_config.tensor_parallel_size
+        )
+        weighted_mfu_sum = 0
+        device_flops_sum = 0
+        for replica_idx in range(self._num_replicas):
+            device_flops = (
+                self._replica_mfu_calculators[replica_idx].device_flops
+                * tensor_parallel_size
+            )
+            for stage_idx in range(self._num_pipeline_stages):
+                mfu = self._replica_mfu[replica_idx][stage_idx].weighted_mean
+                if mfu is None:
+                    continue
+                weighted_mfu_sum += mfu * device_flops
+                device_flops_sum += device_flops
+
+        if device_flops_sum == 0:
+            return
+
+        cluster_mfu = weighted_mfu_sum / device_flops_sum
+        logger.debug(f"cluster_mfu: {cluster_mfu}")
+
+        with open(f"{base_plot_path}/cluster_mfu.json", "w") as f:
+            json.dump({"cluster_mfu_weighted_mean": cluster_mfu}, f)
+
+        if get_wandb_run():
+            import wandb
+
+            wandb.log({"cluster_mfu_weighted_mean": cluster_mfu}, step=0)
+
+    def _get_all_dataseries(self) -> List[DataSeries]:
+        return [
+            *self._request_metrics_time_distributions.values(),
+            *self._request_metrics_histogram.values(),
+            *self._batch_metrics_count_distribution_per_batch.values(),
+            *self._batch_metrics_time_distribution_per_batch.values(),
+            *self._request_completion_metrics_time_series.values(),
+            *self._token_completion_metrics_time_series.values(),
+            *self._operation_metrics_per_batch.values(),
+            *self._cpu_operation_metrics_per_batch.values(),
+        ]
+
+    def _store_headless_metrics(self, base_plot_path: str):
+        metric_names = set(self._config.headless_metrics)
+
+        for dataseries in self._request_metrics_time_distributions.values():
+            if dataseries._metric_name in metric_names:
+                dataseries.plot_cdf(base_plot_path, dataseries._y_name, TIME_STR)
+
+        for dataseries in self._token_metrics_time_distribution.values():
+            if dataseries._metric_name in metric_names:
+                dataseries.plot_cdf(base_plot_path, dataseries._metric_name, TIME_STR)
+
+        for dataseries in self._batch_metrics_time_distribution.values():
+            if dataseries._metric_name in metric_names:
+                y_axis_label = (
+                    TIME_STR_MS
+                    if "model_execution" in dataseries._metric_name
+                    else TIME_STR
+                )
+                dataseries.plot_cdf(
+                    base_plot_path, dataseries._metric_name, y_axis_label
+                )
+
+        for dataseries in self._batch_metrics_count_distribution.values():
+            if dataseries._metric_name in metric_names:
+                dataseries.plot_cdf(base_plot_path, dataseries._metric_name, COUNT_STR)
+
     @if_write_metrics
     def plot(self) -> None:
         dir_plot_path = f"{self._config.output_dir}/plots"
         os.makedirs(dir_plot_path, exist_ok=True)
 
+        # complete the streamed chunks on disk, the plots read them back
+        if self._metrics_sink is not None:
+            for dataseries in self._get_all_dataseries():
+                dataseries.flush()
+
+        if self._slo_monitor is not None:
+            with open(f"{self._config.output_dir}/slo_verdict.json", "w") as f:
+                json.dump(self._slo_monitor.to_dict(), f)
+
+        if self._config.headless:
+            self._store_headless_metrics(dir_plot_path)
+            return
+
         self._store_request_metrics(dir_plot_path)
         self._store_batch_metrics(dir_plot_path)
         self._store_completion_metrics(dir_plot_path)
         self._store_operation_metrics(dir_plot_path)
         self._store_utilization_metrics(dir_plot_path)
 
+    def get_request_metric_quantile(
+        self, metric_name: RequestMetricsTimeDistributions, quantile: float
+    ) -> Optional[float]:
+        dataseries = self._request_metrics_time_distributions[metric_name]
+        if len(dataseries) == 0:
+            return None
+
+        return dataseries.get_quantile(quantile)
+
+    def get_summary(self) -> Dict[str, Any]:
+        summary = {}
+
+        # sweeps look the scheduling delay at their SLO quantile up in the summary
+        request_quantiles = SUMMARY_QUANTILES
+        if self._config.scheduling_delay_slo_quantile not in request_quantiles:
+            request_quantiles = sorted(
+                [*request_quantiles, self._config.scheduling_delay_slo_quantile]
+            )
+
+        for dataseries in self._request_metrics_time_distributions.values():
+            if len(dataseries) == 0:
+                continue
+
+            mean, quantile_values = dataseries.get_mean_and_quantiles(
+                request_quantiles
+            )
+            summary[f"{dataseries._metric_name}_mean"] = mean
+            for quantile, value in zip(request_quantiles, quantile_values):
+                summary[f"{dataseries._metric_name}_p{quantile * 100:g}"] = value
+
+        for dataseries in [
+            *self._batch_metrics_time_distribution.values(),
+            *self._batch_metrics_count_distribution.values(),
+        ]:
+            if len(dataseries) == 0:
+                continue
+
+            for quantile in SUMMARY_QUANTILES:
+                summary[f"{dataseries._metric_name}_p{quantile * 100:g}"] = (
+                    dataseries.get_quantile(quantile)
+                )
+
+        summary["num_completed_requests"] = len(
+            self._request_metrics_time_distributions[
+                RequestMetricsTimeDistributions.REQUEST_E2E_TIME
+            ]
+        )
+        if self._slo_monitor is not None:
+            summary.update(
+                {f"slo_{k}": v for k, v in self._slo_monitor.to_dict().items()}
+            )
+
+        return summary
+
     @if_write_metrics
     def on_request_arrival(self, time: float, request: Request) -> None:
         if not self._config.store_request_metrics:
@@ -513,6 +771,9 @@ class MetricsStore:
 
     @if_write_metrics
     def _on_request_end(self, time: float, request: Request) -> None:
+        if self._slo_monitor is not None:
+            self._slo_monitor.on_request_end(request)
+
         if not self._config.store_request_metrics:
             return
 
@@ -612,14 +873,20 @@ class MetricsStore:
         ].put(time, 1)
 
     def _push_metric(
-        self, metric_name: OperationMetrics, batch_id: int, value: float
+        self,
+        metric_name: OperationMetrics,
+        batch_id: int,
+        value: float,
+        weight: int = 1,
     ) -> None:
         if metric_name in OperationMetrics:
-            self._operation_metrics[metric_name].put(value)
-            self._operation_metrics_per_batch[metric_name].put(batch_id, value)
+            self._operation_metrics[metric_name].put(value, weight)
+            self._operation_metrics_per_batch[metric_name].put(batch_id, value, weight)
         elif metric_name in CpuOperationMetrics:
-            self._cpu_operation_metrics[metric_name].put(value)
-            self._cpu_operation_metrics_per_batch[metric_name].put(batch_id, value)
+            self._cpu_operation_metrics[metric_name].put(value, weight)
+            self._cpu_operation_metrics_per_batch[metric_name].put(
+                batch_id, value, weight
+            )
         elif metric_name in BatchMetricsTimeDistribution:
             self._batch_metrics_time_distribution[metric_name].put(value)
             self._batch_metrics_time_distribution_per_batch[metric_name].put(
@@ -646,7 +913,9 @@ class MetricsStore:
             self._on_request_end(time, request)
 
         if self._config.store_utilization_metrics:
-            self._replica_memory_usage[replica_id - 1].put(time, memory_usage_percent)
+            self._replica_memory_usage[self._replica_indices[replica_id]].put(
+                time, memory_usage_percent
+            )
 
         for request in batch.requests:
             self._update_per_token_execution_times(time, request, batch)
@@ -685,7 +954,9 @@ class MetricsStore:
         if not self._config.store_utilization_metrics:
             return
 
-        self._replica_memory_usage[replica_id - 1].put(time, memory_usage_percent)
+        self._replica_memory_usage[self._replica_indices[replica_id]].put(
+            time, memory_usage_percent
+        )
 
     @if_write_metrics
     def on_replica_stage_schedule(
@@ -699,87 +970,103 @@ class MetricsStore:
         if not self._config.store_utilization_metrics:
             return
 
-        self._replica_busy_time[replica_id - 1][stage_id - 1].put(time, 100)
-        mfu = self._mfu_calculator.get_mfu(batch_stage)
-        self._replica_mfu[replica_id - 1][stage_id - 1].put(time, mfu)
+        replica_idx = self._replica_indices[replica_id]
+        self._replica_busy_time[replica_idx][stage_id].put(time, 100)
+        mfu = self._replica_mfu_calculators[replica_idx].get_mfu(batch_stage)
+        self._replica_mfu[replica_idx][stage_id].put(time, mfu)
 
         if not self._config.store_operation_metrics:
             return
 
         batch_id = batch_stage._batch_id
-        for _ in range(execution_time.num_layers):
-            self._push_metric(
-                OperationMetrics.MLP_UP_PROJ,
-                batch_id,
-                execution_time.mlp_layer_up_proj_execution_time,
-            )
-            self._push_metric(
-                OperationMetrics.MLP_ACTIVATION,
-                batch_id,
-                execution_time.mlp_layer_act_execution_time,
-            )
-            self._push_metric(
-                OperationMetrics.MLP_DOWN_PROJ,
-                batch_id,
-                execution_time.mlp_layer_down_proj_execution_time,
-            )
-            self._push_metric(
-                OperationMetrics.MLP_DOWN_PROJ_ALL_REDUCE,
-                batch_id,
-                execution_time.mlp_all_reduce_time,
-            )
-            self._push_metric(
-                OperationMetrics.ATTN_PRE_PROJ,
-                batch_id,
-                execution_time.attention_pre_proj_time,
-            )
-            self._push_metric(
-                OperationMetrics.ATTN_POST_PROJ,
-                batch_id,
-                execution_time.attention_post_proj_time,
-            )
-            self._push_metric(
-                OperationMetrics.ATTN_POST_PROJ_ALL_REDUCE,
-                batch_id,
-                execution_time.attention_all_reduce_time,
-            )
-
-            if execution_time.attention_prefill_execution_time != 0:
-                self._push_metric(
-                    OperationMetrics.ATTN_PREFILL,
-                    batch_id,
-                    execution_time.attention_prefill_execution_time,
-                )
+        # the per layer times are identical across layers, so every operation is
+        # recorded once with the number of layers as its weight
+        num_layers = execution_time.num_layers
+        self._push_metric(
+            OperationMetrics.MLP_UP_PROJ,
+            batch_id,
+            execution_time.mlp_layer_up_proj_execution_time,
+            num_layers,
+        )
+        self._push_metric(
+            OperationMetrics.MLP_ACTIVATION,
+            batch_id,
+            execution_time.mlp_layer_act_execution_time,
+            num_layers,
+        )
+        self._push_metric(
+            OperationMetrics.MLP_DOWN_PROJ,
+            batch_id,
+            execution_time.mlp_layer_down_proj_execution_time,
+            num_layers,
+        )
+        self._push_metric(
+            OperationMetrics.MLP_DOWN_PROJ_ALL_REDUCE,
+            batch_id,
+            execution_time.mlp_all_reduce_time,
+            num_layers,
+        )
+        self._push_metric(
+            OperationMetrics.ATTN_PRE_PROJ,
+            batch_id,
+            execution_time.attention_pre_proj_time,
+            num_layers,
+        )
+        self._push_metric(
+            OperationMetrics.ATTN_POST_PROJ,
+            batch_id,
+            execution_time.attention_post_proj_time,
+            num_layers,
+        )
+        self._push_metric(
+            OperationMetrics.ATTN_POST_PROJ_ALL_REDUCE,
+            batch_id,
+            execution_time.attention_all_reduce_time,
+            num_layers,
+        )
 
-            if execution_time.attention_decode_execution_time != 0:
-                self._push_metric(
-                    OperationMetrics.ATTN_DECODE,
-                    batch_id,
-                    execution_time.attention_decode_execution_time,
-                )
-            self._push_metric(
-                OperationMetrics.ATTN_KV_CACHE_SAVE,
-                batch_id,
-                execution_time.attention_kv_cache_save_execution_time,
-            )
-            self._push_metric(
-                OperationMetrics.ATTN_ROPE,
-                batch_id,
-                execution_time.attention_rope_execution_time,
-            )
-            self._push_metric(
-                OperationMetrics.ADD, batch_id, execution_time.add_time * 2
-            )
+        if execution_time.attention_prefill_execution_time != 0:
             self._push_metric(
-                OperationMetrics.INPUT_LAYERNORM,
+                OperationMetrics.ATTN_PREFILL,
                 batch_id,
-                execution_time.attn_norm_time,
+                execution_time.attention_prefill_execution_time,
+                num_layers,
             )
+
+        if execution_time.attention_decode_execution_time != 0:
             self._push_metric(
-                OperationMetrics.POST_ATTENTION_LAYERNORM,
+                OperationMetrics.ATTN_DECODE,
                 batch_id,
-                execution_time.mlp_norm_time,
+                execution_time.attention_decode_execution_time,
+                num_layers,
             )
+        self._push_metric(
+            OperationMetrics.ATTN_KV_CACHE_SAVE,
+            batch_id,
+            execution_time.attention_kv_cache_save_execution_time,
+            num_layers,
+        )
+        self._push_metric(
+            OperationMetrics.ATTN_ROPE,
+            batch_id,
+            execution_time.attention_rope_execution_time,
+            num_layers,
+        )
+        self._push_metric(
+            OperationMetrics.ADD, batch_id, execution_time.add_time * 2, num_layers
+        )
+        self._push_metric(
+            OperationMetrics.INPUT_LAYERNORM,
+            batch_id,
+            execution_time.attn_norm_time,
+            num_layers,
+        )
+        self._push_metric(
+            OperationMetrics.POST_ATTENTION_LAYERNORM,
+            batch_id,
+            execution_time.mlp_norm_time,
+            num_layers,
+        )
 
         self._push_metric(
             OperationMetrics.PIPELINE_SEND_RECV,
@@ -817,5 +1104,6 @@ class MetricsStore:
     ) -> None:
         if not self._config.store_utilization_metrics:
             return
-        self._replica_busy_time[replica_id - 1][stage_id - 1].put(time, 0)
-        self._replica_mfu[replica_id - 1][stage_id - 1].put(time, 0)
+        replica_idx = self._replica_indices[replica_id]
+        self._replica_busy_time[replica_idx][stage_id].put(time, 0)
+        self._replica_mfu[replica_idx][stage_id].put(time, 0)
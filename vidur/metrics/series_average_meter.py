@@ -1,8 +1,7 @@
 import json
 
-import wandb
-
 from vidur.logger import init_logger
+from vidur.metrics.utils import get_wandb_run
 
 logger = init_logger(__name__)
 
@@ -68,11 +67,18 @@ class SeriesAverageMeter:
         data_y = last_data_y + data_y_delta
         self.put(data_x, data_y)
 
+    @property
+    def weighted_mean(self) -> float:
+        if self._denom_sum == 0:
+            return None
+
+        return self._numer_sum / self._denom_sum
+
     def print_stats(self, name: str, path: str) -> None:
         if self._denom_sum == 0:
             return
 
-        weighted_mean = self._numer_sum / self._denom_sum
+        weighted_mean = self.weighted_mean
 
         logger.debug(
             f"{name}: {self._y_name} stats:"
@@ -90,7 +96,9 @@ class SeriesAverageMeter:
         with open(f"{path}/{name}.json", "w") as f:
             json.dump(stats_dict, f)
 
-        if wandb.run:
+        if get_wandb_run():
+            import wandb
+
             wandb.log(
                 {
                     f"{name}_min": self._min_y,
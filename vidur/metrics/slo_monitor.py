@@ -0,0 +1,115 @@
+import math
+from collections import deque
+from typing import Optional
+
+from ddsketch.ddsketch import DDSketch
+
+from vidur.entities import Request
+from vidur.metrics.constants import SLOVerdict
+
+
+class SLOMonitor:
+    """Decides a scheduling delay SLO while the simulation is still running.
+
+    The SLO is violated as soon as enough requests missed it that the final
+    quantile is above the SLO whatever the delays of the remaining requests
+    are, which needs the total number of requests. Independently, the mean
+    delay is tracked over windows of completed requests, and a run of growing
+    windows ending above the SLO is taken as a queue that grows without bound,
+    but only once the quantile estimated so far is above the SLO as well, so a
+    tail of slow requests alone does not fail a run that meets its quantile.
+    """
+
+    def __init__(
+        self,
+        slo_value: float,
+        slo_quantile: float,
+        window_size: int,
+        num_growth_windows: int,
+    ) -> None:
+        assert 0 <= slo_quantile <= 1
+        assert window_size > 0
+
+        self._slo_value = slo_value
+        self._slo_quantile = slo_quantile
+        self._window_size = window_size
+        self._num_growth_windows = num_growth_windows
+
+        self._sketch = DDSketch(relative_accuracy=0.001)
+        self._num_requests = None
+        self._max_num_violations = None
+        self._num_violations = 0
+
+        self._window_delay_sum = 0.0
+        self._window_num_requests = 0
+        self._window_means = deque(maxlen=max(num_growth_windows, 1))
+
+        self.verdict: Optional[SLOVerdict] = None
+
+    @property
+    def num_completed_requests(self) -> int:
+        return int(self._sketch.count)
+
+    @property
+    def quantile_estimate(self) -> Optional[float]:
+        return self._sketch.get_quantile_value(self._slo_quantile)
+
+    def set_num_requests(self, num_requests: int) -> None:
+        # the linearly interpolated quantile of n delays lies between the ones
+        # at positions floor and ceil of (n - 1) * q, it is above the SLO once
+        # every delay from floor onwards is. The bound does not decrease with
+        # n, so an upper bound on the number of requests keeps it sound
+        self._num_requests = num_requests
+        self._max_num_violations = (
+            num_requests - math.floor((num_requests - 1) * self._slo_quantile) - 1
+        )
+
+    def on_request_end(self, request: Request) -> None:
+        scheduling_delay = request.scheduling_delay
+        self._sketch.add(scheduling_delay)
+
+        if scheduling_delay > self._slo_value:
+            self._num_violations += 1
+            if (
+                self._max_num_violations is not None
+                and self._num_violations > self._max_num_violations
+            ):
+                self.verdict = SLOVerdict.VIOLATED
+                return
+
+        if not self._num_growth_windows:
+            return
+
+        self._window_delay_sum += scheduling_delay
+        self._window_num_requests += 1
+        if self._window_num_requests < self._window_size:
+            return
+
+        self._window_means.append(self._window_delay_sum / self._window_num_requests)
+        self._window_delay_sum = 0.0
+        self._window_num_requests = 0
+
+        if len(self._window_means) < self._num_growth_windows:
+            return
+
+        window_means = list(self._window_means)
+        if (
+            window_means[-1] > self._slo_value
+            and all(
+                earlier < later
+                for earlier, later in zip(window_means, window_means[1:])
+            )
+            and self.quantile_estimate > self._slo_value
+        ):
+            self.verdict = SLOVerdict.UNBOUNDED_QUEUE_GROWTH
+
+    def to_dict(self) -> dict:
+        return {
+            "verdict": self.verdict.value if self.verdict else None,
+            "slo_value": self._slo_value,
+            "slo_quantile": self._slo_quantile,
+            "num_requests": self._num_requests,
+            "num_completed_requests": self.num_completed_requests,
+            "num_violations": self._num_violations,
+            "quantile_estimate": self.quantile_estimate,
+        }
@@ -0,0 +1,11 @@
+import sys
+
+
+def get_wandb_run():
+    # a wandb run only exists once MetricsStore has imported wandb and called
+    # wandb.init, so there is no need to import it just to find out
+    wandb = sys.modules.get("wandb")
+    if wandb is None:
+        return None
+
+    return wandb.run
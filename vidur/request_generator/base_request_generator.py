@@ -1,6 +1,6 @@
 import json
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional
 
 from vidur.config import BaseRequestGeneratorConfig
 from vidur.entities import Request
@@ -18,3 +18,13 @@ class BaseRequestGenerator(ABC):
     def generate(self) -> List[Request]:
         requests = self.generate_requests()
         return requests
+
+    def get_num_requests(self) -> Optional[int]:
+        # an upper bound on the number of requests generated, if it is known
+        # without generating them
+        return None
+
+    def generate_stream(self) -> Iterator[Request]:
+        # yields requests in arrival order, generators that can produce
+        # requests lazily should override this
+        yield from sorted(self.generate(), key=lambda x: x.arrived_at)
@@ -0,0 +1,134 @@
+"""
+Preprocessed binary trace format for trace replay.
+
+A columnar trace is a directory holding one `.npy` file per request column and a
+`header.json` recording the scale factors that were applied while converting the
+source csv. Columns are memory-mapped on load, so concurrent simulator processes
+replaying the same trace share the page cache instead of each parsing the csv.
+
+Raw columnar traces keep the token counts of the csv as they are, for the trace
+request length generator, which scales and clips them itself. Their arrival
+times are optional, as length traces have none.
+"""
+
+import json
+import os
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLUMNAR_TRACE_FORMAT_VERSION = 1
+COLUMNAR_TRACE_HEADER_FILE = "header.json"
+COLUMNAR_TRACE_COLUMNS = {
+    "arrived_at": np.float64,
+    "num_prefill_tokens": np.int64,
+    "num_decode_tokens": np.int64,
+}
+# columns that raw traces can do without
+COLUMNAR_TRACE_OPTIONAL_COLUMNS = ("arrived_at",)
+# header keys that have to match the replay config for the columns to be reused
+COLUMNAR_TRACE_SCALING_KEYS = (
+    "prefill_scale_factor",
+    "decode_scale_factor",
+    "time_scale_factor",
+    "max_tokens",
+)
+
+
+def is_columnar_trace(trace_path: str) -> bool:
+    return os.path.isfile(os.path.join(trace_path, COLUMNAR_TRACE_HEADER_FILE))
+
+
+def is_raw_columnar_trace(header: Dict[str, Any]) -> bool:
+    return header.get("is_raw", False)
+
+
+def process_trace_df(
+    trace_df: pd.DataFrame,
+    prefill_scale_factor: float,
+    decode_scale_factor: float,
+    time_scale_factor: float,
+    max_tokens: int,
+) -> pd.DataFrame:
+    # scale prefill and decode tokens
+    trace_df["num_prefill_tokens"] = (
+        trace_df["num_prefill_tokens"] * prefill_scale_factor
+    )
+    trace_df["num_decode_tokens"] = trace_df["num_decode_tokens"] * decode_scale_factor
+
+    # make sure all the prefill and decode counts are integers
+    trace_df["num_prefill_tokens"] = trace_df["num_prefill_tokens"].astype(int)
+    trace_df["num_decode_tokens"] = trace_df["num_decode_tokens"].astype(int)
+
+    # make sure that there is at least one prefill and decode token
+    trace_df["num_prefill_tokens"] = trace_df["num_prefill_tokens"].clip(lower=1)
+    trace_df["num_decode_tokens"] = trace_df["num_decode_tokens"].clip(lower=1)
+
+    # make sure the total does not exceed the max tokens, adjust the prefill tokens if needed
+    total_tokens = trace_df["num_prefill_tokens"] + trace_df["num_decode_tokens"]
+    diff_tokens = total_tokens - max_tokens
+    diff_tokens = diff_tokens.clip(lower=0)
+    trace_df["num_prefill_tokens"] = trace_df["num_prefill_tokens"] - diff_tokens
+
+    assert (
+        trace_df["num_prefill_tokens"] + trace_df["num_decode_tokens"] <= max_tokens
+    ).all()
+
+    # rescale the time to change QPS
+    trace_df["arrived_at"] = trace_df["arrived_at"] * time_scale_factor
+
+    return trace_df
+
+
+def write_columnar_trace(
+    trace_df: pd.DataFrame, output_dir: str, header: Dict[str, Any]
+) -> None:
+    os.makedirs(output_dir, exist_ok=True)
+
+    columns = [
+        column
+        for column in COLUMNAR_TRACE_COLUMNS
+        if column in trace_df or column not in COLUMNAR_TRACE_OPTIONAL_COLUMNS
+    ]
+    for column in columns:
+        np.save(
+            os.path.join(output_dir, f"{column}.npy"),
+            trace_df[column].to_numpy(dtype=COLUMNAR_TRACE_COLUMNS[column]),
+        )
+
+    header = {
+        **header,
+        "format_version": COLUMNAR_TRACE_FORMAT_VERSION,
+        "num_requests": len(trace_df),
+        "columns": columns,
+    }
+    # write the header last, a directory without one is not a valid trace
+    with open(os.path.join(output_dir, COLUMNAR_TRACE_HEADER_FILE), "w") as f:
+        json.dump(header, f, indent=4)
+
+
+def load_columnar_trace(
+    trace_path: str,
+) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    with open(os.path.join(trace_path, COLUMNAR_TRACE_HEADER_FILE)) as f:
+        header = json.load(f)
+
+    if header.get("format_version") != COLUMNAR_TRACE_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported columnar trace format version {header.get('format_version')} in {trace_path}"
+        )
+
+    # traces written before raw traces were added have every column
+    columns = {
+        column: np.load(os.path.join(trace_path, f"{column}.npy"), mmap_mode="r")
+        for column in header.get("columns", COLUMNAR_TRACE_COLUMNS)
+    }
+
+    for column, values in columns.items():
+        if len(values) != header["num_requests"]:
+            raise ValueError(
+                f"Column {column} of {trace_path} has {len(values)} rows, expected {header['num_requests']}"
+            )
+
+    return header, columns
@@ -0,0 +1,58 @@
+import argparse
+
+import pandas as pd
+
+from vidur.logger import init_logger
+from vidur.request_generator.columnar_trace import (
+    process_trace_df,
+    write_columnar_trace,
+)
+
+logger = init_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a trace csv into the memory-mapped columnar trace format."
+    )
+    parser.add_argument("--input-file", type=str, required=True)
+    parser.add_argument("--output-dir", type=str, required=True)
+    parser.add_argument("--prefill-scale-factor", type=float, default=1.0)
+    parser.add_argument("--decode-scale-factor", type=float, default=1.0)
+    parser.add_argument("--time-scale-factor", type=float, default=1.0)
+    parser.add_argument("--max-tokens", type=int, default=4096)
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Keep the token counts unscaled and unclipped, for the trace request length generator",
+    )
+    args = parser.parse_args()
+
+    trace_df = pd.read_csv(args.input_file)
+    if args.raw:
+        header = {"source_file": args.input_file, "is_raw": True}
+    else:
+        trace_df = process_trace_df(
+            trace_df,
+            args.prefill_scale_factor,
+            args.decode_scale_factor,
+            args.time_scale_factor,
+            args.max_tokens,
+        )
+        header = {
+            "source_file": args.input_file,
+            "prefill_scale_factor": args.prefill_scale_factor,
+            "decode_scale_factor": args.decode_scale_factor,
+            "time_scale_factor": args.time_scale_factor,
+            "max_tokens": args.max_tokens,
+        }
+
+    write_columnar_trace(trace_df, args.output_dir, header)
+
+    logger.info(
+        f"Wrote columnar trace with {len(trace_df)} requests to {args.output_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
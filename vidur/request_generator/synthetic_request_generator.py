@@ -1,4 +1,5 @@
-from typing import List
+from itertools import islice
+from typing import Iterator, List, Optional
 
 from vidur.config import SyntheticRequestGeneratorConfig
 from vidur.entities import Request
@@ -10,7 +11,9 @@ from vidur.request_generator.request_length_generator_registry import (
     RequestLengthGeneratorRegistry,
 )
 from vidur.types import RequestIntervalGeneratorType
-from vidur.utils.random import set_seeds
+from vidur.utils.random import get_rng_state, set_rng_state, set_seeds
+
+STREAM_CHUNK_SIZE = 4096
 
 
 class SyntheticRequestGenerator(BaseRequestGenerator):
@@ -80,7 +83,35 @@ class SyntheticRequestGenerator(BaseRequestGenerator):
 
         return requests
 
-    def generate_requests(self) -> List[Request]:
+    def _generate_request_stream(self) -> Iterator[Request]:
+        # same stopping rules as _generate_requests, requests are produced in
+        # arrival order since inter-request times are non-negative
+        current_time = 0
+        num_generated = 0
+
+        while True:
+            if self.config.duration is not None:
+                if current_time >= self.config.duration:
+                    return
+            elif self.config.num_requests is not None:
+                if num_generated >= self.config.num_requests:
+                    return
+
+            request = self._generate_next_request(current_time)
+            if request is None:
+                return
+            current_time = request.arrived_at
+            num_generated += 1
+
+            if (
+                self.config.duration is not None
+                and request.arrived_at >= self.config.duration
+            ):
+                return
+
+            yield request
+
+    def _check_config(self) -> None:
         assert (
             self.config.duration
             or self.config.num_requests
@@ -88,6 +119,37 @@ class SyntheticRequestGenerator(BaseRequestGenerator):
             == RequestIntervalGeneratorType.TRACE
         )
 
+    def get_num_requests(self) -> Optional[int]:
+        # a trace length generator can run out before num_requests
+        if self.config.duration is None:
+            return self.config.num_requests
+        return None
+
+    def generate_stream(self) -> Iterator[Request]:
+        self._check_config()
+
+        set_seeds(self.config.seed)
+        generator_rng_state = get_rng_state()
+        request_stream = self._generate_request_stream()
+
+        while True:
+            # draw requests in chunks under the generator's own rng state so that
+            # the arrival sequence does not depend on how the simulation consumes
+            # randomness in between (e.g. random global scheduling)
+            simulation_rng_state = get_rng_state()
+            set_rng_state(generator_rng_state)
+            requests = list(islice(request_stream, STREAM_CHUNK_SIZE))
+            generator_rng_state = get_rng_state()
+            set_rng_state(simulation_rng_state)
+
+            if not requests:
+                return
+
+            yield from requests
+
+    def generate_requests(self) -> List[Request]:
+        self._check_config()
+
         set_seeds(self.config.seed)
 
         requests = self._generate_requests()
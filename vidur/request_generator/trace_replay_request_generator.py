@@ -1,11 +1,19 @@
 import logging
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from vidur.config import TraceRequestGeneratorConfig
 from vidur.entities import Request
 from vidur.request_generator.base_request_generator import BaseRequestGenerator
+from vidur.request_generator.columnar_trace import (
+    COLUMNAR_TRACE_SCALING_KEYS,
+    is_columnar_trace,
+    is_raw_columnar_trace,
+    load_columnar_trace,
+    process_trace_df,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,62 +21,40 @@ logger = logging.getLogger(__name__)
 class TraceReplayRequestGenerator(BaseRequestGenerator):
     """
     Reads a trace csv file containing request arrival time, its prompt and completion token values to generate
-    inter-request times, number of tokens.
+    inter-request times, number of tokens. The trace file can also be a columnar trace directory produced by
+    `vidur.request_generator.convert_trace`, which is memory-mapped instead of parsed.
     """
 
     def __init__(self, config: TraceRequestGeneratorConfig):
         super().__init__(config)
 
-        # load into a pd dataframe
-        self.trace_df = pd.read_csv(config.trace_file)
-
-        # scale prefill and decode tokens
-        self.trace_df["num_prefill_tokens"] = (
-            self.trace_df["num_prefill_tokens"] * config.prefill_scale_factor
-        )
-        self.trace_df["num_decode_tokens"] = (
-            self.trace_df["num_decode_tokens"] * config.decode_scale_factor
-        )
-
-        # make sure all the prefill and decode counts are integers
-        self.trace_df["num_prefill_tokens"] = self.trace_df[
-            "num_prefill_tokens"
-        ].astype(int)
-        self.trace_df["num_decode_tokens"] = self.trace_df["num_decode_tokens"].astype(
-            int
-        )
+        if is_columnar_trace(config.trace_file):
+            self._load_columnar_trace()
+        else:
+            self._load_csv_trace()
 
-        # make sure that there is at least one prefill and decode token
-        self.trace_df["num_prefill_tokens"] = self.trace_df["num_prefill_tokens"].clip(
-            lower=1
-        )
-        self.trace_df["num_decode_tokens"] = self.trace_df["num_decode_tokens"].clip(
-            lower=1
+        logger.info(
+            f"Loaded trace file {config.trace_file} with {len(self._arrived_at)} requests"
         )
 
-        # make sure the total does not exceed the max tokens, adjust the prefill tokens if needed
-        total_tokens = (
-            self.trace_df["num_prefill_tokens"] + self.trace_df["num_decode_tokens"]
-        )
-        diff_tokens = total_tokens - config.max_tokens
-        diff_tokens = diff_tokens.clip(lower=0)
-        self.trace_df["num_prefill_tokens"] = (
-            self.trace_df["num_prefill_tokens"] - diff_tokens
+    def _load_csv_trace(self) -> None:
+        # load into a pd dataframe
+        self.trace_df = process_trace_df(
+            pd.read_csv(self.config.trace_file),
+            self.config.prefill_scale_factor,
+            self.config.decode_scale_factor,
+            self.config.time_scale_factor,
+            self.config.max_tokens,
         )
 
-        assert all(
-            self.trace_df["num_prefill_tokens"] + self.trace_df["num_decode_tokens"]
-            <= config.max_tokens
+        self._arrived_at = self.trace_df["arrived_at"].to_numpy(dtype=np.float64)
+        self._num_prefill_tokens = self.trace_df["num_prefill_tokens"].to_numpy(
+            dtype=np.int64
         )
-
-        # rescale the time to change QPS
-        self.trace_df["arrived_at"] = (
-            self.trace_df["arrived_at"] * config.time_scale_factor
+        self._num_decode_tokens = self.trace_df["num_decode_tokens"].to_numpy(
+            dtype=np.int64
         )
 
-        logger.info(
-            f"Loaded trace file {config.trace_file} with {len(self.trace_df)} requests"
-        )
         # compute pd ratio and log the 25, 50, 75, 90, 95, 99 percentiles
         pd_ratio = (
             self.trace_df["num_prefill_tokens"] / self.trace_df["num_decode_tokens"]
@@ -77,16 +63,74 @@ class TraceReplayRequestGenerator(BaseRequestGenerator):
             f"Prompt/decode token ratio stats\n:{pd_ratio.describe(percentiles=[0.25, 0.5, 0.75, 0.9, 0.95, 0.99])}"
         )
 
-    def generate_requests(self) -> List[Request]:
-        requests = []
+    def _load_columnar_trace(self) -> None:
+        header, columns = load_columnar_trace(self.config.trace_file)
 
-        for _, row in self.trace_df.iterrows():
-            request = Request(
-                arrived_at=row["arrived_at"],
-                num_prefill_tokens=row["num_prefill_tokens"],
-                num_decode_tokens=row["num_decode_tokens"],
+        if is_raw_columnar_trace(header) or "arrived_at" not in columns:
+            raise ValueError(
+                f"Columnar trace {self.config.trace_file} is a raw trace for the "
+                "trace request length generator. Re-run "
+                "vidur.request_generator.convert_trace without --raw to replay it."
             )
 
-            requests.append(request)
+        # scaling and clipping are baked into the columns at conversion time
+        mismatched_keys = [
+            key
+            for key in COLUMNAR_TRACE_SCALING_KEYS
+            if header[key] != getattr(self.config, key)
+        ]
+        if mismatched_keys:
+            raise ValueError(
+                f"Columnar trace {self.config.trace_file} was converted with "
+                + ", ".join(f"{key}={header[key]}" for key in mismatched_keys)
+                + " which does not match the trace request generator config. "
+                "Re-run vidur.request_generator.convert_trace with matching values."
+            )
+
+        self._arrived_at = columns["arrived_at"]
+        self._num_prefill_tokens = columns["num_prefill_tokens"]
+        self._num_decode_tokens = columns["num_decode_tokens"]
+
+    def _get_trace_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._arrived_at, self._num_prefill_tokens, self._num_decode_tokens
 
-        return requests
+    def get_num_requests(self) -> Optional[int]:
+        return len(self._arrived_at)
+
+    def generate_requests(self) -> List[Request]:
+        arrived_at, num_prefill_tokens, num_decode_tokens = self._get_trace_columns()
+
+        # tolist converts whole columns to python scalars in one pass, which is
+        # much cheaper than materializing a pandas Series per row
+        return [
+            Request(
+                arrived_at=request_arrived_at,
+                num_prefill_tokens=request_num_prefill_tokens,
+                num_decode_tokens=request_num_decode_tokens,
+            )
+            for (
+                request_arrived_at,
+                request_num_prefill_tokens,
+                request_num_decode_tokens,
+            ) in zip(
+                arrived_at.tolist(),
+                num_prefill_tokens.tolist(),
+                num_decode_tokens.tolist(),
+            )
+        ]
+
+    def generate_stream(self) -> Iterator[Request]:
+        arrived_at, num_prefill_tokens, num_decode_tokens = self._get_trace_columns()
+
+        if np.any(np.diff(arrived_at) < 0):
+            order = np.argsort(arrived_at, kind="stable")
+            arrived_at = arrived_at[order]
+            num_prefill_tokens = num_prefill_tokens[order]
+            num_decode_tokens = num_decode_tokens[order]
+
+        for index in range(len(arrived_at)):
+            yield Request(
+                arrived_at=float(arrived_at[index]),
+                num_prefill_tokens=int(num_prefill_tokens[index]),
+                num_decode_tokens=int(num_decode_tokens[index]),
+            )
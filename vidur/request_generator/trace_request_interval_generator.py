@@ -6,6 +6,7 @@ from vidur.config import TraceRequestIntervalGeneratorConfig
 from vidur.request_generator.base_request_interval_generator import (
     BaseRequestIntervalGenerator,
 )
+from vidur.request_generator.columnar_trace import is_columnar_trace
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,14 @@ class TraceRequestIntervalGenerator(BaseRequestIntervalGenerator):
     def __init__(self, config: TraceRequestIntervalGeneratorConfig):
         super().__init__(config)
 
+        # columnar traces hold arrival offsets in seconds rather than the
+        # timestamps that start_time and end_time select from
+        if is_columnar_trace(config.trace_file):
+            raise ValueError(
+                f"{config.trace_file} is a columnar trace, which the trace request "
+                "interval generator does not read. Pass the source csv instead."
+            )
+
         # load into a pd dataframe
         self.trace_df = pd.read_csv(config.trace_file)
 
@@ -8,16 +8,29 @@ from vidur.config import TraceRequestLengthGeneratorConfig
 from vidur.request_generator.base_request_length_generator import (
     BaseRequestLengthGenerator,
 )
+from vidur.request_generator.columnar_trace import (
+    is_columnar_trace,
+    is_raw_columnar_trace,
+    load_columnar_trace,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class TraceRequestLengthGenerator(BaseRequestLengthGenerator):
+    """
+    Samples request lengths from a trace csv file, or from a raw columnar trace
+    directory produced by `vidur.request_generator.convert_trace --raw`, which is
+    memory-mapped instead of parsed.
+    """
 
     def __init__(self, config: TraceRequestLengthGeneratorConfig):
         super().__init__(config)
 
-        self.trace_df = pd.read_csv(config.trace_file)
+        if is_columnar_trace(config.trace_file):
+            self.trace_df = self._load_columnar_trace_df()
+        else:
+            self.trace_df = pd.read_csv(config.trace_file)
 
         # scale prefill and decode tokens
         self.trace_df["num_prefill_tokens"] = (
@@ -87,6 +100,24 @@ class TraceRequestLengthGenerator(BaseRequestLengthGenerator):
         self.trace_df = self.trace_df.sample(frac=1, random_state=self.config.seed)
         self.next_request_idx = 0
 
+    def _load_columnar_trace_df(self) -> pd.DataFrame:
+        header, columns = load_columnar_trace(self.config.trace_file)
+
+        # the scaling and clipping below need the token counts of the csv
+        if not is_raw_columnar_trace(header):
+            raise ValueError(
+                f"Columnar trace {self.config.trace_file} was scaled and clipped for "
+                "trace replay. Re-run vidur.request_generator.convert_trace with --raw "
+                "to sample request lengths from it."
+            )
+
+        return pd.DataFrame(
+            {
+                "num_prefill_tokens": columns["num_prefill_tokens"],
+                "num_decode_tokens": columns["num_decode_tokens"],
+            }
+        )
+
     def get_next_num_tokens(self) -> Tuple[float, float]:
         if self.next_request_idx >= len(self.trace_df):
             return None, None
@@ -0,0 +1,48 @@
+from abc import abstractmethod
+from typing import List, Tuple
+
+from vidur.entities import Batch, Request
+from vidur.logger import init_logger
+from vidur.scheduler.global_scheduler.base_global_scheduler import BaseGlobalScheduler
+from vidur.scheduler.utils.replica_cost_tracker import ReplicaCostTracker
+
+logger = init_logger(__name__)
+
+
+class BaseCostBalancedGlobalScheduler(BaseGlobalScheduler):
+    """
+    Assign each request to the replica with the least outstanding token cost
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        prefill_weight, decode_weight = self._get_cost_weights()
+        self._cost_tracker = ReplicaCostTracker(
+            self._replica_schedulers.keys(), prefill_weight, decode_weight
+        )
+
+        logger.debug(
+            f"Initialized {self.__class__.__name__} with {self._num_replicas} replicas"
+            f" and cost weights ({prefill_weight}, {decode_weight})"
+        )
+
+    @abstractmethod
+    def _get_cost_weights(self) -> Tuple[float, float]:
+        pass
+
+    def on_batch_end(self, batch: Batch) -> None:
+        self._cost_tracker.on_batch_end(batch)
+
+    def schedule(self) -> List[Tuple[int, Request]]:
+        self.sort_requests()
+
+        request_mapping = []
+        for request in self._request_queue:
+            replica_id = self._cost_tracker.get_min_cost_replica_id()
+            self._cost_tracker.add_request(replica_id, request)
+            request_mapping.append((replica_id, request))
+        self._request_queue = []
+
+        logger.debug(f"Assigned {len(request_mapping)} requests by token cost")
+        return request_mapping
@@ -1,12 +1,17 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple
 
 from vidur.config import SimulationConfig
-from vidur.entities import Replica, Request
-from vidur.execution_time_predictor import ExecutionTimePredictorRegistry
+from vidur.entities import Batch, Replica, Request
+from vidur.execution_time_predictor import (
+    BaseExecutionTimePredictor,
+    ExecutionTimePredictorPool,
+)
 from vidur.scheduler.replica_scheduler.replica_scheduler_registry import (
     ReplicaSchedulerRegistry,
 )
+from vidur.scheduler.utils.replica_load_index import ReplicaLoadIndex
 
 
 class BaseGlobalScheduler(ABC):
@@ -16,17 +21,8 @@ class BaseGlobalScheduler(ABC):
 
         self._num_replicas = len(self._replicas)
 
-        execution_time_predictors = {
-            replica_id : ExecutionTimePredictorRegistry.get(
-                config.execution_time_predictor_config.get_type(),
-                predictor_config=config.execution_time_predictor_config,
-                replica_config=config.cluster_config.replica_config,
-                replica_scheduler_config=config.cluster_config.replica_scheduler_config,
-                metrics_config=config.metrics_config,
-                model_config=replica._model_config
-            )
-            for replica_id, replica in replicas.items()
-        }
+        self._execution_time_predictors = self._get_execution_time_predictors()
+        self._replica_load_index = ReplicaLoadIndex(self._replicas.keys())
         self._replica_schedulers = {
             replica_id: ReplicaSchedulerRegistry.get(
                 config.cluster_config.replica_scheduler_config.get_type(),
@@ -35,18 +31,61 @@ class BaseGlobalScheduler(ABC):
                 request_generator_config=config.request_generator_config,
                 replica=replica,
                 num_stages=replica.num_pipeline_stages,
-                execution_time_predictor=execution_time_predictors[replica_id],
+                execution_time_predictor=self._execution_time_predictors[replica_id],
+                load_index=self._replica_load_index,
             )
             for replica_id, replica in replicas.items()
         }
         self._request_queue = []
 
+    def _get_execution_time_predictors(self) -> Dict[int, BaseExecutionTimePredictor]:
+        # replicas running the same model on the same hardware share a predictor
+        # from the pool, distinct predictors are created concurrently
+        replica_config = self._config.cluster_config.replica_config
+        predictor_args = {
+            replica_id: (
+                self._config.execution_time_predictor_config,
+                replica_config,
+                self._config.cluster_config.replica_scheduler_config,
+                self._config.metrics_config,
+                replica._model_config,
+            )
+            for replica_id, replica in self._replicas.items()
+        }
+        predictor_keys = {
+            replica_id: ExecutionTimePredictorPool.get_key(*args)
+            for replica_id, args in predictor_args.items()
+        }
+        unique_predictor_args = {
+            predictor_keys[replica_id]: args
+            for replica_id, args in predictor_args.items()
+        }
+
+        with ThreadPoolExecutor(max_workers=len(unique_predictor_args)) as executor:
+            predictors = dict(
+                zip(
+                    unique_predictor_args.keys(),
+                    executor.map(
+                        lambda args: ExecutionTimePredictorPool.get(*args),
+                        unique_predictor_args.values(),
+                    ),
+                )
+            )
+
+        return {
+            replica_id: predictors[predictor_key]
+            for replica_id, predictor_key in predictor_keys.items()
+        }
+
     def sort_requests(self) -> None:
         self._request_queue.sort(key=lambda request: request._arrived_at)
 
     def add_request(self, request: Request) -> None:
         self._request_queue.append(request)
 
+    def on_batch_end(self, batch: Batch) -> None:
+        pass
+
     def get_replica_scheduler(self, replica_id: int):
         return self._replica_schedulers[replica_id]
 
@@ -3,6 +3,9 @@ from vidur.scheduler.global_scheduler.lor_batched_global_scheduler import LORBat
 from vidur.scheduler.global_scheduler.input_global_scheduler import InputGlobalScheduler
 from vidur.scheduler.global_scheduler.output_global_scheduler import OutputGlobalScheduler
 from vidur.scheduler.global_scheduler.combined_global_scheduler import CombinedGlobalScheduler
+from vidur.scheduler.global_scheduler.predicted_completion_time_global_scheduler import (
+    PredictedCompletionTimeGlobalScheduler,
+)
 from vidur.scheduler.global_scheduler.random_global_scheduler import (
     RandomGlobalScheduler,
 )
@@ -25,4 +28,8 @@ GlobalSchedulerRegistry.register(GlobalSchedulerType.LOR, LORGlobalScheduler)
 GlobalSchedulerRegistry.register(GlobalSchedulerType.LOR_BATCHED, LORBatchedGlobalScheduler)
 GlobalSchedulerRegistry.register(GlobalSchedulerType.INPUT_BALANCE, InputGlobalScheduler)
 GlobalSchedulerRegistry.register(GlobalSchedulerType.OUTPUT_BALANCE, OutputGlobalScheduler)
-GlobalSchedulerRegistry.register(GlobalSchedulerType.COMBINED_BALANCED, CombinedGlobalScheduler)
\ No newline at end of file
+GlobalSchedulerRegistry.register(GlobalSchedulerType.COMBINED_BALANCED, CombinedGlobalScheduler)
+GlobalSchedulerRegistry.register(
+    GlobalSchedulerType.PREDICTED_COMPLETION_TIME,
+    PredictedCompletionTimeGlobalScheduler,
+)
\ No newline at end of file
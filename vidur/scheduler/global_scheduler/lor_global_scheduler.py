@@ -13,18 +13,16 @@ class LORGlobalScheduler(BaseGlobalScheduler):
         self.sort_requests()
 
         request_mapping = []
-        # keep a map of replica_id -> replica_scheduler
-        # this is used to find the replica with the least outstanding requests
-        pending_requests_map = {
-            replica_scheduler.replica_id: replica_scheduler.num_pending_requests
-            for replica_scheduler in self._replica_schedulers.values()
-        }
-
-        # using a very simple implementation here, to keep wiring simple
-        while self._request_queue:
-            request = self._request_queue.pop(0)
-            replica_id = min(pending_requests_map.items(), key=lambda x: x[1])[0]
-            pending_requests_map[replica_id] += 1
+        # the load index tracks outstanding requests per replica, bump it for
+        # every request routed in this round so that a burst is spread out
+        for request in self._request_queue:
+            replica_id = self._replica_load_index.get_min_replica_id()
+            self._replica_load_index.add(replica_id, 1)
             request_mapping.append((replica_id, request))
+        self._request_queue = []
+
+        # the replica schedulers account for these requests once they are added
+        for replica_id, _ in request_mapping:
+            self._replica_load_index.add(replica_id, -1)
 
         return request_mapping
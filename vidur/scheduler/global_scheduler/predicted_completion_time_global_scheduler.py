@@ -0,0 +1,94 @@
+from typing import Dict, List, Tuple
+
+from vidur.entities import Batch, Request
+from vidur.logger import init_logger
+from vidur.scheduler.global_scheduler.base_global_scheduler import BaseGlobalScheduler
+from vidur.scheduler.utils.completion_time_estimator import CompletionTimeEstimator
+from vidur.scheduler.utils.replica_cost_tracker import ReplicaCostTracker
+
+logger = init_logger(__name__)
+
+
+class PredictedCompletionTimeGlobalScheduler(BaseGlobalScheduler):
+    """
+    Route each request to the replica predicted to complete it first.
+
+    Every replica carries the predicted execution time of the work assigned to
+    it and not yet processed, which is credited back as batches finish. Replicas
+    sharing an execution time predictor serve a request equally fast, so they
+    form a group whose least loaded replica is the only candidate. A request is
+    priced once per group and sent to the group minimising outstanding time plus
+    its own execution time.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        replica_ids_by_predictor: Dict[int, List[int]] = {}
+        for replica_id, predictor in self._execution_time_predictors.items():
+            replica_ids_by_predictor.setdefault(id(predictor), []).append(replica_id)
+
+        self._estimators: List[CompletionTimeEstimator] = []
+        self._cost_trackers: List[ReplicaCostTracker] = []
+        self._replica_group_ids: Dict[int, int] = {}
+
+        for group_id, replica_ids in enumerate(replica_ids_by_predictor.values()):
+            replica_scheduler = self._replica_schedulers[replica_ids[0]]
+            self._estimators.append(
+                CompletionTimeEstimator(
+                    self._execution_time_predictors[replica_ids[0]],
+                    self._config.execution_time_predictor_config,
+                    self._replicas[replica_ids[0]].num_pipeline_stages,
+                    replica_scheduler.max_batch_size,
+                )
+            )
+            self._cost_trackers.append(ReplicaCostTracker(replica_ids, 0, 0))
+            for replica_id in replica_ids:
+                self._replica_group_ids[replica_id] = group_id
+
+        logger.debug(
+            f"Initialized predicted completion time global scheduler with"
+            f" {self._num_replicas} replicas in {len(self._estimators)} groups"
+        )
+
+    def on_batch_end(self, batch: Batch) -> None:
+        group_id = self._replica_group_ids[batch.replica_id]
+        self._cost_trackers[group_id].on_batch_end(batch)
+
+    def _get_request_weights(
+        self, estimator: CompletionTimeEstimator, request: Request
+    ) -> Tuple[float, float]:
+        num_prefill_tokens, num_decode_tokens = request.size
+        prefill_time = estimator.get_prefill_time(num_prefill_tokens)
+        # decode tokens see the KV cache grow, price them at its average size
+        decode_time_per_token = estimator.get_decode_time_per_token(
+            num_prefill_tokens + num_decode_tokens // 2
+        )
+        return prefill_time / max(num_prefill_tokens, 1), decode_time_per_token
+
+    def schedule(self) -> List[Tuple[int, Request]]:
+        self.sort_requests()
+
+        request_mapping = []
+        for request in self._request_queue:
+            best_completion_time = None
+            for estimator, cost_tracker in zip(self._estimators, self._cost_trackers):
+                replica_id = cost_tracker.get_min_cost_replica_id()
+                weights = self._get_request_weights(estimator, request)
+                outstanding_time = cost_tracker.get_cost(replica_id)
+                request_time = cost_tracker.get_request_cost(request, *weights)
+                completion_time = outstanding_time + request_time
+
+                if best_completion_time is None or (
+                    completion_time < best_completion_time
+                ):
+                    best_completion_time = completion_time
+                    best_replica_id = replica_id
+                    best_cost_tracker = cost_tracker
+                    best_weights = weights
+
+            best_cost_tracker.add_request(best_replica_id, request, *best_weights)
+            request_mapping.append((best_replica_id, request))
+        self._request_queue = []
+
+        return request_mapping
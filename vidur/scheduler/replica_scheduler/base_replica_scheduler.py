@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
+from collections import deque
+from typing import List, Optional
 
 from vidur.config import (
     BaseReplicaSchedulerConfig,
@@ -11,6 +12,7 @@ from vidur.execution_time_predictor import BaseExecutionTimePredictor
 from vidur.logger import init_logger
 from vidur.scheduler.replica_stage_scheduler import ReplicaStageScheduler
 from vidur.scheduler.utils.memory_planner import MemoryPlanner
+from vidur.scheduler.utils.replica_load_index import ReplicaLoadIndex
 
 logger = init_logger(__name__)
 
@@ -24,12 +26,16 @@ class BaseReplicaScheduler(ABC):
         replica: Replica,
         num_stages: int,
         execution_time_predictor: BaseExecutionTimePredictor,
+        load_index: Optional[ReplicaLoadIndex] = None,
     ) -> None:
         self._config = replica_scheduler_config
         self._replica_config = replica_config
         self._request_generator_config = request_generator_config
         self._replica_id = replica.id
         self._num_stages = num_stages
+        # outstanding (queued or running) request count shared with the global
+        # scheduler
+        self._load_index = load_index
 
         self._max_blocks_per_sequence = (
             self._request_generator_config.max_tokens // self._config.block_size
@@ -37,8 +43,11 @@ class BaseReplicaScheduler(ABC):
 
         memory_planner = MemoryPlanner(self._replica_config, replica)
 
-        if not self._config.num_blocks:
-            self._config.num_blocks = (
+        # the scheduler config is shared by all replicas, which can run different
+        # models, so the planned block count is kept per replica scheduler
+        self._num_blocks = self._config.num_blocks
+        if not self._num_blocks:
+            self._num_blocks = (
                 self._max_blocks_per_sequence * memory_planner.get_max_request_slots()
             )
         self._max_batch_size = min(
@@ -50,7 +59,7 @@ class BaseReplicaScheduler(ABC):
             f"Obtained max batch size of {self._max_batch_size} for replica {self._replica_id}"
         )
 
-        self._request_queue = []
+        self._request_queue = deque()
         self._num_allocated_blocks = 0
         self._allocation_map = {}
 
@@ -72,13 +81,17 @@ class BaseReplicaScheduler(ABC):
     def replica_id(self) -> int:
         return self._replica_id
 
+    @property
+    def max_batch_size(self) -> int:
+        return self._max_batch_size
+
     @property
     def num_allocated_blocks(self) -> int:
         return self._num_allocated_blocks
 
     @property
     def memory_usage_percent(self) -> int:
-        return (self._num_allocated_blocks * 100) / self._config.num_blocks
+        return (self._num_allocated_blocks * 100) / self._num_blocks
 
     def is_empty(self) -> bool:
         return (
@@ -101,11 +114,14 @@ class BaseReplicaScheduler(ABC):
     def add_request(self, request: Request) -> None:
         self._request_queue.append(request)
 
+        if self._load_index is not None:
+            self._load_index.add(self._replica_id, 1)
+
     def get_replica_stage_scheduler(self, stage_id: int):
         return self._replica_stage_schedulers[stage_id]
 
     def can_allocate(self, num_blocks: int) -> bool:
-        return self._config.num_blocks - self._num_allocated_blocks >= num_blocks
+        return self._num_blocks - self._num_allocated_blocks >= num_blocks
 
     def allocate(self, request_id: int, num_blocks: int) -> None:
         self._num_allocated_blocks += num_blocks
@@ -114,7 +130,7 @@ class BaseReplicaScheduler(ABC):
         else:
             self._allocation_map[request_id] += num_blocks
 
-        assert self._num_allocated_blocks <= self._config.num_blocks
+        assert self._num_allocated_blocks <= self._num_blocks
 
     def free(self, *request_ids: List[int]) -> None:
         for request_id in request_ids:
@@ -126,8 +142,14 @@ class BaseReplicaScheduler(ABC):
     def free_batch(self, batch: Batch) -> None:
         self.free(*batch.request_ids)
 
-    @abstractmethod
     def on_batch_end(self, batch: Batch) -> None:
+        self._on_batch_end(batch)
+
+        if self._load_index is not None:
+            self._load_index.add(self._replica_id, -len(batch.completed_requests))
+
+    @abstractmethod
+    def _on_batch_end(self, batch: Batch) -> None:
         pass
 
     @abstractmethod
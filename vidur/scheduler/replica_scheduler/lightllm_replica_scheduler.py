@@ -1,4 +1,5 @@
-from typing import List, Tuple
+from collections import deque
+from typing import Deque, Tuple
 
 import numpy as np
 
@@ -12,7 +13,7 @@ class LightLLMReplicaScheduler(BaseReplicaScheduler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self._preempted_requests: List[Request] = []
+        self._preempted_requests: Deque[Request] = deque()
         self._num_running_batches = 0
         self._max_micro_batch_size = self._config.batch_size_cap // self._num_stages
         assert (
@@ -25,7 +26,7 @@ class LightLLMReplicaScheduler(BaseReplicaScheduler):
         self._cache_len_list = []
         self._num_waiting_iters = 0
 
-    def on_batch_end(self, batch: Batch) -> None:
+    def _on_batch_end(self, batch: Batch) -> None:
         self._num_running_batches -= 1
 
         for request in batch.requests:
@@ -61,7 +62,7 @@ class LightLLMReplicaScheduler(BaseReplicaScheduler):
 
         need_max_token_num = (left_out_len_array * size_array + cum_run_len_array).max()
 
-        return need_max_token_num < self._config.num_blocks
+        return need_max_token_num < self._num_blocks
 
     def _allocate_request(self, request: Request) -> None:
         if request.id not in self._allocation_map:
@@ -96,7 +97,7 @@ class LightLLMReplicaScheduler(BaseReplicaScheduler):
             if not self._can_allocate_request(request):
                 break
 
-            request = self._request_queue.pop(0)
+            request = self._request_queue.popleft()
 
             self._allocate_request(request)
             requests.append(request)
@@ -116,7 +117,7 @@ class LightLLMReplicaScheduler(BaseReplicaScheduler):
         while self._preempted_requests:
             assert len(requests) < self._max_micro_batch_size
 
-            request = self._preempted_requests.pop(0)
+            request = self._preempted_requests.popleft()
 
             assert self.can_allocate(1)
             self._allocate_request(request)
@@ -4,6 +4,7 @@ from vidur.entities.batch import Batch, Request
 from vidur.scheduler.replica_scheduler.base_replica_scheduler import (
     BaseReplicaScheduler,
 )
+from vidur.scheduler.utils.preempted_request_queue import PreemptedRequestQueue
 
 
 class SarathiReplicaScheduler(BaseReplicaScheduler):
@@ -12,12 +13,12 @@ class SarathiReplicaScheduler(BaseReplicaScheduler):
 
         # sarathi config
         self._num_running_batches = 0
-        self._preempted_requests = []
+        self._preempted_requests = PreemptedRequestQueue()
         # For vLLM and its derivatives, we only need to set a loose max batch size
         # Memory requirements are handled explicitly by the scheduler
         self._max_micro_batch_size = self._config.batch_size_cap // self._num_stages
         self._watermark_blocks = int(
-            self._config.watermark_blocks_fraction * self._config.num_blocks
+            self._config.watermark_blocks_fraction * self._num_blocks
         )
 
     def _can_allocate_request(self, request: Request) -> bool:
@@ -27,14 +28,14 @@ class SarathiReplicaScheduler(BaseReplicaScheduler):
                 request.num_prefill_tokens / self._config.block_size
             )
             return (
-                self._config.num_blocks
+                self._num_blocks
                 - self._num_allocated_blocks
                 - num_required_blocks
                 >= self._watermark_blocks
             )
 
         # vllm requires at least one block to be available
-        return self._config.num_blocks - self._num_allocated_blocks >= 1
+        return self._num_blocks - self._num_allocated_blocks >= 1
 
     def _allocate_request(self, request: Request) -> None:
         if request.id not in self._allocation_map:
@@ -57,14 +58,14 @@ class SarathiReplicaScheduler(BaseReplicaScheduler):
 
         self.allocate(request.id, 1)
 
-    def on_batch_end(self, batch: Batch) -> None:
+    def _on_batch_end(self, batch: Batch) -> None:
         self._num_running_batches -= 1
 
         for request in batch.requests:
             if request.completed:
                 self.free(request.id)
             else:
-                self._preempted_requests.append(request)
+                self._preempted_requests.push(request)
 
     def _get_request_next_num_tokens(
         self, request: Request, batch_contains_prefill: bool, num_batch_tokens: int
@@ -97,7 +98,7 @@ class SarathiReplicaScheduler(BaseReplicaScheduler):
             if len(requests) == self._max_micro_batch_size:
                 break
 
-            request = self._preempted_requests.pop(0)
+            request = self._preempted_requests.pop_first()
 
             if not request.is_prefill_complete:
                 running_prefills.append(request)
@@ -113,14 +114,14 @@ class SarathiReplicaScheduler(BaseReplicaScheduler):
 
             while not self._can_allocate_request(request):
                 if self._preempted_requests:
-                    victim_request = self._preempted_requests.pop(-1)
+                    victim_request = self._preempted_requests.pop_last()
                     victim_request.restart()
                     self.free(victim_request.id)
-                    self._request_queue = [victim_request] + self._request_queue
+                    self._request_queue.appendleft(victim_request)
                 else:
                     request.restart()
                     self.free(request.id)
-                    self._request_queue = [request] + self._request_queue
+                    self._request_queue.appendleft(request)
                     break
             else:
                 self._allocate_request(request)
@@ -145,12 +146,10 @@ class SarathiReplicaScheduler(BaseReplicaScheduler):
             requests.append(request)
             num_tokens.append(next_num_tokens)
 
-        # re-add the skipped requests, but make sure that we add them to the
-        # front of the queue so that they are scheduled first and we maintain FIFO ordering
-        self._preempted_requests = skipped_requests + self._preempted_requests
-        self._preempted_requests = sorted(
-            self._preempted_requests, key=lambda req: req.arrived_at
-        )
+        # re-add the skipped requests, the queue is ordered by arrival time so
+        # they are scheduled first and we maintain FIFO ordering
+        for request in skipped_requests:
+            self._preempted_requests.push(request)
         skipped_requests = []
 
         while self._request_queue:
@@ -170,7 +169,7 @@ class SarathiReplicaScheduler(BaseReplicaScheduler):
             if next_num_tokens == 0:
                 break
 
-            request = self._request_queue.pop(0)
+            request = self._request_queue.popleft()
 
             self._allocate_request(request)
 
@@ -1,33 +1,33 @@
 from math import ceil
-from typing import List
 
 from vidur.entities.batch import Batch, Request
 from vidur.scheduler.replica_scheduler.base_replica_scheduler import (
     BaseReplicaScheduler,
 )
+from vidur.scheduler.utils.preempted_request_queue import PreemptedRequestQueue
 
 
 class VLLMReplicaScheduler(BaseReplicaScheduler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self._preempted_requests: List[Request] = []
+        self._preempted_requests = PreemptedRequestQueue()
         self._num_running_batches = 0
         # For vLLM and its derivatives, we only need to set a loose max batch size
         # Memory requirements are handled explicitly by the scheduler
         self._max_micro_batch_size = self._config.batch_size_cap // self._num_stages
         self._watermark_blocks = int(
-            self._config.watermark_blocks_fraction * self._config.num_blocks
+            self._config.watermark_blocks_fraction * self._num_blocks
         )
 
-    def on_batch_end(self, batch: Batch) -> None:
+    def _on_batch_end(self, batch: Batch) -> None:
         self._num_running_batches -= 1
 
         for request in batch.requests:
             if request.completed:
                 self.free(request.id)
             else:
-                self._preempted_requests.append(request)
+                self._preempted_requests.push(request)
 
     def _can_allocate_request(self, request: Request) -> bool:
         if request.id not in self._allocation_map:
@@ -36,14 +36,14 @@ class VLLMReplicaScheduler(BaseReplicaScheduler):
                 (request.num_prefill_tokens) / self._config.block_size
             )
             return (
-                self._config.num_blocks
+                self._num_blocks
                 - self._num_allocated_blocks
                 - num_required_blocks
                 >= self._watermark_blocks
             )
 
         # vllm requires at least one block to be available
-        return self._config.num_blocks - self._num_allocated_blocks >= 1
+        return self._num_blocks - self._num_allocated_blocks >= 1
 
     def _allocate_request(self, request: Request) -> None:
         if request.id not in self._allocation_map:
@@ -89,7 +89,7 @@ class VLLMReplicaScheduler(BaseReplicaScheduler):
             if len(requests) == self._max_micro_batch_size:
                 break
 
-            request = self._request_queue.pop(0)
+            request = self._request_queue.popleft()
 
             self._allocate_request(request)
             requests.append(request)
@@ -99,25 +99,24 @@ class VLLMReplicaScheduler(BaseReplicaScheduler):
         if requests:
             return Batch(self._replica_id, requests, num_tokens)
 
-        # Safer to sort preempted_requests to maintain FIFO order
-        self._preempted_requests.sort(key=lambda r: r.arrived_at)
+        # preempted_requests pop in arrival order to maintain FIFO order
         # all preempted_requests will have prefill completed
         while self._preempted_requests:
             if len(requests) == self._max_micro_batch_size:
                 break
 
-            request = self._preempted_requests.pop(0)
+            request = self._preempted_requests.pop_first()
 
             while not self._can_allocate_request(request):
                 if self._preempted_requests:
-                    victim_request = self._preempted_requests.pop(-1)
+                    victim_request = self._preempted_requests.pop_last()
                     victim_request.restart()
                     self.free(victim_request.id)
-                    self._request_queue = [victim_request] + self._request_queue
+                    self._request_queue.appendleft(victim_request)
                 else:
                     request.restart()
                     self.free(request.id)
-                    self._request_queue = [request] + self._request_queue
+                    self._request_queue.appendleft(request)
                     break
             else:
                 self._allocate_request(request)
@@ -0,0 +1,108 @@
+from typing import Dict, List
+
+from vidur.config import BaseExecutionTimePredictorConfig
+from vidur.execution_time_predictor import BaseExecutionTimePredictor
+
+
+class _ProbeRequest:
+    # the subset of the request interface read by the execution time predictors,
+    # real requests would consume request ids
+    def __init__(self, is_prefill_complete: bool, num_processed_tokens: int) -> None:
+        self._is_prefill_complete = is_prefill_complete
+        self.num_processed_tokens = num_processed_tokens
+
+
+class _ProbeBatch:
+    # the subset of the batch interface read by the execution time predictors,
+    # real batches would consume batch ids
+    def __init__(self, requests: List[_ProbeRequest], num_tokens: List[int]) -> None:
+        self.requests = requests
+        self.num_tokens = num_tokens
+        self.size = len(requests)
+        self._total_num_tokens_rounded = (sum(num_tokens) + 7) // 8 * 8
+
+
+class CompletionTimeEstimator:
+    """Estimates how long a replica needs to serve a request.
+
+    The prefill is priced as a single-request batch, chunked at the largest
+    prefill chunk the predictor covers. Decode tokens are priced as their share
+    of a full decode batch at the average KV cache size of the request, which
+    is what a loaded replica, the case where routing matters, runs. Estimates
+    are cached by token count, so the predictor is only queried for shapes that
+    have not been seen before.
+    """
+
+    def __init__(
+        self,
+        execution_time_predictor: BaseExecutionTimePredictor,
+        predictor_config: BaseExecutionTimePredictorConfig,
+        num_stages: int,
+        max_batch_size: int,
+    ) -> None:
+        self._execution_time_predictor = execution_time_predictor
+        self._num_stages = num_stages
+        self._max_prefill_chunk_size = (
+            predictor_config.prediction_max_prefill_chunk_size
+        )
+        self._max_kv_cache_size = predictor_config.prediction_max_tokens_per_request
+        self._kv_cache_granularity = predictor_config.kv_cache_prediction_granularity
+        self._decode_batch_size = max(
+            1, min(max_batch_size, predictor_config.prediction_max_batch_size)
+        )
+
+        self._prefill_times: Dict[int, float] = {}
+        self._decode_times: Dict[int, float] = {}
+
+    def _get_batch_time(self, batch: _ProbeBatch) -> float:
+        # a pass through the replica visits every pipeline stage
+        execution_time = self._execution_time_predictor.get_execution_time(batch, 0)
+        return execution_time.total_time * self._num_stages
+
+    def get_prefill_time(self, num_prefill_tokens: int) -> float:
+        prefill_time = self._prefill_times.get(num_prefill_tokens)
+        if prefill_time is not None:
+            return prefill_time
+
+        # the prediction tables do not cover KV caches beyond the max request size
+        num_tokens_to_prefill = min(num_prefill_tokens, self._max_kv_cache_size)
+
+        prefill_time = 0.0
+        num_processed_tokens = 0
+        while num_processed_tokens < num_tokens_to_prefill:
+            chunk_size = min(
+                self._max_prefill_chunk_size,
+                num_tokens_to_prefill - num_processed_tokens,
+            )
+            prefill_time += self._get_batch_time(
+                _ProbeBatch([_ProbeRequest(False, num_processed_tokens)], [chunk_size])
+            )
+            num_processed_tokens += chunk_size
+
+        self._prefill_times[num_prefill_tokens] = prefill_time
+        return prefill_time
+
+    def get_decode_time_per_token(self, kv_cache_size: int) -> float:
+        # snap to the granularity of the prediction tables and stay inside them
+        granularity = self._kv_cache_granularity
+        kv_cache_size = (kv_cache_size + granularity - 1) // granularity * granularity
+        kv_cache_size = min(
+            (self._max_kv_cache_size // granularity) * granularity,
+            max(granularity, kv_cache_size),
+        )
+
+        decode_time = self._decode_times.get(kv_cache_size)
+        if decode_time is not None:
+            return decode_time
+
+        batch = _ProbeBatch(
+            [
+                _ProbeRequest(True, kv_cache_size)
+                for _ in range(self._decode_batch_size)
+            ],
+            [1] * self._decode_batch_size,
+        )
+        decode_time = self._get_batch_time(batch) / self._decode_batch_size
+
+        self._decode_times[kv_cache_size] = decode_time
+        return decode_time
@@ -0,0 +1,75 @@
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Iterator
+
+from vidur.entities import Request
+
+
+class PreemptedRequestQueue:
+    """Preempted requests ordered by arrival time.
+
+    Schedulers resume the earliest arrival first and evict the latest arrival
+    when they run out of memory, so the queue keeps a min-heap and a max-heap
+    over the same entries. Entries popped from one heap are dropped lazily from
+    the other, which keeps both ends O(log n) without re-sorting on every
+    scheduling step. Ties on `arrived_at` are broken by request id. Requests
+    removed from the middle are dropped lazily from both heaps.
+    """
+
+    __slots__ = ("_min_heap", "_max_heap", "_live", "_seqs", "_counter")
+
+    def __init__(self):
+        self._min_heap = []
+        self._max_heap = []
+        self._live = set()
+        self._seqs = {}
+        self._counter = count()
+
+    def push(self, request: Request) -> None:
+        seq = next(self._counter)
+        heappush(self._min_heap, (request.arrived_at, request.id, seq, request))
+        heappush(self._max_heap, (-request.arrived_at, -request.id, seq, request))
+        self._live.add(seq)
+        self._seqs[request.id] = seq
+
+    def pop_first(self) -> Request:
+        """Removes and returns the request that arrived earliest."""
+        request = self._pop(self._min_heap)
+        self._maybe_compact(self._max_heap)
+        return request
+
+    def pop_last(self) -> Request:
+        """Removes and returns the request that arrived latest."""
+        request = self._pop(self._max_heap)
+        self._maybe_compact(self._min_heap)
+        return request
+
+    def remove(self, request: Request) -> None:
+        """Removes a queued request wherever it is in the arrival order."""
+        self._live.remove(self._seqs.pop(request.id))
+        self._maybe_compact(self._min_heap)
+        self._maybe_compact(self._max_heap)
+
+    def _pop(self, heap) -> Request:
+        while True:
+            _, _, seq, request = heappop(heap)
+            if seq in self._live:
+                self._live.remove(seq)
+                del self._seqs[request.id]
+                return request
+
+    def _maybe_compact(self, heap) -> None:
+        # popped entries linger in the opposite heap until they surface, so
+        # rebuild it once they outnumber the live ones
+        if len(heap) <= 2 * len(self._live) + 32:
+            return
+
+        heap[:] = [entry for entry in heap if entry[2] in self._live]
+        heapify(heap)
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __iter__(self) -> Iterator[Request]:
+        for entry in sorted(e for e in self._min_heap if e[2] in self._live):
+            yield entry[3]
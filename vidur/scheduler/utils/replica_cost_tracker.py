@@ -0,0 +1,117 @@
+from typing import Dict, Iterable, List, Optional
+
+from vidur.entities import Batch, Request
+from vidur.scheduler.utils.replica_load_index import ReplicaLoadIndex
+
+
+class ReplicaCostTracker:
+    """Outstanding token cost per replica.
+
+    A request costs `prefill_weight * num_prefill_tokens + decode_weight *
+    num_decode_tokens` when it is assigned to a replica. As batches finish,
+    the tokens processed for the first time are credited back, so the cost of
+    a replica reflects the work it still has to do. Tokens reprocessed after a
+    restart are not credited twice, and a completed request always releases
+    exactly the cost it was charged. Callers can override the weights per
+    request, e.g. to charge predicted execution times.
+    """
+
+    def __init__(
+        self,
+        replica_ids: Iterable[int],
+        prefill_weight: float,
+        decode_weight: float,
+    ) -> None:
+        self._load_index = ReplicaLoadIndex(replica_ids)
+        self._prefill_weight = prefill_weight
+        self._decode_weight = decode_weight
+        # request id -> [replica id, original prefill tokens, credited tokens,
+        # remaining cost, prefill weight, decode weight]
+        self._outstanding: Dict[int, List] = {}
+
+    @property
+    def num_outstanding_requests(self) -> int:
+        return len(self._outstanding)
+
+    def get_cost(self, replica_id: int) -> float:
+        return self._load_index.get_load(replica_id)
+
+    def get_min_cost_replica_id(self) -> int:
+        return self._load_index.get_min_replica_id()
+
+    def get_request_cost(
+        self,
+        request: Request,
+        prefill_weight: Optional[float] = None,
+        decode_weight: Optional[float] = None,
+    ) -> float:
+        if prefill_weight is None:
+            prefill_weight = self._prefill_weight
+        if decode_weight is None:
+            decode_weight = self._decode_weight
+
+        num_prefill_tokens, num_decode_tokens = request.size
+        return prefill_weight * num_prefill_tokens + decode_weight * num_decode_tokens
+
+    def add_request(
+        self,
+        replica_id: int,
+        request: Request,
+        prefill_weight: Optional[float] = None,
+        decode_weight: Optional[float] = None,
+    ) -> float:
+        if prefill_weight is None:
+            prefill_weight = self._prefill_weight
+        if decode_weight is None:
+            decode_weight = self._decode_weight
+
+        cost = self.get_request_cost(request, prefill_weight, decode_weight)
+        self._outstanding[request.id] = [
+            replica_id,
+            request.num_prefill_tokens,
+            0,
+            cost,
+            prefill_weight,
+            decode_weight,
+        ]
+        self._load_index.add(replica_id, cost)
+        return cost
+
+    def _get_credit(self, entry: List, num_processed_tokens: int) -> float:
+        _, num_prefill_tokens, start, _, prefill_weight, decode_weight = entry
+        end = num_processed_tokens
+
+        num_new_prefill_tokens = min(end, num_prefill_tokens) - min(
+            start, num_prefill_tokens
+        )
+        num_new_decode_tokens = max(end, num_prefill_tokens) - max(
+            start, num_prefill_tokens
+        )
+        return (
+            prefill_weight * num_new_prefill_tokens
+            + decode_weight * num_new_decode_tokens
+        )
+
+    def on_batch_end(self, batch: Batch) -> None:
+        for request in batch.requests:
+            entry = self._outstanding.get(request.id)
+            if entry is None:
+                continue
+
+            replica_id, _, num_credited_tokens, remaining_cost, _, _ = entry
+
+            if request.completed:
+                del self._outstanding[request.id]
+                self._load_index.add(replica_id, -remaining_cost)
+                continue
+
+            # after a restart the processed count starts over, only the tokens
+            # past the furthest point reached so far are new work
+            num_processed_tokens = request.num_processed_tokens
+            if num_processed_tokens <= num_credited_tokens:
+                continue
+
+            credit = min(remaining_cost, self._get_credit(entry, num_processed_tokens))
+            entry[2] = num_processed_tokens
+            entry[3] = remaining_cost - credit
+            self._load_index.add(replica_id, -credit)
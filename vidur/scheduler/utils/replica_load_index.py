@@ -0,0 +1,72 @@
+from typing import Iterable
+
+
+class ReplicaLoadIndex:
+    """Indexed binary min-heap of per-replica load.
+
+    Each replica has exactly one slot in the heap and a position map, so a load
+    change is a single sift in O(log R) and the least loaded replica is always
+    at the root. Ties are broken by replica id to match the iteration order of
+    a plain `min` over the replicas.
+    """
+
+    __slots__ = ("_heap", "_positions", "_loads")
+
+    def __init__(self, replica_ids: Iterable[int]):
+        self._heap = sorted(replica_ids)
+        self._positions = {
+            replica_id: position for position, replica_id in enumerate(self._heap)
+        }
+        self._loads = {replica_id: 0 for replica_id in self._heap}
+
+    def get_load(self, replica_id: int) -> float:
+        return self._loads[replica_id]
+
+    def get_min_replica_id(self) -> int:
+        return self._heap[0]
+
+    def add(self, replica_id: int, delta: float) -> None:
+        if not delta:
+            return
+
+        self._loads[replica_id] += delta
+        position = self._positions[replica_id]
+
+        if delta < 0:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def _less(self, replica_a: int, replica_b: int) -> bool:
+        load_a = self._loads[replica_a]
+        load_b = self._loads[replica_b]
+        return load_a < load_b or (load_a == load_b and replica_a < replica_b)
+
+    def _swap(self, position_a: int, position_b: int) -> None:
+        heap = self._heap
+        heap[position_a], heap[position_b] = heap[position_b], heap[position_a]
+        self._positions[heap[position_a]] = position_a
+        self._positions[heap[position_b]] = position_b
+
+    def _sift_up(self, position: int) -> None:
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not self._less(self._heap[position], self._heap[parent]):
+                break
+            self._swap(position, parent)
+            position = parent
+
+    def _sift_down(self, position: int) -> None:
+        size = len(self._heap)
+        while True:
+            smallest = position
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < size and self._less(self._heap[child], self._heap[smallest]):
+                    smallest = child
+            if smallest == position:
+                break
+            self._swap(position, smallest)
+            position = smallest
+
+    def __len__(self) -> int:
+        return len(self._heap)
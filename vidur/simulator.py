@@ -1,30 +1,52 @@
 import atexit
-import heapq
 import json
+import time
+from collections import defaultdict
 from typing import List
 
 from vidur.config import SimulationConfig
 from vidur.entities import Cluster
-from vidur.events import BaseEvent, RequestArrivalEvent
+from vidur.events import BaseEvent, GlobalScheduleEvent, RequestArrivalEvent
 from vidur.logger import init_logger
 from vidur.metrics import MetricsStore
 from vidur.request_generator import RequestGeneratorRegistry
 from vidur.scheduler import BaseGlobalScheduler, GlobalSchedulerRegistry
+from vidur.types import EventType
+from vidur.utils.event_loop_profiler import EventLoopProfiler
+from vidur.utils.event_queue import CompactEventQueue, HeapEventQueue
+from vidur.utils.result_store import ResultStore
 
 logger = init_logger(__name__)
 
 
 class Simulator:
     def __init__(self, config: SimulationConfig) -> None:
+        init_start_time = time.perf_counter()
         self._config: SimulationConfig = config
 
         self._time = 0
         self._terminate = False
+        self._is_run_complete = False
         self._time_limit = self._config.time_limit
         if not self._time_limit:
             self._time_limit = float("inf")
 
-        self._event_queue = []
+        if self._config.use_compact_event_queue:
+            self._event_queue = CompactEventQueue()
+        else:
+            self._event_queue = HeapEventQueue()
+
+        self._request_stream = None
+        self._next_request = None
+        self._num_queued_arrivals = 0
+
+        # schedule events that are queued but not yet handled, used to merge
+        # redundant scheduling passes when coalescing is enabled
+        self._coalesce_schedule_events = self._config.coalesce_schedule_events
+        self._pending_global_schedule_event = None
+        self._pending_replica_schedule_events = {}
+        self._num_handled_events = defaultdict(int)
+        self._num_coalesced_events = defaultdict(int)
 
         self._event_trace = []
         self._event_chrome_trace = []
@@ -34,7 +56,8 @@ class Simulator:
             self._config.metrics_config,
             self._config.request_generator_config,
         )
-        self._metric_store = MetricsStore(self._config)
+        self._metric_store = MetricsStore(self._config, self._cluster.replicas)
+        self._slo_monitor = self._metric_store.slo_monitor
         self._request_generator = RequestGeneratorRegistry.get(
             self._config.request_generator_config.get_type(),
             self._config.request_generator_config,
@@ -45,9 +68,17 @@ class Simulator:
             self._cluster.replicas,
         )
 
+        self._profiler = None
+        if self._config.metrics_config.enable_profiling:
+            self._init_profiler()
+
         self._init_event_queue()
         atexit.register(self._write_output)
 
+        logger.info(
+            f"Simulator initialized in {time.perf_counter() - init_start_time:.3f}s"
+        )
+
     @property
     def scheduler(self) -> BaseGlobalScheduler:
         return self._scheduler
@@ -57,16 +88,47 @@ class Simulator:
         return self._metric_store
 
     def run(self) -> None:
-        logger.info(
-            f"Starting simulation with cluster: {self._cluster} and {len(self._event_queue)} requests"
-        )
+        if self._request_stream is not None:
+            logger.info(
+                f"Starting simulation with cluster: {self._cluster} and streaming requests"
+            )
+        else:
+            logger.info(
+                f"Starting simulation with cluster: {self._cluster} and {len(self._event_queue)} requests"
+            )
 
         while self._event_queue and not self._terminate:
-            _, event = heapq.heappop(self._event_queue)
+            event = self._event_queue.pop()
             self._set_time(event._time)
-            new_events = event.handle_event(self._scheduler, self._metric_store)
+
+            if (
+                self._request_stream is not None
+                and event.event_type == EventType.REQUEST_ARRIVAL
+            ):
+                self._num_queued_arrivals -= 1
+                if self._num_queued_arrivals == 0:
+                    self._add_next_arrival_events()
+
+            if self._coalesce_schedule_events:
+                self._release_pending_event(event)
+
+            if self._profiler:
+                self._profiler.start(event.event_type.name)
+                self._profiler.start(f"{event.__class__.__name__}.handle_event")
+                new_events = event.handle_event(self._scheduler, self._metric_store)
+                self._profiler.stop()
+                self._profiler.stop()
+            else:
+                new_events = event.handle_event(self._scheduler, self._metric_store)
             self._add_events(new_events)
 
+            if self._slo_monitor is not None and self._slo_monitor.verdict:
+                logger.info(
+                    f"SLO decided at {self._time}s: {self._slo_monitor.verdict.value},"
+                    " terminating the simulation."
+                )
+                self._terminate = True
+
             if self._config.metrics_config.write_json_trace:
                 self._event_trace.append(event.to_dict())
 
@@ -76,11 +138,25 @@ class Simulator:
                     self._event_chrome_trace.append(chrome_trace)
 
         assert self._scheduler.is_empty() or self._terminate
+        self._is_run_complete = True
 
         logger.info(f"Simulation ended at: {self._time}s")
 
+    def write_output(self) -> None:
+        # write the output now rather than at interpreter exit, for callers that
+        # run several simulations in one process
+        atexit.unregister(self._write_output)
+        self._write_output()
+
+    def discard_output(self) -> None:
+        # for callers that handle a failed run themselves, otherwise its partial
+        # output is written at interpreter exit and the simulator is kept alive
+        # until then
+        atexit.unregister(self._write_output)
+
     def _write_output(self) -> None:
         logger.info("Writing output")
+        output_start_time = time.perf_counter()
 
         self._metric_store.plot()
         logger.info("Metrics written")
@@ -93,16 +169,151 @@ class Simulator:
             self._write_chrome_trace()
             logger.info("Chrome event trace written")
 
+        if self._profiler:
+            self._write_profile()
+            logger.info("Event loop profile written")
+
+        if self._coalesce_schedule_events:
+            self._write_event_counts()
+            logger.info("Event counts written")
+
+        # a crashed run must not be found in the store by later sweeps
+        if self._config.result_store_path and self._is_run_complete:
+            ResultStore(self._config.result_store_path).put(
+                self._config, self._metric_store.get_summary()
+            )
+            logger.info("Results stored")
+
+        logger.info(f"Output written in {time.perf_counter() - output_start_time:.3f}s")
+
+    def _init_profiler(self) -> None:
+        self._profiler = EventLoopProfiler()
+
+        self._profiler.instrument(
+            self._scheduler,
+            ["schedule", "add_request", "on_batch_end"],
+            "global_scheduler",
+        )
+        self._profiler.instrument(
+            self._metric_store,
+            [
+                "on_request_arrival",
+                "_on_request_end",
+                "on_batch_end",
+                "on_replica_schedule",
+                "on_replica_stage_schedule",
+                "on_batch_stage_end",
+            ],
+            "metrics_store",
+        )
+
+        # predictors can be shared with other simulators, so they are proxied
+        predictor_proxies = {}
+        for replica_id in self._cluster.replicas:
+            replica_scheduler = self._scheduler.get_replica_scheduler(replica_id)
+            self._profiler.instrument(
+                replica_scheduler,
+                ["add_request", "on_schedule", "on_batch_end"],
+                "replica_scheduler",
+            )
+            for stage_scheduler in replica_scheduler._replica_stage_schedulers.values():
+                predictor = stage_scheduler._execution_time_predictor
+                if id(predictor) not in predictor_proxies:
+                    predictor_proxies[id(predictor)] = self._profiler.proxy(
+                        predictor, ["get_execution_time"], "execution_time_predictor"
+                    )
+                stage_scheduler._execution_time_predictor = predictor_proxies[
+                    id(predictor)
+                ]
+
     def _add_event(self, event: BaseEvent) -> None:
-        heapq.heappush(self._event_queue, (event._priority_number, event))
+        self._event_queue.push(event)
 
     def _add_events(self, events: List[BaseEvent]) -> None:
+        if self._coalesce_schedule_events:
+            events = self._coalesce_events(events)
+
         for event in events:
             self._add_event(event)
 
+    def _coalesce_events(self, events: List[BaseEvent]) -> List[BaseEvent]:
+        coalesced_events = []
+        for event in events:
+            if event.event_type == EventType.GLOBAL_SCHEDULE:
+                # a queued global schedule pass fires after every arrival up to
+                # its time, so it already covers this one
+                if self._pending_global_schedule_event is not None:
+                    self._num_coalesced_events[event.event_type] += 1
+                    continue
+
+                if self._config.schedule_coalescing_tolerance:
+                    event = GlobalScheduleEvent(
+                        event.time + self._config.schedule_coalescing_tolerance
+                    )
+                self._pending_global_schedule_event = event
+            elif event.event_type == EventType.REPLICA_SCHEDULE:
+                # the queued event for this replica runs after the current one
+                # and sees the same state the duplicate would
+                pending_event = self._pending_replica_schedule_events.get(
+                    event.replica_id
+                )
+                if pending_event is not None and pending_event.time == event.time:
+                    self._num_coalesced_events[event.event_type] += 1
+                    continue
+
+                self._pending_replica_schedule_events[event.replica_id] = event
+
+            coalesced_events.append(event)
+
+        return coalesced_events
+
+    def _release_pending_event(self, event: BaseEvent) -> None:
+        self._num_handled_events[event.event_type] += 1
+
+        if event is self._pending_global_schedule_event:
+            self._pending_global_schedule_event = None
+        elif (
+            event.event_type == EventType.REPLICA_SCHEDULE
+            and self._pending_replica_schedule_events.get(event.replica_id) is event
+        ):
+            del self._pending_replica_schedule_events[event.replica_id]
+
+    def _add_next_arrival_events(self) -> None:
+        # queue every request sharing the next arrival time at once, so that they
+        # are all seen by the same global schedule pass as in the non-streaming mode
+        request = self._next_request
+        if request is None:
+            return
+
+        arrived_at = request.arrived_at
+        while request is not None and request.arrived_at == arrived_at:
+            self._add_event(RequestArrivalEvent(request.arrived_at, request))
+            self._num_queued_arrivals += 1
+            request = next(self._request_stream, None)
+
+        self._next_request = request
+
     def _init_event_queue(self) -> None:
+        if self._config.stream_requests:
+            if self._slo_monitor is not None:
+                num_requests = self._request_generator.get_num_requests()
+                if num_requests is not None:
+                    self._slo_monitor.set_num_requests(num_requests)
+                else:
+                    logger.warning(
+                        "Number of streamed requests is not known up front, the SLO"
+                        " is only decided early through queue growth."
+                    )
+            self._request_stream = self._request_generator.generate_stream()
+            self._next_request = next(self._request_stream, None)
+            self._add_next_arrival_events()
+            return
+
         requests = self._request_generator.generate()
 
+        if self._slo_monitor is not None:
+            self._slo_monitor.set_num_requests(len(requests))
+
         for request in requests:
             self._add_event(RequestArrivalEvent(request.arrived_at, request))
 
@@ -119,6 +330,31 @@ class Simulator:
         with open(trace_file, "w") as f:
             json.dump(self._event_trace, f)
 
+    def _write_event_counts(self) -> None:
+        event_counts = {
+            event_type.name: {
+                "handled": self._num_handled_events[event_type],
+                "coalesced": self._num_coalesced_events[event_type],
+            }
+            for event_type in EventType
+        }
+
+        num_handled_events = sum(self._num_handled_events.values())
+        num_coalesced_events = sum(self._num_coalesced_events.values())
+        logger.info(
+            f"Handled {num_handled_events} events, coalesced {num_coalesced_events}"
+            f" redundant schedule events"
+        )
+
+        counts_file = f"{self._config.metrics_config.output_dir}/event_counts.json"
+        with open(counts_file, "w") as f:
+            json.dump(event_counts, f, indent=4)
+
+    def _write_profile(self) -> None:
+        output_dir = self._config.metrics_config.output_dir
+        self._profiler.write_summary(f"{output_dir}/event_loop_profile.json")
+        self._profiler.write_collapsed_stacks(f"{output_dir}/event_loop_profile.folded")
+
     def _write_chrome_trace(self) -> None:
         trace_file = f"{self._config.metrics_config.output_dir}/chrome_trace.json"
 
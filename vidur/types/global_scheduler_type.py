@@ -9,3 +9,4 @@ class GlobalSchedulerType(BaseIntEnum):
     INPUT_BALANCE = 5
     OUTPUT_BALANCE = 6
     COMBINED_BALANCED = 7
+    PREDICTED_COMPLETION_TIME = 8
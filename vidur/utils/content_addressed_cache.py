@@ -0,0 +1,136 @@
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from vidur.logger import init_logger
+
+logger = init_logger(__name__)
+
+
+class ContentAddressedCache:
+    """
+    File cache where every entry is named after the hash of its content key.
+
+    Entries are written to a temporary file and published with an atomic rename,
+    so readers never observe partial writes and need no locks. An entry is never
+    modified once published; concurrent writers of the same key produce the same
+    bytes and the last rename wins. Reads refresh the entry mtime, which is used
+    to evict the least recently used entries once the directory exceeds its size
+    budget.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int = 0) -> None:
+        self._cache_dir = cache_dir
+        self._max_size_bytes = max_size_bytes
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    def _get_path(self, name: str, key_hash: str, extension: str) -> str:
+        return os.path.join(self._cache_dir, f"{name}_{key_hash}.{extension}")
+
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            # the entry can be evicted by another process while we read it
+            pass
+
+    def _load(
+        self, name: str, key_hash: str, extension: str, loader: Callable[[str], Any]
+    ) -> Optional[Any]:
+        path = self._get_path(name, key_hash, extension)
+        try:
+            value = loader(path)
+        except FileNotFoundError:
+            return None
+
+        self._touch(path)
+        return value
+
+    def _store(
+        self,
+        name: str,
+        key_hash: str,
+        extension: str,
+        writer: Callable[[Any], None],
+    ) -> None:
+        path = self._get_path(name, key_hash, extension)
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self._cache_dir, prefix=f".{name}_{key_hash}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def load_array(self, name: str, key_hash: str) -> Optional[np.ndarray]:
+        # memory-mapped, so that processes share the page cache
+        return self._load(
+            name, key_hash, "npy", lambda path: np.load(path, mmap_mode="r")
+        )
+
+    def store_array(self, name: str, key_hash: str, array: np.ndarray) -> None:
+        self._store(name, key_hash, "npy", lambda f: np.save(f, array))
+
+    def load_object(self, name: str, key_hash: str) -> Optional[Any]:
+        def loader(path: str) -> Any:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+
+        return self._load(name, key_hash, "pkl", loader)
+
+    def store_object(self, name: str, key_hash: str, value: Any) -> None:
+        self._store(
+            name,
+            key_hash,
+            "pkl",
+            lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+
+    def store_table(self, name: str, key_hash: str, df: pd.DataFrame) -> None:
+        self._store(name, key_hash, "csv", lambda f: df.to_csv(f, index=False))
+
+    def evict(self) -> None:
+        if self._max_size_bytes <= 0:
+            return
+
+        entries = []
+        total_size = 0
+        with os.scandir(self._cache_dir) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        if total_size <= self._max_size_bytes:
+            return
+
+        # least recently used first
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self._max_size_bytes:
+                break
+            try:
+                # open memory maps of the entry stay valid after the unlink
+                os.remove(path)
+                logger.debug(f"Evicted cache entry {path}")
+            except FileNotFoundError:
+                pass
+            total_size -= size
@@ -0,0 +1,101 @@
+import json
+from collections import defaultdict
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+
+class _ProfiledProxy:
+    """Delegates to the wrapped object, timing the instrumented methods."""
+
+    def __init__(self, obj: Any, methods: Dict[str, Callable]) -> None:
+        self._obj = obj
+        self.__dict__.update(methods)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._obj, name)
+
+
+class EventLoopProfiler:
+    """
+    Records cumulative wall time and call counts of nested frames. Frames form a
+    stack, so the self time of every stack can also be emitted in the collapsed
+    stack format consumed by flame graph tools (e.g. flamegraph.pl, speedscope).
+    """
+
+    def __init__(self) -> None:
+        # each open frame is [name, start time, time spent in children]
+        self._stack: List[list] = []
+        self._num_calls: Dict[str, int] = defaultdict(int)
+        self._total_time: Dict[str, float] = defaultdict(float)
+        self._self_time_by_stack: Dict[str, float] = defaultdict(float)
+
+    def start(self, name: str) -> None:
+        self._stack.append([name, perf_counter(), 0.0])
+
+    def stop(self) -> None:
+        name, start_time, children_time = self._stack.pop()
+        elapsed_time = perf_counter() - start_time
+
+        self._num_calls[name] += 1
+        self._total_time[name] += elapsed_time
+
+        stack = ";".join([frame[0] for frame in self._stack] + [name])
+        self._self_time_by_stack[stack] += elapsed_time - children_time
+
+        if self._stack:
+            self._stack[-1][2] += elapsed_time
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            self.start(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stop()
+
+        return wrapper
+
+    def instrument(self, obj: Any, method_names: List[str], prefix: str) -> None:
+        # replaces the bound methods on the instance, the class is left untouched
+        for method_name in method_names:
+            setattr(
+                obj,
+                method_name,
+                self.wrap(f"{prefix}.{method_name}", getattr(obj, method_name)),
+            )
+
+    def proxy(self, obj: Any, method_names: List[str], prefix: str) -> Any:
+        # for objects that may be shared with other simulations in the process
+        return _ProfiledProxy(
+            obj,
+            {
+                method_name: self.wrap(
+                    f"{prefix}.{method_name}", getattr(obj, method_name)
+                )
+                for method_name in method_names
+            },
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            name: {
+                "num_calls": self._num_calls[name],
+                "total_time": self._total_time[name],
+                "mean_time": self._total_time[name] / self._num_calls[name],
+            }
+            for name in sorted(
+                self._total_time, key=self._total_time.get, reverse=True
+            )
+        }
+
+    def write_summary(self, output_file: str) -> None:
+        with open(output_file, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def write_collapsed_stacks(self, output_file: str) -> None:
+        # one "frame;frame;frame <self time in microseconds>" line per stack
+        with open(output_file, "w") as f:
+            for stack, self_time in sorted(self._self_time_by_stack.items()):
+                f.write(f"{stack} {int(self_time * 1e6)}\n")
@@ -1,3 +1,4 @@
+from heapq import heappop, heappush
 from queue import PriorityQueue
 
 
@@ -16,3 +17,47 @@ class EventQueue:
 
     def __len__(self):
         return self.event_queue.qsize()
+
+
+class HeapEventQueue:
+    """Binary heap of ((time, event_type, id), event) pairs."""
+
+    __slots__ = ("_heap",)
+
+    def __init__(self):
+        self._heap = []
+
+    def push(self, event) -> None:
+        heappush(self._heap, (event._priority_number, event))
+
+    def pop(self):
+        return heappop(self._heap)[1]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class CompactEventQueue:
+    """Binary heap of integer priority keys with a side table of events.
+
+    Keys come from `BaseEvent.get_priority_key` and are unique per event, so
+    the heap only ever compares plain ints and never builds tuples or calls
+    back into Python-level `__lt__`.
+    """
+
+    __slots__ = ("_keys", "_events")
+
+    def __init__(self):
+        self._keys = []
+        self._events = {}
+
+    def push(self, event) -> None:
+        key = event.get_priority_key()
+        self._events[key] = event
+        heappush(self._keys, key)
+
+    def pop(self):
+        return self._events.pop(heappop(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
@@ -8,3 +8,13 @@ def set_seeds(seed=42):
     random.seed(seed)
     os.environ["PYTHONHASHSEED"] = str(seed)
     np.random.seed(seed)
+
+
+def get_rng_state():
+    return random.getstate(), np.random.get_state()
+
+
+def set_rng_state(state) -> None:
+    python_state, numpy_state = state
+    random.setstate(python_state)
+    np.random.set_state(numpy_state)
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from vidur.config import SimulationConfig
+from vidur.config.utils import dataclass_to_dict
+from vidur.logger import init_logger
+
+logger = init_logger(__name__)
+
+# these only change where and how the output is written, not the results
+_IGNORED_SIMULATION_CONFIG_KEYS = ("__flat_config__", "log_level", "result_store_path")
+_IGNORED_METRICS_CONFIG_KEYS = (
+    "write_json_trace",
+    "wandb_project",
+    "wandb_group",
+    "wandb_run_name",
+    "wandb_sweep_id",
+    "wandb_run_id",
+    "enable_chrome_trace",
+    "enable_profiling",
+    "save_table_to_wandb",
+    "store_plots",
+    "headless",
+    "headless_metrics",
+    "stream_metrics",
+    "stream_metrics_chunk_size",
+    "output_dir",
+    "cache_dir",
+)
+
+_CHECKSUM_BLOCK_SIZE = 1 << 20
+
+# (path, size, mtime) -> checksum, traces are shared by many configs of a sweep
+_checksums: Dict[Tuple[str, int, float], str] = {}
+
+
+def _get_file_checksum(path: str) -> str:
+    stat = os.stat(path)
+    cache_key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    if cache_key in _checksums:
+        return _checksums[cache_key]
+
+    checksum = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_CHECKSUM_BLOCK_SIZE), b""):
+            checksum.update(block)
+
+    _checksums[cache_key] = checksum.hexdigest()
+    return _checksums[cache_key]
+
+
+def get_trace_checksum(path: str) -> str:
+    if os.path.isfile(path):
+        return _get_file_checksum(path)
+
+    # columnar traces are directories of column files
+    checksum = hashlib.sha256()
+    for root, _, file_names in sorted(os.walk(path)):
+        for file_name in sorted(file_names):
+            file_path = os.path.join(root, file_name)
+            checksum.update(os.path.relpath(file_path, path).encode("utf-8"))
+            checksum.update(_get_file_checksum(file_path).encode("utf-8"))
+    return checksum.hexdigest()
+
+
+def _find_trace_files(config_dict: Dict[str, Any]) -> List[str]:
+    trace_files = []
+    for key, value in config_dict.items():
+        if isinstance(value, dict):
+            trace_files.extend(_find_trace_files(value))
+        elif key.endswith("trace_file") and isinstance(value, str):
+            trace_files.append(value)
+    return trace_files
+
+
+def _resolve_trace_files(config_dict: Dict[str, Any]) -> None:
+    # relative paths are made absolute, so that processes with different
+    # working directories agree on the file and on the key
+    for key, value in config_dict.items():
+        if isinstance(value, dict):
+            _resolve_trace_files(value)
+        elif key.endswith("trace_file") and isinstance(value, str):
+            config_dict[key] = os.path.abspath(value)
+
+
+def _get_canonical_config_dict(config: SimulationConfig) -> Dict[str, Any]:
+    config_dict = dataclass_to_dict(config)
+    for key in _IGNORED_SIMULATION_CONFIG_KEYS:
+        config_dict.pop(key, None)
+    for key in _IGNORED_METRICS_CONFIG_KEYS:
+        config_dict["metrics_config"].pop(key, None)
+    _resolve_trace_files(config_dict)
+    return config_dict
+
+
+def get_config_key(config: SimulationConfig) -> str:
+    """
+    Canonical hash of a fully resolved simulation config together with the
+    checksums of the traces it reads, so moved or rewritten traces are told
+    apart by content rather than by path.
+    """
+    config_dict = _get_canonical_config_dict(config)
+    trace_checksums = {
+        trace_file: get_trace_checksum(trace_file)
+        for trace_file in _find_trace_files(config_dict)
+        if os.path.exists(trace_file)
+    }
+
+    payload = json.dumps(
+        {"config": config_dict, "trace_checksums": trace_checksums},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """
+    Summary metrics of finished simulations in a single SQLite table, keyed by
+    `get_config_key`. Sweeps look runs up here before launching them, and
+    several simulator processes can write to the same store.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " config_key TEXT PRIMARY KEY,"
+                " config TEXT NOT NULL,"
+                " results TEXT NOT NULL,"
+                " created_at REAL NOT NULL"
+                ")"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # WAL lets readers look up results while another process writes
+        connection = sqlite3.connect(self._path, timeout=60)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, config: SimulationConfig) -> Optional[Dict[str, Any]]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT results FROM results WHERE config_key = ?",
+                (get_config_key(config),),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def put(self, config: SimulationConfig, results: Dict[str, Any]) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (
+                    get_config_key(config),
+                    json.dumps(_get_canonical_config_dict(config), default=str),
+                    json.dumps(results, default=str),
+                    time.time(),
+                ),
+            )
+
+    def get_for_cli_args(self, args: List[str]) -> Optional[Dict[str, Any]]:
+        config = SimulationConfig.create_from_cli_args(args)
+        results = self.get(config)
+        if results is not None:
+            logger.info(
+                f"Found results in {self._path} for {config.metrics_config.output_dir}"
+            )
+        return results
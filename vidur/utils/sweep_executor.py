@@ -0,0 +1,268 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from vidur.logger import init_logger
+
+logger = init_logger(__name__)
+
+_JOB_PENDING = "pending"
+_JOB_RUNNING = "running"
+_JOB_DONE = "done"
+_JOB_FAILED = "failed"
+
+
+def get_available_cpu_core_ids() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    # no affinity support (e.g. macos), workers are not pinned
+    return list(range(os.cpu_count()))
+
+
+def _run_worker(
+    func: Callable[[Any], Any],
+    cpu_core_id: int,
+    job_queue: multiprocessing.Queue,
+    event_connection: Connection,
+) -> None:
+    # subprocesses launched by the jobs inherit the affinity
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu_core_id})
+
+    # events are sent synchronously, so they are not lost if the worker dies
+    while True:
+        item = job_queue.get()
+        if item is None:
+            break
+
+        job_idx, job = item
+        event_connection.send((_JOB_RUNNING, job_idx, None, None))
+
+        start_time = time.perf_counter()
+        try:
+            result = func(job)
+            status = _JOB_DONE
+        except Exception as e:
+            logger.error(f"Job {job_idx} failed with error: {e}")
+            result = str(e)
+            status = _JOB_FAILED
+
+        duration = time.perf_counter() - start_time
+        event_connection.send((status, job_idx, duration, result))
+
+
+class SweepExecutor:
+    """
+    Runs the jobs of a sweep in worker processes on a single node, without Ray.
+
+    Every worker is pinned to its own core and pulls the next job from a shared
+    queue as soon as it is free, so no worker idles while jobs are left. Jobs
+    are queued longest predicted duration first, which keeps a long job from
+    starting last and stretching the tail of the sweep. The state and result of
+    every job is streamed into the `sweep_jobs` table of a SQLite database as
+    the sweep progresses.
+    """
+
+    def __init__(
+        self,
+        num_workers: Optional[int] = None,
+        results_path: Optional[str] = None,
+    ) -> None:
+        self._cpu_core_ids = get_available_cpu_core_ids()
+        if num_workers is not None:
+            assert num_workers > 0
+            self._cpu_core_ids = self._cpu_core_ids[:num_workers]
+        self._results_path = results_path
+
+        if self._results_path is not None:
+            with self._connect() as connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS sweep_jobs ("
+                    " job_key TEXT PRIMARY KEY,"
+                    " status TEXT NOT NULL,"
+                    " predicted_duration REAL,"
+                    " duration REAL,"
+                    " cpu_core_id INTEGER,"
+                    " result TEXT,"
+                    " updated_at REAL NOT NULL"
+                    ")"
+                )
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._cpu_core_ids)
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self._results_path, timeout=60)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _record(
+        self,
+        job_key: str,
+        status: str,
+        predicted_duration: float,
+        duration: Optional[float] = None,
+        cpu_core_id: Optional[int] = None,
+        result: Any = None,
+    ) -> None:
+        if self._results_path is None:
+            return
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO sweep_jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_key,
+                    status,
+                    predicted_duration,
+                    duration,
+                    cpu_core_id,
+                    json.dumps(result, default=str),
+                    time.time(),
+                ),
+            )
+
+    def _start_worker(
+        self,
+        func: Callable[[Any], Any],
+        cpu_core_id: int,
+        job_queue: multiprocessing.Queue,
+    ) -> Tuple[multiprocessing.Process, Connection]:
+        reader, writer = multiprocessing.Pipe(duplex=False)
+        # not daemonic, jobs may start processes of their own, e.g. to train the
+        # execution time predictors, the workers are shut down by map instead
+        worker = multiprocessing.Process(
+            target=_run_worker,
+            args=(func, cpu_core_id, job_queue, writer),
+        )
+        worker.start()
+        # keep only the child's end open, so the reader sees EOF when it exits
+        writer.close()
+        return worker, reader
+
+    def map(
+        self,
+        func: Callable[[Any], Any],
+        jobs: Sequence[Any],
+        job_keys: Optional[Sequence[str]] = None,
+        predicted_durations: Optional[Sequence[float]] = None,
+    ) -> List[Any]:
+        """
+        Run `func` on every job and return the results in the order of `jobs`,
+        with None for jobs that failed. `func` and the jobs must be picklable.
+        Predicted durations only order the jobs, so any relative cost works.
+        """
+        if job_keys is None:
+            job_keys = [str(job_idx) for job_idx in range(len(jobs))]
+        if predicted_durations is None:
+            predicted_durations = [0] * len(jobs)
+        assert len(job_keys) == len(jobs) == len(predicted_durations)
+
+        job_order = sorted(
+            range(len(jobs)), key=lambda job_idx: -predicted_durations[job_idx]
+        )
+
+        job_queue = multiprocessing.Queue()
+        for job_idx in job_order:
+            self._record(job_keys[job_idx], _JOB_PENDING, predicted_durations[job_idx])
+            job_queue.put((job_idx, jobs[job_idx]))
+        for _ in self._cpu_core_ids:
+            job_queue.put(None)
+
+        # cpu core id -> (worker, event connection)
+        workers = {
+            cpu_core_id: self._start_worker(func, cpu_core_id, job_queue)
+            for cpu_core_id in self._cpu_core_ids
+        }
+
+        logger.info(f"Running {len(jobs)} jobs on {len(workers)} pinned workers")
+
+        results = [None] * len(jobs)
+        # cpu core id -> index of the job its worker is running
+        running_jobs: Dict[int, int] = {}
+        num_finished_jobs = 0
+        num_failed_jobs = 0
+        start_time = time.perf_counter()
+
+        try:
+            while workers:
+                connections = {
+                    connection: cpu_core_id
+                    for cpu_core_id, (_, connection) in workers.items()
+                }
+                for connection in wait(list(connections)):
+                    cpu_core_id = connections[connection]
+                    worker, _ = workers[cpu_core_id]
+
+                    try:
+                        status, job_idx, duration, result = connection.recv()
+                    except EOFError:
+                        # the worker has exited, either at the end of the queue or
+                        # killed mid-job, e.g. by the oom killer
+                        connection.close()
+                        worker.join()
+                        del workers[cpu_core_id]
+
+                        job_idx = running_jobs.pop(cpu_core_id, None)
+                        if job_idx is None:
+                            continue
+
+                        status = _JOB_FAILED
+                        duration = None
+                        result = f"Worker exited with code {worker.exitcode}"
+                        logger.error(
+                            f"Job {job_idx} failed on core {cpu_core_id}: {result}"
+                        )
+
+                        # the dead worker never took its end of queue marker
+                        workers[cpu_core_id] = self._start_worker(
+                            func, cpu_core_id, job_queue
+                        )
+
+                    self._record(
+                        job_keys[job_idx],
+                        status,
+                        predicted_durations[job_idx],
+                        duration,
+                        cpu_core_id,
+                        result,
+                    )
+
+                    if status == _JOB_RUNNING:
+                        running_jobs[cpu_core_id] = job_idx
+                        continue
+
+                    running_jobs.pop(cpu_core_id, None)
+                    num_finished_jobs += 1
+                    if status == _JOB_DONE:
+                        results[job_idx] = result
+                    else:
+                        num_failed_jobs += 1
+
+                    elapsed_time = time.perf_counter() - start_time
+                    logger.info(
+                        f"Job {job_keys[job_idx]} {status} on core {cpu_core_id}"
+                        f" ({num_finished_jobs}/{len(jobs)} finished,"
+                        f" {num_failed_jobs} failed, {elapsed_time:.1f}s elapsed)"
+                    )
+        finally:
+            # only reached with live workers if the sweep is interrupted
+            for worker, connection in workers.values():
+                worker.terminate()
+                worker.join()
+                connection.close()
+
+        assert num_finished_jobs == len(jobs)
+
+        return results